@@ -1122,6 +1122,56 @@ class SkactivemlClassifier(BaseEstimator, ClassifierMixin, ABC):
         y_pred = self._le.transform(self.predict(X))
         return accuracy_score(y, y_pred, sample_weight=sample_weight)
 
+    def get_state(self):
+        """Return a snapshot of the fitted state of this classifier.
+
+        The snapshot contains all attributes, which are not parameters of
+        `__init__`. As `fit` replaces instead of modifying these attributes,
+        they are stored by reference, i.e., without copying. Only attributes
+        that are modified in-place, e.g., by `partial_fit`, are copied.
+
+        Returns
+        -------
+        state : dict
+            Snapshot of the fitted state, which can be restored via
+            `set_state`.
+        """
+        params = self.get_params(deep=False)
+        state = {
+            key: val for key, val in self.__dict__.items() if key not in params
+        }
+        return self._copy_state(state)
+
+    def set_state(self, state):
+        """Restore a fitted state obtained via `get_state`. The same state can
+        be restored multiple times.
+
+        Parameters
+        ----------
+        state : dict
+            Snapshot of the fitted state as returned by `get_state`.
+
+        Returns
+        -------
+        self : skactiveml.base.SkactivemlClassifier,
+            The classifier with the restored fitted state.
+        """
+        if not isinstance(state, dict):
+            raise TypeError(
+                f"`state` must be a dict as returned by `get_state`, got "
+                f"{type(state)} instead."
+            )
+        params = self.get_params(deep=False)
+        for key in list(self.__dict__):
+            if key not in params:
+                del self.__dict__[key]
+        self.__dict__.update(self._copy_state(state))
+        return self
+
+    def _copy_state(self, state):
+        # Copy the attributes of a state that are modified in-place.
+        return dict(state)
+
     def _validate_data(
         self,
         X,
@@ -7,8 +7,9 @@ Classifier based on a Gaussian Mixture Model.
 from copy import deepcopy
 
 import numpy as np
-from scipy.spatial.distance import cdist
+from scipy.special import logsumexp
 from sklearn.mixture import GaussianMixture, BayesianGaussianMixture
+from sklearn.utils import gen_batches, get_chunk_n_rows
 from sklearn.utils.validation import (
     check_array,
     check_is_fitted,
@@ -38,7 +39,9 @@ class MixtureModelClassifier(ClassFrequencyEstimator):
         default='responsibilities'
         Determines whether the responsibilities outputted by the
         `mixture_model` or the exponentials of the Mahalanobis distances as
-        similarities are used to compute the class frequency estimates.
+        similarities are used to compute the class frequency estimates. The
+        responsibilities, log-densities, and similarities are cached for the
+        last predicted samples until the next call of `fit`.
     classes : array-like, shape (n_classes), default=None
         Holds the label for each class. If none, the classes are determined
         during the fit.
@@ -148,6 +151,7 @@ class MixtureModelClassifier(ClassFrequencyEstimator):
                 f"'similarities', got {self.weight_mode} instead."
             )
 
+        self._mixture_cache = None
         if self.n_features_in_ is None:
             self.F_components_ = 0
         else:
@@ -166,7 +170,7 @@ class MixtureModelClassifier(ClassFrequencyEstimator):
             )
 
             # Stores responsibility for every given sample of training set.
-            R = self.mixture_model_.predict_proba(X)
+            R, _ = self._estimate_mixture(X)
 
             # Stores class frequency estimates per component.
             self.F_components_ = R.T @ V
@@ -192,22 +196,73 @@ class MixtureModelClassifier(ClassFrequencyEstimator):
         self._check_n_features(X, reset=False)
         if np.sum(self.F_components_) > 0:
             if self.weight_mode == "similarities":
-                S = np.exp(
-                    -np.array(
-                        [
-                            cdist(
-                                X,
-                                [self.mixture_model_.means_[j]],
-                                metric="mahalanobis",
-                                VI=self.mixture_model_.precisions_[j],
-                            ).ravel()
-                            for j in range(self.mixture_model_.n_components)
-                        ]
-                    )
-                ).T
+                S = self._estimate_similarities(X)
             else:
-                S = self.mixture_model_.predict_proba(X)
+                S, _ = self._estimate_mixture(X)
             F = S @ self.F_components_
         else:
             F = np.zeros((len(X), len(self.classes_)))
         return F
+
+    def _estimate_mixture(self, X):
+        # Compute the responsibilities and log-densities of the mixture model
+        # for the samples `X` in one pass, which equal the outputs of its
+        # methods `predict_proba` and `score_samples`.
+        cache = self._get_mixture_cache(X)
+        if "responsibilities" not in cache:
+            log_prob = self.mixture_model_._estimate_weighted_log_prob(X)
+            log_density = logsumexp(log_prob, axis=1)
+            with np.errstate(under="ignore"):
+                R = np.exp(log_prob - log_density[:, np.newaxis])
+            cache["responsibilities"] = R
+            cache["log_densities"] = log_density
+        return cache["responsibilities"], cache["log_densities"]
+
+    def _estimate_similarities(self, X):
+        # Compute the exponentials of the negative Mahalanobis distances
+        # between the samples `X` and the components' means, where the
+        # samples are whitened via the Cholesky factors of the precisions.
+        cache = self._get_mixture_cache(X)
+        if "similarities" not in cache:
+            mixture = self.mixture_model_
+            means = mixture.means_
+            precisions_chol = mixture.precisions_cholesky_
+            n_components, n_features = means.shape
+            covariance_type = mixture.covariance_type
+            if covariance_type == "diag":
+                precisions_chol = precisions_chol[:, np.newaxis, :]
+            elif covariance_type == "spherical":
+                precisions_chol = precisions_chol[:, np.newaxis, np.newaxis]
+            if covariance_type == "full":
+                means_white = np.einsum("kd,kde->ke", means, precisions_chol)
+            elif covariance_type == "tied":
+                means_white = means @ precisions_chol
+            else:
+                means_white = means * precisions_chol[:, 0]
+            S = np.empty((len(X), n_components))
+            n_rows = get_chunk_n_rows(
+                row_bytes=2 * 8 * n_components * n_features,
+                max_n_rows=len(X),
+            )
+            for batch in gen_batches(len(X), n_rows):
+                if covariance_type in ["full", "tied"]:
+                    X_white = X[batch] @ precisions_chol
+                else:
+                    X_white = X[batch] * precisions_chol
+                X_white = X_white - means_white[:, np.newaxis]
+                S[batch] = np.sqrt(np.einsum("knd,knd->nk", X_white, X_white))
+            cache["similarities"] = np.exp(-S)
+        return cache["similarities"]
+
+    def _get_mixture_cache(self, X):
+        # Return the cache of the fitted mixture model for the samples `X`,
+        # which is reset if other samples are given.
+        cache = getattr(self, "_mixture_cache", None)
+        if (
+            cache is None
+            or cache["mixture_model"] is not self.mixture_model_
+            or not np.array_equal(cache["X"], X)
+        ):
+            cache = {"mixture_model": self.mixture_model_, "X": X.copy()}
+            self._mixture_cache = cache
+        return cache
@@ -6,12 +6,24 @@ Parzen Window Classifier
 
 import numpy as np
 import warnings
+from joblib import Parallel, delayed
 from sklearn.metrics.pairwise import pairwise_kernels, KERNEL_PARAMS
-from sklearn.utils import check_array
-from sklearn.utils.validation import check_is_fitted, check_scalar
+from sklearn.neighbors import BallTree, KDTree
+from sklearn.utils import check_array, gen_batches, get_chunk_n_rows
+from sklearn.utils.validation import (
+    check_consistent_length,
+    check_is_fitted,
+    check_scalar,
+    column_or_1d,
+)
 
 from ..base import ClassFrequencyEstimator
-from ..utils import MISSING_LABEL, compute_vote_vectors, is_labeled
+from ..utils import (
+    MISSING_LABEL,
+    check_type,
+    compute_vote_vectors,
+    is_labeled,
+)
 
 
 class ParzenWindowClassifier(ClassFrequencyEstimator):
@@ -49,6 +61,25 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
         For the the kernel 'rbf' we allow the use of mean kernel [2] and use
         it when gamma is set to 'mean' (i.e., {'gamma': 'mean'}). While N is
         defined as the labeled data the variance is calculated over all X.
+    algorithm : {'brute', 'kd_tree', 'ball_tree'}, default='brute'
+        Algorithm used to find the `n_neighbors` nearest neighbors:
+        - 'brute' computes the kernel values between the input samples and
+          all training samples,
+        - 'kd_tree' and 'ball_tree' search the nearest neighbors in a
+          `sklearn.neighbors.KDTree` or `sklearn.neighbors.BallTree` built
+          during fitting, so that only the kernel values of the neighbors are
+          computed. They require `n_neighbors` to be set and a kernel that
+          decreases with a distance, i.e., `metric='rbf'` (euclidean
+          distance) or `metric='laplacian'` (manhattan distance).
+    working_memory : int or float, default=None
+        The input samples are predicted in tiles such that the kernel matrix
+        between a tile and the training samples requires at most
+        `working_memory` MiB. If None, sklearn's `working_memory`
+        configuration is used. The results depend on the tiling only up to
+        floating-point rounding.
+    n_jobs : int, default=None
+        The number of threads predicting the tiles in parallel. None means 1
+        and -1 means using all processors.
 
     Attributes
     ----------
@@ -66,7 +97,8 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
     V_ : np.ndarray of shape (n_samples, classes)
         The class labels are represented by counting vectors. An entry `V[i,j]`
         indicates how many class labels of `classes[j]` were provided for
-        training sample `X_[i]`.
+        training sample `X_[i]`. `X_` and `V_` are views of buffers, whose
+        capacity is doubled if `partial_fit` exceeds it.
 
     References
     ----------
@@ -80,12 +112,16 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
     """
 
     METRICS = list(KERNEL_PARAMS.keys()) + ["precomputed"]
+    TREE_METRICS = {"rbf": "euclidean", "laplacian": "manhattan"}
 
     def __init__(
         self,
         n_neighbors=None,
         metric="rbf",
         metric_dict=None,
+        algorithm="brute",
+        working_memory=None,
+        n_jobs=None,
         classes=None,
         missing_label=MISSING_LABEL,
         cost_matrix=None,
@@ -102,6 +138,9 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
         self.metric = metric
         self.n_neighbors = n_neighbors
         self.metric_dict = metric_dict
+        self.algorithm = algorithm
+        self.working_memory = working_memory
+        self.n_jobs = n_jobs
 
     def fit(self, X, y, sample_weight=None):
         """Fit the model using X as training data and y as class labels.
@@ -143,6 +182,35 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
                 target_type=int,
             )
 
+        # Check the neighbor search algorithm.
+        check_type(
+            self.algorithm,
+            "algorithm",
+            target_vals=["brute", "kd_tree", "ball_tree"],
+        )
+        if self.algorithm != "brute" and (
+            self.n_neighbors is None
+            or self.metric not in ParzenWindowClassifier.TREE_METRICS
+        ):
+            raise ValueError(
+                f"The algorithm '{self.algorithm}' requires `n_neighbors` to "
+                f"be set and `metric` to be in "
+                f"{list(ParzenWindowClassifier.TREE_METRICS)}."
+            )
+
+        # Check the parameters of the tiled prediction.
+        if self.working_memory is not None:
+            check_scalar(
+                self.working_memory,
+                name="working_memory",
+                target_type=(int, float),
+                min_val=0,
+                include_boundaries="neither",
+            )
+        check_type(self.n_jobs, "n_jobs", int, target_vals=[None])
+        if self.n_jobs == 0:
+            raise ValueError("`n_jobs` must not be 0.")
+
         # Ensure that metric_dict is a Python dictionary.
         self.metric_dict_ = (
             self.metric_dict if self.metric_dict is not None else {}
@@ -168,10 +236,12 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
 
         # Store train samples.
         self.X_ = X.copy()
+        self._build_tree()
 
         # Convert labels to count vectors.
         if self.n_features_in_ is None:
             self.V_ = 0
+            self._X_buffer, self._V_buffer = None, None
         else:
             self.V_ = compute_vote_vectors(
                 y=y,
@@ -179,9 +249,154 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
                 classes=np.arange(len(self.classes_)),
                 missing_label=-1,
             )
+            self._X_buffer, self._V_buffer = self.X_, self.V_
+
+        return self
+
+    def partial_fit(self, X, y, sample_weight=None, replace_idx=None):
+        """Update the fitted model using the additional training samples `X`
+        and class labels `y`. The samples are appended to `X_` and `V_` or
+        replace the training samples at the positions `replace_idx`, which
+        costs O(n_samples * n_features) in amortized time. If the model is not
+        fitted or has no training samples, it is fitted on `X`. Parameters
+        derived from the training samples in `fit`, i.e., `gamma='mean'`,
+        are not updated. It is not supported for `metric='precomputed'`, as
+        the kernel rows of the training samples would be incomplete.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            The sample matrix `X` is the feature matrix representing the
+            additional samples.
+        y : array-like of shape (n_samples)
+            It contains the class labels of the additional samples, which
+            must be in `classes_`.
+        sample_weight : array-like of shape (n_samples), default=None
+            It contains the weights of the additional samples' class labels.
+            It must have the same shape as y.
+        replace_idx : array-like of shape (n_samples), default=None
+            Unique positions of the training samples in `X_` that are
+            replaced by the samples in `X`. If None, the samples are
+            appended.
+
+        Returns
+        -------
+        self: ParzenWindowClassifier,
+            The ParzenWindowClassifier is updated by the additional samples.
+        """
+        if self.metric == "precomputed":
+            raise ValueError(
+                "`partial_fit` is not supported for `metric='precomputed'`."
+            )
+        if not hasattr(self, "X_") or self.n_features_in_ is None:
+            if replace_idx is not None and len(replace_idx) > 0:
+                raise ValueError(
+                    "`replace_idx` must be empty as there are no training "
+                    "samples to be replaced."
+                )
+            return self.fit(X, y, sample_weight)
+
+        # Check input parameters.
+        check_y_dict = {
+            "ensure_min_samples": 0,
+            "ensure_2d": False,
+            "force_all_finite": False,
+            "dtype": None,
+        }
+        y = column_or_1d(check_array(y, **check_y_dict))
+        if len(y) == 0:
+            return self
+        y = self._le.transform(y)
+        X = check_array(X)
+        self._check_n_features(X, reset=False)
+        check_consistent_length(X, y)
+        if sample_weight is not None:
+            sample_weight = check_array(sample_weight, **check_y_dict)
+            if not np.array_equal(y.shape, sample_weight.shape):
+                raise ValueError(
+                    f"`y` has the shape {y.shape} and `sample_weight` has the "
+                    f"shape {sample_weight.shape}. Both need to have "
+                    f"identical shapes."
+                )
+        # Convert the encoded labels to count vectors.
+        is_lbld = is_labeled(y, missing_label=-1)
+        V = np.zeros((len(y), len(self.classes_)))
+        w = 1 if sample_weight is None else sample_weight[is_lbld]
+        V[is_lbld, y[is_lbld].astype(int)] = w
+
+        n_samples = len(self.X_)
+        if replace_idx is None:
+            # Double the capacity of the buffers if it is exceeded.
+            n_samples_new = n_samples + len(X)
+            dtype = np.result_type(self._X_buffer, X)
+            if (
+                n_samples_new > len(self._X_buffer)
+                or dtype != self._X_buffer.dtype
+            ):
+                capacity = max(n_samples_new, 2 * len(self._X_buffer))
+                X_buffer = np.empty((capacity, X.shape[1]), dtype=dtype)
+                V_buffer = np.empty((capacity, V.shape[1]))
+                X_buffer[:n_samples] = self.X_
+                V_buffer[:n_samples] = self.V_
+                self._X_buffer, self._V_buffer = X_buffer, V_buffer
+            self._X_buffer[n_samples:n_samples_new] = X
+            self._V_buffer[n_samples:n_samples_new] = V
+            n_samples = n_samples_new
+        else:
+            replace_idx = self._check_positions(replace_idx)
+            check_consistent_length(replace_idx, y)
+            dtype = np.result_type(self._X_buffer, X)
+            if dtype != self._X_buffer.dtype:
+                self._X_buffer = self._X_buffer.astype(dtype)
+            self._X_buffer[replace_idx] = X
+            self._V_buffer[replace_idx] = V
+        self.X_ = self._X_buffer[:n_samples]
+        self.V_ = self._V_buffer[:n_samples]
+        self._tree = None
 
         return self
 
+    def remove_samples(self, idx):
+        """Remove the training samples at the positions `idx` from `X_` and
+        `V_`. The last remaining training samples are moved to the freed
+        positions in their order such that the removal costs
+        O(n_removed * n_features). It is not supported for
+        `metric='precomputed'`.
+
+        Parameters
+        ----------
+        idx : array-like of shape (n_removed)
+            Unique positions of the training samples in `X_` to be removed.
+
+        Returns
+        -------
+        self: ParzenWindowClassifier,
+            The ParzenWindowClassifier without the removed samples.
+        """
+        if self.metric == "precomputed":
+            raise ValueError(
+                "`remove_samples` is not supported for "
+                "`metric='precomputed'`."
+            )
+        check_is_fitted(self)
+        if self.n_features_in_ is None:
+            idx = check_array(idx, ensure_2d=False, ensure_min_samples=0)
+            if len(idx) > 0:
+                raise ValueError("There are no training samples to remove.")
+            return self
+        idx = self._check_positions(idx)
+        n_samples = len(self.X_) - len(idx)
+        is_removed = np.zeros(len(self.X_), dtype=bool)
+        is_removed[idx] = True
+        free_idx = np.flatnonzero(is_removed[:n_samples])
+        move_idx = n_samples + np.flatnonzero(~is_removed[n_samples:])
+        self._X_buffer[free_idx] = self._X_buffer[move_idx]
+        self._V_buffer[free_idx] = self._V_buffer[move_idx]
+        self.X_ = self._X_buffer[:n_samples]
+        self.V_ = self._V_buffer[:n_samples]
+        self._tree = None
+        return self
+
     def predict_freq(self, X):
         """Return class frequency estimates for the input samples 'X'.
 
@@ -201,35 +416,115 @@ class ParzenWindowClassifier(ClassFrequencyEstimator):
         X = check_array(X, force_all_finite=(self.metric != "precomputed"))
 
         # Predict zeros because of missing training data.
-        if self.n_features_in_ is None:
+        if self.n_features_in_ is None or len(self.X_) == 0:
             return np.zeros((len(X), len(self.classes_)))
 
-        # Compute kernel (metric) matrix.
+        # Check the input samples.
         if self.metric == "precomputed":
-            K = X
-            if np.size(K, 0) != np.size(X, 0) or np.size(K, 1) != np.size(
-                self.X_, 0
-            ):
+            if np.size(X, 1) != np.size(self.X_, 0):
                 raise ValueError(
                     "The kernel matrix 'X' must have the shape "
                     "(n_test_samples, n_train_samples)."
                 )
         else:
             self._check_n_features(X, reset=False)
-            K = pairwise_kernels(
-                X, self.X_, metric=self.metric, **self.metric_dict_
+
+        # Predict the input samples in tiles of bounded memory.
+        if self._use_tree() and self._tree is None:
+            self._build_tree()
+        if self._use_tree():
+            row_bytes = 2 * 8 * self.n_neighbors
+        else:
+            row_bytes = 2 * 8 * np.size(self.X_, 0)
+        n_rows = get_chunk_n_rows(
+            row_bytes=row_bytes,
+            max_n_rows=len(X),
+            working_memory=self.working_memory,
+        )
+        batches = gen_batches(len(X), n_rows)
+        if self.n_jobs in [None, 1]:
+            F = [self._predict_freq_tile(X[b]) for b in batches]
+        else:
+            F = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(self._predict_freq_tile)(X[b]) for b in batches
             )
+        return np.concatenate(F)
 
-        # computing class frequency estimates
-        if self.n_neighbors is None or np.size(self.X_, 0) <= self.n_neighbors:
-            F = K @ self.V_
+    def _use_tree(self):
+        # Whether the nearest neighbors are searched in the tree.
+        return (
+            self.algorithm != "brute"
+            and np.size(self.X_, 0) > self.n_neighbors
+        )
+
+    def _predict_freq_tile(self, X):
+        if self._use_tree():
+            # Compute the kernel values of the nearest neighbors only.
+            dist, indices = self._tree.query(X, k=self.n_neighbors)
+            gamma = self.metric_dict_.get("gamma", None)
+            gamma = 1.0 / X.shape[1] if gamma is None else gamma
+            if self.metric == "rbf":
+                dist **= 2
+            K = np.exp(-gamma * dist)
         else:
+            # Compute kernel (metric) matrix.
+            if self.metric == "precomputed":
+                K = X
+            else:
+                K = pairwise_kernels(
+                    X, self.X_, metric=self.metric, **self.metric_dict_
+                )
+
+            if (
+                self.n_neighbors is None
+                or np.size(self.X_, 0) <= self.n_neighbors
+            ):
+                return K @ self.V_
+
+            # Gather the kernel values of the nearest neighbors.
             indices = np.argpartition(K, -self.n_neighbors, axis=1)
             indices = indices[:, -self.n_neighbors :]
-            F = np.empty((np.size(X, 0), len(self.classes_)))
-            for i in range(np.size(X, 0)):
-                F[i, :] = K[i, indices[i]] @ self.V_[indices[i], :]
-        return F
+            K = np.take_along_axis(K, indices, axis=1)
+
+        # computing class frequency estimates
+        return np.einsum("ik,ikc->ic", K, self.V_[indices])
+
+    def _build_tree(self):
+        # Build the tree for searching the nearest neighbors.
+        if self.algorithm == "brute" or len(self.X_) == 0:
+            self._tree = None
+            return
+        tree_class = KDTree if self.algorithm == "kd_tree" else BallTree
+        self._tree = tree_class(
+            self.X_, metric=ParzenWindowClassifier.TREE_METRICS[self.metric]
+        )
+
+    def _check_positions(self, idx):
+        # Check positions of training samples in `X_`.
+        idx = check_array(idx, ensure_2d=False, ensure_min_samples=0)
+        if len(idx) == 0:
+            idx = idx.astype(int)
+        if not np.issubdtype(idx.dtype, np.integer):
+            raise TypeError("The positions must be integers.")
+        if len(np.unique(idx)) < len(idx):
+            raise ValueError("The positions must be unique.")
+        if np.any((idx < 0) | (idx >= len(self.X_))):
+            raise ValueError(
+                f"The positions must be in [0, {len(self.X_)}), the number "
+                f"of training samples."
+            )
+        return idx
+
+    def _copy_state(self, state):
+        # Copy the buffers, which are modified in-place by `partial_fit` and
+        # `remove_samples`.
+        state = dict(state)
+        if state.get("_X_buffer") is not None:
+            n_samples = len(state["X_"])
+            for key, buffer_key in [("X_", "_X_buffer"), ("V_", "_V_buffer")]:
+                state[buffer_key] = state[buffer_key].copy()
+                state[key] = state[buffer_key][:n_samples]
+        return state
 
     def _calculate_mean_gamma(
         N, variance, n_features, delta=(np.sqrt(2) * 1e-6)
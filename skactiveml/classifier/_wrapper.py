@@ -8,7 +8,7 @@ import warnings
 import numpy as np
 
 from copy import deepcopy
-from collections import deque
+from inspect import signature
 
 from sklearn.base import MetaEstimatorMixin, is_classifier
 from sklearn.utils.validation import (
@@ -327,6 +327,12 @@ class SklearnClassifier(SkactivemlClassifier, MetaEstimatorMixin):
             )
         return self
 
+    def _copy_state(self, state):
+        state = dict(state)
+        if "estimator_" in state:
+            state["estimator_"] = deepcopy(state["estimator_"])
+        return state
+
     def __sklearn_is_fitted__(self):
         return hasattr(self, "is_fitted_")
 
@@ -343,7 +349,17 @@ class SlidingWindowClassifier(SkactivemlClassifier, MetaEstimatorMixin):
     Implementation of a wrapper class for SkactivemlClassifier such that the
     number of training samples can be limited to the latest `window_size`
     samples. Furthermore, saves X, y and sample_weight, enabling the use of a
-    partial fit for any classifier.
+    partial fit for any classifier. The window is stored in preallocated
+    buffers of up to twice the window size, whose views `X_train_`,
+    `y_train_`, and `sample_weight_train_` hold the current window without
+    copying.
+
+    If the `partial_fit` method of `estimator` accepts the parameter
+    `replace_idx` (e.g., `ParzenWindowClassifier`), the estimator is updated
+    by the changes of the window instead of being refitted: Added samples are
+    appended to the estimator's training samples or replace the evicted
+    samples at their positions `replace_idx`. Parameters derived from the
+    training samples during `fit` are then not updated.
 
     Parameters
     ----------
@@ -366,8 +382,8 @@ class SlidingWindowClassifier(SkactivemlClassifier, MetaEstimatorMixin):
     ignore_estimator_partial_fit: bool, default=False
         If True, the existing partial_fit method in `estimator` is ignored and
         the sliding window is used instead. If False, the partial_fit method
-        in estimator is used but a warning is thrown as the sliding window has
-        no effect.
+        in estimator is used. If this method does not accept `replace_idx`, a
+        warning is thrown as the sliding window has no effect.
     random_state : int or RandomState instance or None, default=None
         Determines random number for 'predict' method. Pass an int for
         reproducible results across multiple method calls.
@@ -438,18 +454,7 @@ class SlidingWindowClassifier(SkactivemlClassifier, MetaEstimatorMixin):
         )
 
         self._add_samples("fit", X, y, sample_weight)
-        X_train = np.array(self.X_train_)
-        y_train = np.array(self.y_train_)
-        sample_weight_train = None
-        if self.sample_weight_train_ is not None:
-            sample_weight_train = np.array(self.sample_weight_train_)
-        return self._fit(
-            "fit",
-            X=X_train,
-            y=y_train,
-            sample_weight=sample_weight_train,
-            **fit_kwargs,
-        )
+        return self._refit(**fit_kwargs)
 
     def partial_fit(self, X, y, sample_weight=None, **fit_kwargs):
         """Partially fitting the model using X as training data and y as class
@@ -496,65 +501,204 @@ class SlidingWindowClassifier(SkactivemlClassifier, MetaEstimatorMixin):
             check_X_dict=self.check_X_dict_,
         )
 
-        self._add_samples("partial_fit", X, y, sample_weight)
+        n_window = len(getattr(self, "X_train_", []))
+        X_add, y_add, sample_weight_add = self._add_samples(
+            "partial_fit", X, y, sample_weight
+        )
 
         if (
             hasattr(self.estimator, "partial_fit")
             and not self.ignore_estimator_partial_fit
         ):
-            warnings.warn(
-                "The partial_fit method in estimator is used but the "
-                "sliding window has no effect. To avoid this set "
-                "`ignore_estimator_partial_fit`=True"
-            )
-            return self._fit(
-                "partial_fit",
-                X=X,
-                y=y,
-                sample_weight=sample_weight,
-                **fit_kwargs,
-            )
-        else:
-            X_train = np.array(self.X_train_)
-            y_train = np.array(self.y_train_)
-            sample_weight_train = None
-            if self.sample_weight_train_ is not None:
-                sample_weight_train = np.array(self.sample_weight_train_)
-            return self._fit(
-                "fit",
-                X=X_train,
-                y=y_train,
-                sample_weight=sample_weight_train,
-                **fit_kwargs,
-            )
+            if not self._supports_replace_idx():
+                warnings.warn(
+                    "The partial_fit method in estimator is used but the "
+                    "sliding window has no effect. To avoid this set "
+                    "`ignore_estimator_partial_fit`=True"
+                )
+                return self._fit(
+                    "partial_fit",
+                    X=X,
+                    y=y,
+                    sample_weight=sample_weight,
+                    **fit_kwargs,
+                )
+            if self._can_update(y_add):
+                return self._update(
+                    n_window, X_add, y_add, sample_weight_add, **fit_kwargs
+                )
+        return self._refit(**fit_kwargs)
+
+    def _copy_state(self, state):
+        state = dict(state)
+        if "estimator_" in state:
+            state["estimator_"] = deepcopy(state["estimator_"])
+        if state.get("_X_buffer") is not None:
+            window = slice(state["_window_start"], state["_window_stop"])
+            for key, buffer_key in [
+                ("X_train_", "_X_buffer"),
+                ("y_train_", "_y_buffer"),
+                ("sample_weight_train_", "_sample_weight_buffer"),
+            ]:
+                state[buffer_key] = state[buffer_key].copy()
+                if state[key] is not None:
+                    state[key] = state[buffer_key][window]
+        return state
 
     def _add_samples(self, fit_func, X, y, sample_weight=None):
-        if not hasattr(self, "X_train_"):
-            self.X_train_ = deque(maxlen=self.window_size)
-        if not hasattr(self, "y_train_"):
-            self.y_train_ = deque(maxlen=self.window_size)
-        if not hasattr(self, "sample_weight_train_"):
-            self.sample_weight_train_ = deque(maxlen=self.window_size)
+        # Write the samples into the buffers and return the samples that are
+        # part of the window.
         if self.only_labeled:
             is_lbld = is_labeled(y, self.missing_label)
             X = X[is_lbld]
             y = y[is_lbld]
             if sample_weight is not None:
                 sample_weight = sample_weight[is_lbld]
-            else:
-                sample_weight = None
+        if self.window_size is not None and len(y) > self.window_size:
+            X = X[-self.window_size :]
+            y = y[-self.window_size :]
+            if sample_weight is not None:
+                sample_weight = sample_weight[-self.window_size :]
         # reset the window if fit is called otherwise extend the window with
         # the given data
-        if fit_func == "fit":
-            self.X_train_ = deque(maxlen=self.window_size)
-            self.y_train_ = deque(maxlen=self.window_size)
-            self.sample_weight_train_ = deque(maxlen=self.window_size)
-        self.X_train_.extend(X)
-        self.y_train_.extend(y)
-        if sample_weight is not None:
-            self.sample_weight_train_.extend(sample_weight)
-        else:
+        if fit_func == "fit" or not hasattr(self, "_X_buffer"):
+            self._X_buffer = None
+            self._y_buffer = None
+            self._sample_weight_buffer = None
+            self._window_start, self._window_stop = 0, 0
+            self._estimator_start = 0
+            self._has_sample_weight = False
+            self.X_train_, self.y_train_ = X[:0], y[:0]
+        if len(y) > 0:
+            w = np.ones(len(y)) if sample_weight is None else sample_weight
+            if self._X_buffer is None:
+                self._X_buffer = X[:0]
+                self._y_buffer = y[:0]
+                self._sample_weight_buffer = w[:0]
+            n_keep = self._window_stop - self._window_start
+            if self.window_size is not None:
+                n_keep = min(n_keep, self.window_size - len(y))
+            if n_keep > 0 and X.shape[1:] != self._X_buffer.shape[1:]:
+                raise ValueError(
+                    f"The samples in `X` have the shape {X.shape[1:]}, but "
+                    f"the samples in the window have the shape "
+                    f"{self._X_buffer.shape[1:]}."
+                )
+            self._window_start = self._window_stop - n_keep
+            buffers = [
+                (self._X_buffer, X),
+                (self._y_buffer, y),
+                (self._sample_weight_buffer, w),
+            ]
+            if (
+                self._window_stop + len(y) > len(self._X_buffer)
+                or X.shape[1:] != self._X_buffer.shape[1:]
+                or any(np.result_type(b, v) != b.dtype for b, v in buffers)
+            ):
+                # Move the window to the front of the buffers, whose capacity
+                # is increased to twice the size of the extended window if it
+                # is exceeded. Hence, moving the window costs O(1) amortized
+                # time per sample.
+                capacity = max(len(self._X_buffer), 2 * (n_keep + len(y)))
+                window = slice(self._window_start, self._window_stop)
+                new_buffers = []
+                for buffer, values in buffers:
+                    new_buffer = np.empty(
+                        (capacity,) + values.shape[1:],
+                        dtype=np.result_type(buffer, values),
+                    )
+                    new_buffer[:n_keep] = buffer[window]
+                    new_buffers.append(new_buffer)
+                (
+                    self._X_buffer,
+                    self._y_buffer,
+                    self._sample_weight_buffer,
+                ) = new_buffers
+                self._window_start, self._window_stop = 0, n_keep
+            window = slice(self._window_stop, self._window_stop + len(y))
+            self._X_buffer[window] = X
+            self._y_buffer[window] = y
+            self._sample_weight_buffer[window] = w
+            self._window_stop += len(y)
+            window = slice(self._window_start, self._window_stop)
+            self.X_train_ = self._X_buffer[window]
+            self.y_train_ = self._y_buffer[window]
+        # Samples without weights in the window are weighted by one if other
+        # samples have weights.
+        self._has_sample_weight |= sample_weight is not None
+        if not self._has_sample_weight or self._X_buffer is None:
             self.sample_weight_train_ = None
+        else:
+            self.sample_weight_train_ = self._sample_weight_buffer[
+                self._window_start : self._window_stop
+            ]
+        return X, y, sample_weight
+
+    def _supports_replace_idx(self):
+        # Check whether the estimator can be updated by the changes of the
+        # window via the parameter `replace_idx` of its `partial_fit` method.
+        try:
+            parameters = signature(self.estimator.partial_fit).parameters
+        except (TypeError, ValueError):
+            return False
+        return "replace_idx" in parameters
+
+    def _can_update(self, y):
+        # The estimator can be updated if it has been fitted on the window,
+        # not all samples of the window are evicted, and the added labels are
+        # known classes.
+        if not hasattr(self, "estimator_") or not hasattr(
+            self.estimator_, "classes_"
+        ):
+            return False
+        if self.window_size is not None and len(y) >= self.window_size:
+            return False
+        if getattr(self.estimator_, "classes", None) is not None:
+            return True
+        y_lbld = y[is_labeled(y, self.missing_label)]
+        return bool(np.isin(y_lbld, self.estimator_.classes_).all())
+
+    def _update(self, n_window, X, y, sample_weight=None, **fit_kwargs):
+        # Append the added samples to the training samples of the estimator
+        # until the window is full and replace the evicted samples, which are
+        # stored at the positions `_estimator_start` onwards, afterwards.
+        n_append = len(y)
+        if self.window_size is not None:
+            n_append = min(n_append, self.window_size - n_window)
+        n_replace = len(y) - n_append
+        w = sample_weight
+        if n_append > 0:
+            self._fit(
+                "partial_fit",
+                X=X[:n_append],
+                y=y[:n_append],
+                sample_weight=None if w is None else w[:n_append],
+                **fit_kwargs,
+            )
+        if n_replace > 0:
+            replace_idx = self._estimator_start + np.arange(n_replace)
+            replace_idx %= self.window_size
+            self._estimator_start = replace_idx[-1] + 1
+            self._fit(
+                "partial_fit",
+                X=X[n_append:],
+                y=y[n_append:],
+                sample_weight=None if w is None else w[n_append:],
+                replace_idx=replace_idx,
+                **fit_kwargs,
+            )
+        return self
+
+    def _refit(self, **fit_kwargs):
+        # Fit the estimator on the samples of the window in their order.
+        self._estimator_start = 0
+        return self._fit(
+            "fit",
+            X=self.X_train_,
+            y=self.y_train_,
+            sample_weight=self.sample_weight_train_,
+            **fit_kwargs,
+        )
 
     def _fit(self, fit_function, X, y, sample_weight=None, **fit_kwargs):
         # Check whether estimator can deal with cost matrix.
@@ -7,11 +7,18 @@ Classifier Ensemble for Multiple Annotators
 from copy import deepcopy
 
 import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator
 from sklearn.ensemble._base import _BaseHeterogeneousEnsemble
 from sklearn.utils.validation import check_array, check_is_fitted
 
 from ...base import SkactivemlClassifier
-from ...utils import MISSING_LABEL, is_labeled, compute_vote_vectors
+from ...utils import (
+    MISSING_LABEL,
+    is_labeled,
+    compute_vote_vectors,
+    check_type,
+)
 
 
 class AnnotatorEnsembleClassifier(
@@ -19,7 +26,10 @@ class AnnotatorEnsembleClassifier(
 ):
     """AnnotatorEnsembleClassifier
 
-    This strategy consists of fitting one classifier per annotator.
+    This strategy consists of fitting one classifier per annotator. When
+    refitting, only the classifiers of annotators whose class labels or
+    sample weights changed since the last fit are fitted again, if the
+    samples and the estimators' parameters are unchanged.
 
     Parameters
     ----------
@@ -32,6 +42,10 @@ class AnnotatorEnsembleClassifier(
         Else if 'soft', predicts the class label based on the argmax of
         the sums of the predicted probabilities, which is recommended for
         an ensemble of well-calibrated classifiers.
+    n_jobs : int, default=None
+        The number of threads fitting the classifiers and computing their
+        predictions in parallel. None means 1 and -1 means using all
+        processors.
     classes : array-like of shape (n_classes,), default=None
         Holds the label for each class. If none, the classes are determined
         during the fit.
@@ -62,6 +76,7 @@ class AnnotatorEnsembleClassifier(
         self,
         estimators,
         voting="hard",
+        n_jobs=None,
         classes=None,
         missing_label=MISSING_LABEL,
         cost_matrix=None,
@@ -76,6 +91,7 @@ class AnnotatorEnsembleClassifier(
             random_state=random_state,
         )
         self.voting = voting
+        self.n_jobs = n_jobs
 
     def fit(self, X, y, sample_weight=None):
         """Fit the model using X as training data and y as class labels.
@@ -116,12 +132,16 @@ class AnnotatorEnsembleClassifier(
             y_ensure_1d=False,
         )
         self._check_n_features(X, reset=True)
-
-        # Copy estimators
-        self.estimators_ = deepcopy(self.estimators)
+        check_type(self.n_jobs, "n_jobs", int, target_vals=[None])
+        if self.n_jobs == 0:
+            raise ValueError("`n_jobs` must not be 0.")
 
         # Check for empty training data.
+        fit_cache = getattr(self, "_fit_cache", None)
+        estimators_fitted = getattr(self, "estimators_", None)
+        self._fit_cache = None
         if self.n_features_in_ is None:
+            self.estimators_ = deepcopy(self.estimators)
             return self
 
         # Check number of estimators.
@@ -143,15 +163,43 @@ class AnnotatorEnsembleClassifier(
                 f"got `voting='{self.voting}'`)"
             )
 
+        # Copy the estimators of annotators with changed training data,
+        # whereas the other fitted estimators are reused.
+        params = [est.get_params() for _, est in self.estimators]
+        is_changed = self._get_changed_annotators(
+            fit_cache, X, y, sample_weight, params
+        )
+        self.estimators_ = [
+            deepcopy(est) if is_changed[i] else estimators_fitted[i]
+            for i, est in enumerate(self.estimators)
+        ]
+
         # Fit each estimator
-        for i, est in enumerate(self.estimators_):
+        fit_calls = []
+        for i in np.flatnonzero(is_changed):
+            est = self.estimators_[i]
             est[1].set_params(missing_label=-1)
             if self.classes is None or est[1].classes is None:
                 est[1].set_params(classes=np.arange(len(self.classes_)))
             if sample_weight is None:
-                est[1].fit(X=X, y=y[:, i])
+                fit_calls.append((est[1].fit, (X, y[:, i])))
             else:
-                est[1].fit(X=X, y=y[:, i], sample_weight=sample_weight[:, i])
+                fit_args = (X, y[:, i], sample_weight[:, i])
+                fit_calls.append((est[1].fit, fit_args))
+        self._call_estimators(fit_calls)
+
+        self._fit_cache = {
+            "X": X.copy(),
+            "y": y.copy(),
+            "sample_weight": (
+                None if sample_weight is None else sample_weight.copy()
+            ),
+            "classes": self.classes_,
+            "estimators": [
+                (name, est, deepcopy(est_params))
+                for (name, est), est_params in zip(self.estimators, params)
+            ],
+        }
         return self
 
     def predict_proba(self, X):
@@ -174,17 +222,64 @@ class AnnotatorEnsembleClassifier(
         if self.n_features_in_ is None:
             return np.ones((len(X), len(self.classes_))) / len(self.classes_)
         elif self.voting == "hard":
-            y_pred = np.array(
-                [est.predict(X) for _, est in self.estimators_]
-            ).T
+            y_pred = self._call_estimators(
+                [(est.predict, (X,)) for _, est in self.estimators_]
+            )
+            y_pred = np.array(y_pred).T
             V = compute_vote_vectors(y=y_pred, classes=self.classes_)
             P = V / np.sum(V, axis=1, keepdims=True)
         elif self.voting == "soft":
-            P = np.array([est.predict_proba(X) for _, est in self.estimators_])
+            P = self._call_estimators(
+                [(est.predict_proba, (X,)) for _, est in self.estimators_]
+            )
             P = np.sum(P, axis=0)
             P /= np.sum(P, axis=1, keepdims=True)
         return P
 
+    def _get_changed_annotators(self, fit_cache, X, y, sample_weight, params):
+        # Determine the annotators whose estimators need to be fitted, i.e.,
+        # all if the samples, classes, or number of annotators changed, and
+        # otherwise those with changed labels, sample weights, or parameters.
+        # Parameters are compared by value to copies taken at the last fit,
+        # such that in-place changes, e.g., of a dictionary, are detected.
+        is_changed = np.ones(y.shape[1], dtype=bool)
+        if (
+            fit_cache is None
+            or fit_cache["y"].shape != y.shape
+            or not np.array_equal(fit_cache["classes"], self.classes_)
+            or fit_cache["X"].shape != X.shape
+            or not np.array_equal(fit_cache["X"], X)
+            or (fit_cache["sample_weight"] is None) != (sample_weight is None)
+        ):
+            return is_changed
+        is_changed = np.any(fit_cache["y"] != y, axis=0)
+        if sample_weight is not None:
+            is_changed |= np.any(
+                fit_cache["sample_weight"] != sample_weight, axis=0
+            )
+        for i, ((name, est), est_params) in enumerate(
+            zip(self.estimators, params)
+        ):
+            name_fitted, est_fitted, est_params_fitted = fit_cache[
+                "estimators"
+            ][i]
+            is_changed[i] |= (
+                name != name_fitted
+                or est is not est_fitted
+                or not _is_equal_param(est_params, est_params_fitted)
+            )
+        return is_changed
+
+    def _call_estimators(self, calls):
+        # Call the estimators' methods with their arguments, in parallel if
+        # `n_jobs` is set. Threads are used such that the samples are shared
+        # instead of being copied to each worker.
+        if self.n_jobs in [None, 1]:
+            return [method(*args) for method, args in calls]
+        return Parallel(n_jobs=self.n_jobs, prefer="threads")(
+            delayed(method)(*args) for method, args in calls
+        )
+
     def _validate_estimators(self):
         _BaseHeterogeneousEnsemble._validate_estimators(self)
         for name, est in self.estimators:
@@ -222,3 +317,37 @@ class AnnotatorEnsembleClassifier(
                 and not np.array_equal(self.classes, est.classes)
             ):
                 raise ValueError(error_msg)
+
+
+def _is_equal_param(param, param_fitted):
+    # Compare two parameter values recursively by value. Values that cannot be
+    # compared are considered as different, which leads to a refit.
+    if param is param_fitted:
+        return True
+    if type(param) is not type(param_fitted):
+        return False
+    if isinstance(param, dict):
+        return param.keys() == param_fitted.keys() and all(
+            _is_equal_param(param[key], param_fitted[key]) for key in param
+        )
+    if isinstance(param, (list, tuple)):
+        return len(param) == len(param_fitted) and all(
+            _is_equal_param(p, p_fitted)
+            for p, p_fitted in zip(param, param_fitted)
+        )
+    if isinstance(param, np.ndarray):
+        return (
+            param.dtype == param_fitted.dtype
+            and param.shape == param_fitted.shape
+            and _is_equal_param(param.tolist(), param_fitted.tolist())
+        )
+    if isinstance(param, np.random.RandomState):
+        return _is_equal_param(param.get_state(), param_fitted.get_state())
+    if isinstance(param, BaseEstimator):
+        return _is_equal_param(
+            param.get_params(deep=False), param_fitted.get_params(deep=False)
+        )
+    try:
+        return bool(param == param_fitted)
+    except Exception:
+        return False
@@ -77,6 +77,32 @@ class TestAnnotatorEnsembleClassifier(unittest.TestCase):
         clf = AnnotatorEnsembleClassifier(estimators=estimators, voting=1)
         self.assertRaises(ValueError, clf.fit, X=self.X, y=self.y)
 
+    def test_init_param_n_jobs(self):
+        estimators = [("pwc", ParzenWindowClassifier())]
+        for n_jobs, err in [
+            ("1", TypeError),
+            (1.5, TypeError),
+            (0, ValueError),
+        ]:
+            clf = AnnotatorEnsembleClassifier(
+                estimators=estimators, n_jobs=n_jobs
+            )
+            self.assertRaises(err, clf.fit, X=self.X, y=self.y[:, :1])
+        for voting in ["hard", "soft"]:
+            estimators = [
+                ("pwc", ParzenWindowClassifier()),
+                ("gnb", SklearnClassifier(GaussianNB())),
+            ]
+            P = [
+                AnnotatorEnsembleClassifier(
+                    estimators=estimators, voting=voting, n_jobs=n_jobs
+                )
+                .fit(X=self.X, y=self.y)
+                .predict_proba(self.X)
+                for n_jobs in [None, 2]
+            ]
+            np.testing.assert_array_equal(P[0], P[1])
+
     def test_fit(self):
         pwc = ParzenWindowClassifier(classes=[1, 2])
         gnb = SklearnClassifier(GaussianNB(), classes=[1, 2])
@@ -94,6 +120,71 @@ class TestAnnotatorEnsembleClassifier(unittest.TestCase):
         )
         self.assertRaises(ValueError, clf.fit, X=self.X, y=self.y[:, 0])
 
+        # Only the estimators of annotators with changed labels are refitted.
+        pwc = ParzenWindowClassifier()
+        gnb = SklearnClassifier(GaussianNB())
+        clf = AnnotatorEnsembleClassifier(
+            estimators=[("pwc", pwc), ("gnb", gnb)], voting="soft"
+        )
+        clf.fit(X=self.X, y=self.y)
+        estimators = [est for _, est in clf.estimators_]
+        y = self.y.copy()
+        y[:10, 1] = MISSING_LABEL
+        clf.fit(X=self.X, y=y)
+        self.assertIs(clf.estimators_[0][1], estimators[0])
+        self.assertIsNot(clf.estimators_[1][1], estimators[1])
+        P = clf.predict_proba(self.X)
+        clf_refit = AnnotatorEnsembleClassifier(
+            estimators=[("pwc", pwc), ("gnb", gnb)], voting="soft"
+        )
+        P_refit = clf_refit.fit(X=self.X, y=y).predict_proba(self.X)
+        np.testing.assert_array_equal(P, P_refit)
+
+        # Changed samples, sample weights, or parameters lead to a refit.
+        estimators = [est for _, est in clf.estimators_]
+        clf.fit(X=self.X, y=y, sample_weight=np.ones_like(y))
+        for i in range(2):
+            self.assertIsNot(clf.estimators_[i][1], estimators[i])
+        estimators = [est for _, est in clf.estimators_]
+        pwc.set_params(metric="linear")
+        clf.fit(X=self.X, y=y, sample_weight=np.ones_like(y))
+        self.assertIsNot(clf.estimators_[0][1], estimators[0])
+        self.assertIs(clf.estimators_[1][1], estimators[1])
+        self.assertEqual(clf.estimators_[0][1].metric, "linear")
+        estimators = [est for _, est in clf.estimators_]
+        clf.fit(X=self.X + 1, y=y, sample_weight=np.ones_like(y))
+        for i in range(2):
+            self.assertIsNot(clf.estimators_[i][1], estimators[i])
+
+        # Parameters are compared by value, so in-place changes lead to a
+        # refit, whereas equal new parameter objects do not.
+        pwc.set_params(metric="rbf", metric_dict={"gamma": 1.0})
+        clf.fit(X=self.X, y=y)
+        estimators = [est for _, est in clf.estimators_]
+        pwc.metric_dict["gamma"] = 2.0
+        clf.fit(X=self.X, y=y)
+        self.assertIsNot(clf.estimators_[0][1], estimators[0])
+        self.assertIs(clf.estimators_[1][1], estimators[1])
+        self.assertEqual(clf.estimators_[0][1].metric_dict_["gamma"], 2.0)
+        estimators = [est for _, est in clf.estimators_]
+        pwc.set_params(metric_dict={"gamma": 2.0})
+        gnb.set_params(estimator=GaussianNB())
+        clf.fit(X=self.X, y=y)
+        for i in range(2):
+            self.assertIs(clf.estimators_[i][1], estimators[i])
+        gnb.estimator.set_params(var_smoothing=1e-5)
+        clf.fit(X=self.X, y=y)
+        self.assertIs(clf.estimators_[0][1], estimators[0])
+        self.assertIsNot(clf.estimators_[1][1], estimators[1])
+        pwc.set_params(random_state=np.random.RandomState(0))
+        clf.fit(X=self.X, y=y)
+        estimators = [est for _, est in clf.estimators_]
+        clf.fit(X=self.X, y=y)
+        self.assertIs(clf.estimators_[0][1], estimators[0])
+        pwc.random_state.rand()
+        clf.fit(X=self.X, y=y)
+        self.assertIsNot(clf.estimators_[0][1], estimators[0])
+
     def test_predict_proba(self):
         pwc = ParzenWindowClassifier()
         gnb = SklearnClassifier(GaussianNB())
@@ -159,6 +159,19 @@ class TestClassifier(unittest.TestCase):
                 F = clf_mdl.predict_freq(self.X)
                 self.assertTrue(np.sum(F) > 0)
 
+        # Test restoring the fitted state.
+        with self.subTest(msg="State Test", clf_name=clf):
+            self.assertRaises(TypeError, clf_mdl.set_state, state="state")
+            P = clf_mdl.predict_proba(self.X)
+            state = clf_mdl.get_state()
+            clf_mdl.fit(X=self.X, y=self.y_missing_label)
+            for _ in range(2):
+                clf_mdl.set_state(state)
+                np.testing.assert_allclose(clf_mdl.predict_proba(self.X), P)
+                clf_mdl.fit(X=[], y=[])
+            clf_mdl_copy = deepcopy(clf_mdl_cls).set_state(state)
+            np.testing.assert_allclose(clf_mdl_copy.predict_proba(self.X), P)
+
     def test_param(self):
         not_test = [
             "self",
@@ -1,6 +1,8 @@
 import unittest
+from unittest.mock import patch
 
 import numpy as np
+from scipy.spatial.distance import cdist
 from sklearn.datasets import make_blobs
 from sklearn.mixture import BayesianGaussianMixture, GaussianMixture
 from sklearn.utils.validation import NotFittedError, check_is_fitted
@@ -104,6 +106,65 @@ class TestMixtureModelClassifier(unittest.TestCase):
         F = cmm.predict_freq(X=X)
         self.assertTrue(F.sum() > 0)
 
+        # Similarities equal the exponentials of the Mahalanobis distances.
+        for covariance_type in ["full", "tied", "diag", "spherical"]:
+            mixture = GaussianMixture(
+                n_components=3, covariance_type=covariance_type
+            )
+            cmm = MixtureModelClassifier(
+                mixture_model=mixture,
+                classes=[0, 1],
+                weight_mode="similarities",
+            )
+            cmm.fit(X=X, y=y)
+            precisions = cmm.mixture_model_.precisions_
+            if covariance_type == "tied":
+                precisions = [precisions] * 3
+            elif covariance_type != "full":
+                precisions = [
+                    np.diag(p * np.ones(X.shape[1])) for p in precisions
+                ]
+            S = np.exp(
+                -np.column_stack(
+                    [
+                        cdist(X, [m], metric="mahalanobis", VI=VI).ravel()
+                        for m, VI in zip(cmm.mixture_model_.means_, precisions)
+                    ]
+                )
+            )
+            F = S @ cmm.F_components_
+            np.testing.assert_allclose(cmm.predict_freq(X=X), F)
+
+    def test_mixture_cache(self):
+        X, y = make_blobs(n_samples=200, centers=2, random_state=0)
+        cmm = MixtureModelClassifier(
+            mixture_model=GaussianMixture(n_components=3, random_state=0),
+            classes=[0, 1],
+        )
+        cmm.fit(X=X, y=y)
+        R, log_density = cmm._estimate_mixture(X[:50])
+        mixture = cmm.mixture_model_
+        np.testing.assert_allclose(R, mixture.predict_proba(X[:50]))
+        np.testing.assert_allclose(log_density, mixture.score_samples(X[:50]))
+
+        # Repeated predictions for the same samples reuse the cache.
+        with patch.object(
+            mixture, "_estimate_weighted_log_prob"
+        ) as estimate_mock:
+            cmm.predict_proba(X[:50])
+            estimate_mock.assert_not_called()
+
+        # Other samples lead to a recomputation.
+        cmm.predict_proba(X[50:])
+        R_new, _ = cmm._estimate_mixture(X[:50])
+        self.assertIsNot(R, R_new)
+        np.testing.assert_array_equal(R, R_new)
+
+        # Refitting resets the cache.
+        cmm.fit(X=X[:100], y=y[:100])
+        self.assertIsNot(cmm.mixture_model_, mixture)
+        self.assertEqual(cmm._mixture_cache["X"].shape, (100, 2))
+
     def test_predict_proba(self):
         mixture = BayesianGaussianMixture(n_components=1).fit(X=self.X)
         cmm = MixtureModelClassifier(
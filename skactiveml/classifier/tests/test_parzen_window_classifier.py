@@ -55,6 +55,40 @@ class TestParzenWindowClassifier(unittest.TestCase):
         pwc = ParzenWindowClassifier(missing_label="nan", n_neighbors=1.5)
         self.assertRaises(TypeError, pwc.fit, X=self.X, y=self.y)
 
+    def test_init_param_algorithm(self):
+        pwc = ParzenWindowClassifier()
+        self.assertEqual(pwc.algorithm, "brute")
+        for algorithm in [None, "illegal", 1]:
+            pwc = ParzenWindowClassifier(
+                missing_label="nan", n_neighbors=1, algorithm=algorithm
+            )
+            self.assertRaises(TypeError, pwc.fit, X=self.X, y=self.y)
+        pwc = ParzenWindowClassifier(missing_label="nan", algorithm="kd_tree")
+        self.assertRaises(ValueError, pwc.fit, X=self.X, y=self.y)
+        pwc = ParzenWindowClassifier(
+            missing_label="nan",
+            n_neighbors=1,
+            metric="linear",
+            algorithm="ball_tree",
+        )
+        self.assertRaises(ValueError, pwc.fit, X=self.X, y=self.y)
+
+    def test_init_param_working_memory(self):
+        pwc = ParzenWindowClassifier()
+        self.assertIsNone(pwc.working_memory)
+        for working_memory, err in [(0, ValueError), ("1", TypeError)]:
+            pwc = ParzenWindowClassifier(
+                missing_label="nan", working_memory=working_memory
+            )
+            self.assertRaises(err, pwc.fit, X=self.X, y=self.y)
+
+    def test_init_param_n_jobs(self):
+        pwc = ParzenWindowClassifier()
+        self.assertIsNone(pwc.n_jobs)
+        for n_jobs, err in [(0, ValueError), (1.0, TypeError)]:
+            pwc = ParzenWindowClassifier(missing_label="nan", n_jobs=n_jobs)
+            self.assertRaises(err, pwc.fit, X=self.X, y=self.y)
+
     def test_fit(self):
         pwc = ParzenWindowClassifier(
             classes=["tokyo", "paris", "new york"], missing_label="nan"
@@ -74,6 +108,113 @@ class TestParzenWindowClassifier(unittest.TestCase):
             [[0, 0, 2], [0, 0, 0], [0, 1, 0]], pwc.V_
         )
 
+    def test_partial_fit(self):
+        pwc = ParzenWindowClassifier(classes=[0, 1, 2])
+        pwc.partial_fit(self.X, [0, 1, 2])
+        np.testing.assert_array_equal(pwc.V_, np.eye(3))
+
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(40, 2)
+        y = random_state.randint(0, 3, size=40).astype(float)
+        y[::7] = np.nan
+        w = random_state.rand(40)
+        X_test = random_state.rand(10, 2)
+        for sample_weight, algorithm in [
+            (None, "brute"),
+            (w, "brute"),
+            (w, "kd_tree"),
+        ]:
+            pwc = ParzenWindowClassifier(
+                classes=[0, 1, 2], n_neighbors=5, algorithm=algorithm
+            )
+            F_ref = pwc.fit(X, y, sample_weight).predict_freq(X_test)
+            pwc.fit(X[:0], y[:0])
+            for start in range(0, 40, 3):
+                sw = None if sample_weight is None else w[start : start + 3]
+                pwc.partial_fit(X[start : start + 3], y[start : start + 3], sw)
+                self.assertGreaterEqual(len(pwc._X_buffer), len(pwc.X_))
+            self.assertLessEqual(len(pwc._X_buffer), 2 * len(pwc.X_))
+            np.testing.assert_array_equal(pwc.X_, X)
+            np.testing.assert_allclose(pwc.predict_freq(X_test), F_ref)
+
+            # Replacing samples equals fitting on the replaced samples.
+            replace_idx = [3, 10, 0]
+            y_rep = y.copy()
+            y_rep[replace_idx] = [2, 0, 1]
+            pwc_ref = ParzenWindowClassifier(classes=[0, 1, 2])
+            F_ref = pwc_ref.fit(X, y_rep, w).predict_freq(X_test)
+            pwc = ParzenWindowClassifier(classes=[0, 1, 2])
+            pwc.fit(X, y, w)
+            pwc_copy = ParzenWindowClassifier(classes=[0, 1, 2])
+            pwc_copy.set_state(pwc.get_state())
+            pwc.partial_fit(
+                X[replace_idx],
+                [2, 0, 1],
+                w[replace_idx],
+                replace_idx=replace_idx,
+            )
+            np.testing.assert_allclose(pwc.predict_freq(X_test), F_ref)
+            self.assertRaises(
+                AssertionError,
+                np.testing.assert_allclose,
+                pwc_copy.predict_freq(X_test),
+                F_ref,
+            )
+
+        pwc = ParzenWindowClassifier(classes=[0, 1, 2]).fit(X, y)
+        self.assertRaises(ValueError, pwc.partial_fit, X[:2], [0, 3])
+        self.assertRaises(ValueError, pwc.partial_fit, X[:2, :1], [0, 1])
+        self.assertRaises(ValueError, pwc.partial_fit, X[:2], [0, 1], [1])
+        for replace_idx, err in [
+            ([0, 0], ValueError),
+            ([0, 40], ValueError),
+            ([0], ValueError),
+            ([0.5, 1], TypeError),
+        ]:
+            self.assertRaises(
+                err, pwc.partial_fit, X[:2], [0, 1], replace_idx=replace_idx
+            )
+        pwc.fit(X[:0], y[:0])
+        self.assertRaises(
+            ValueError, pwc.partial_fit, X[:2], [0, 1], replace_idx=[0, 1]
+        )
+
+        # The kernel rows of a precomputed kernel cannot be extended.
+        pwc = ParzenWindowClassifier(classes=[0, 1, 2], metric="precomputed")
+        self.assertRaises(ValueError, pwc.partial_fit, np.eye(2), [0, 1])
+        pwc.fit(np.eye(2), [0, 1])
+        self.assertRaises(ValueError, pwc.partial_fit, np.eye(2), [0, 1])
+        np.testing.assert_array_equal(pwc.V_, np.eye(3)[:2])
+
+    def test_remove_samples(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(20, 2)
+        y = random_state.randint(0, 3, size=20)
+        X_test = random_state.rand(10, 2)
+        pwc = ParzenWindowClassifier(classes=[0, 1, 2])
+        self.assertRaises(NotFittedError, pwc.remove_samples, [0])
+        pwc_precomputed = ParzenWindowClassifier(
+            classes=[0, 1, 2], metric="precomputed"
+        ).fit(np.eye(2), [0, 1])
+        self.assertRaises(ValueError, pwc_precomputed.remove_samples, [0])
+        for idx in [[], [19], [0, 5, 17, 18], np.arange(20)]:
+            is_kept = np.ones(20, dtype=bool)
+            is_kept[idx] = False
+            pwc_ref = ParzenWindowClassifier(classes=[0, 1, 2])
+            F_ref = pwc_ref.fit(X[is_kept], y[is_kept]).predict_freq(X_test)
+            pwc.fit(X, y).remove_samples(idx)
+            self.assertEqual(len(pwc.X_), np.sum(is_kept))
+            np.testing.assert_allclose(pwc.predict_freq(X_test), F_ref)
+
+        # The last samples are moved to the freed positions.
+        pwc.fit(X, y).remove_samples([0, 5, 17, 18])
+        np.testing.assert_array_equal(pwc.X_[[0, 5]], X[[16, 19]])
+        pwc.partial_fit(X[:2], y[:2])
+        np.testing.assert_array_equal(pwc.X_[-2:], X[:2])
+        self.assertRaises(ValueError, pwc.remove_samples, [0, 20])
+        pwc.fit(X[:0], y[:0]).remove_samples([])
+        self.assertRaises(ValueError, pwc.remove_samples, [0])
+
     def test_predict_freq(self):
         pwc = ParzenWindowClassifier(
             classes=["tokyo", "paris", "new york"],
@@ -108,6 +249,41 @@ class TestParzenWindowClassifier(unittest.TestCase):
         self.assertRaises(ValueError, pwc.predict_freq, X=[[1], [0]])
         F = pwc.predict_freq(X=[[1, 0, 0]])
         np.testing.assert_array_equal([[0, 0, 2]], F)
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(50, 3)
+        y = random_state.randint(0, 3, size=50).astype(float)
+        y[:10] = np.nan
+        X_test = random_state.rand(20, 3)
+        for metric, metric_dict in [
+            ("rbf", {"gamma": 2}),
+            ("rbf", {"gamma": "mean"}),
+            ("rbf", None),
+            ("laplacian", {"gamma": 0.5}),
+        ]:
+            pwc = ParzenWindowClassifier(
+                classes=[0, 1, 2],
+                n_neighbors=5,
+                metric=metric,
+                metric_dict=metric_dict,
+            )
+            F = pwc.fit(X, y).predict_freq(X_test)
+            for algorithm in ["kd_tree", "ball_tree"]:
+                pwc.set_params(algorithm=algorithm).fit(X, y)
+                np.testing.assert_allclose(F, pwc.predict_freq(X_test))
+        # The tiled prediction yields the same results.
+        for n_neighbors, algorithm in [
+            (None, "brute"),
+            (5, "brute"),
+            (5, "kd_tree"),
+        ]:
+            pwc = ParzenWindowClassifier(
+                classes=[0, 1, 2], n_neighbors=n_neighbors, algorithm=algorithm
+            )
+            F = pwc.fit(X, y).predict_freq(X_test)
+            for working_memory, n_jobs in [(1e-3, None), (2e-4, 2)]:
+                pwc.set_params(working_memory=working_memory, n_jobs=n_jobs)
+                F_tiled = pwc.fit(X, y).predict_freq(X_test)
+                np.testing.assert_allclose(F, F_tiled, rtol=1e-12)
         rbf_kernel = lambda x, y, gamma: np.exp(-gamma * np.sum((x - y) ** 2))
         pwc = ParzenWindowClassifier(
             classes=["tokyo", "paris"],
@@ -1,5 +1,6 @@
 import unittest
 import warnings
+from unittest.mock import patch
 
 import numpy as np
 from sklearn.datasets import make_blobs
@@ -113,6 +114,18 @@ class TestSklearnClassifier(unittest.TestCase):
         )
         self.assertFalse(hasattr(clf, "partial_fit"))
 
+        # Snapshot is not affected by in-place updates of `partial_fit`.
+        X, y = make_blobs(n_samples=20, centers=2, random_state=0)
+        clf = SklearnClassifier(GaussianNB(), classes=[0, 1])
+        clf.partial_fit(X[:10], y[:10])
+        P = clf.predict_proba(X)
+        state = clf.get_state()
+        for _ in range(2):
+            clf.partial_fit(X[10:], y[10:])
+            self.assertFalse(np.allclose(clf.predict_proba(X), P))
+            clf.set_state(state)
+            np.testing.assert_array_equal(clf.predict_proba(X), P)
+
     def test_predict_proba(self):
         clf = SklearnClassifier(
             estimator=GaussianProcessClassifier(), missing_label="nan"
@@ -415,6 +428,87 @@ class TestSlidingWindowClassifier(unittest.TestCase):
         clf.partial_fit(self.X, self.y2, sample_weight=np.ones_like(self.y2))
         self.assertTrue(clf.is_fitted_)
 
+        # Snapshot is not affected by in-place updates of `partial_fit`.
+        state = clf.get_state()
+        X_train = list(clf.X_train_)
+        for _ in range(2):
+            clf.partial_fit(self.X + 1, self.y1)
+            self.assertEqual(len(clf.X_train_), 5)
+            clf.set_state(state)
+            np.testing.assert_array_equal(clf.X_train_, X_train)
+            self.assertTrue(np.shares_memory(clf.X_train_, clf._X_buffer))
+
+    def test_partial_fit_window_updates(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(60, 2)
+        y = random_state.choice([0, 1, 2, -1], size=60)
+        w = random_state.rand(60)
+        for window_size, only_labeled, sample_weight in [
+            (None, False, None),
+            (7, False, w),
+            (7, True, None),
+            (10, True, w),
+        ]:
+            clfs = [
+                SlidingWindowClassifier(
+                    ParzenWindowClassifier(
+                        classes=[0, 1, 2], missing_label=-1
+                    ),
+                    classes=[0, 1, 2],
+                    missing_label=-1,
+                    window_size=window_size,
+                    only_labeled=only_labeled,
+                    ignore_estimator_partial_fit=ignore,
+                )
+                for ignore in [False, True]
+            ]
+            for start, stop in [(0, 3), (3, 8), (8, 9), (9, 20), (20, 60)]:
+                batch = slice(start, stop)
+                # Samples without weights are weighted by one.
+                w_batch = None
+                if sample_weight is not None and start != 8:
+                    w_batch = w[batch]
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error")
+                    clfs[0].partial_fit(X[batch], y[batch], w_batch)
+                clfs[1].partial_fit(X[batch], y[batch], w_batch)
+                np.testing.assert_array_equal(
+                    clfs[0].X_train_, clfs[1].X_train_
+                )
+                np.testing.assert_allclose(
+                    clfs[0].predict_freq(X), clfs[1].predict_freq(X)
+                )
+                if window_size is not None:
+                    self.assertLessEqual(len(clfs[0].X_train_), window_size)
+                    self.assertLessEqual(
+                        len(clfs[0].estimator_.X_), window_size
+                    )
+
+        # The estimator is updated instead of refitted.
+        clf = SlidingWindowClassifier(
+            ParzenWindowClassifier(classes=[0, 1, 2], missing_label=-1),
+            missing_label=-1,
+            window_size=5,
+        )
+        clf.fit(X[:5], y[:5])
+        with patch.object(
+            ParzenWindowClassifier, "fit", side_effect=AssertionError
+        ):
+            clf.partial_fit(X[5:8], y[5:8])
+        np.testing.assert_array_equal(
+            np.sort(clf.estimator_.X_, axis=0), np.sort(X[3:8], axis=0)
+        )
+
+        # Unknown classes lead to a refit.
+        clf = SlidingWindowClassifier(
+            ParzenWindowClassifier(missing_label="nan"),
+            missing_label="nan",
+            window_size=3,
+        )
+        clf.fit(self.X, self.y2)
+        clf.partial_fit(self.X[:1], ["paris"])
+        np.testing.assert_array_equal(clf.classes_, ["paris", "tokyo"])
+
     def test_predict_proba(self):
         clf = SlidingWindowClassifier(
             SklearnClassifier(
@@ -6,7 +6,11 @@ import numpy as np
 from sklearn.utils import check_array
 
 from ..base import SkactivemlClassifier
-from ..pool._query_by_committee import _check_ensemble, QueryByCommittee
+from ..pool._query_by_committee import (
+    _check_ensemble,
+    _check_probas,
+    QueryByCommittee,
+)
 from ..utils import (
     rand_argmax,
     MISSING_LABEL,
@@ -29,6 +33,14 @@ class BatchBALD(QueryByCommittee):
     ----------
     n_MC_samples : int > 0, default=n_estimators
         The number of monte carlo samples used for label estimation.
+    block_size : int > 0, default=None
+        The number of candidates whose joint entropies are computed together.
+        If None, it is determined by `max_memory`.
+    max_memory : float > 0, default=256
+        Maximum memory in MiB of the intermediate arrays of a block of
+        candidates, which is only used if `block_size` is None.
+    dtype : np.float32 or np.float64, default=np.float64
+        Floating point precision of the joint entropy computations.
     missing_label : scalar or string or np.nan or None, default=np.nan
         Value to represent a missing label.
     random_state : int or np.random.RandomState, default=None
@@ -47,6 +59,9 @@ class BatchBALD(QueryByCommittee):
     def __init__(
         self,
         n_MC_samples=None,
+        block_size=None,
+        max_memory=256,
+        dtype=np.float64,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -54,6 +69,9 @@ class BatchBALD(QueryByCommittee):
             missing_label=missing_label, random_state=random_state
         )
         self.n_MC_samples = n_MC_samples
+        self.block_size = block_size
+        self.max_memory = max_memory
+        self.dtype = dtype
 
     def query(
         self,
@@ -62,6 +80,7 @@ class BatchBALD(QueryByCommittee):
         ensemble,
         fit_ensemble=True,
         sample_weight=None,
+        probas=None,
         candidates=None,
         batch_size=1,
         return_utilities=False,
@@ -86,9 +105,20 @@ class BatchBALD(QueryByCommittee):
             as committee member.
         fit_ensemble : bool, default=True
             Defines whether the ensemble should be fitted on `X`, `y`, and
-            `sample_weight`.
+            `sample_weight`. It is ignored if `probas` is given.
         sample_weight: array-like of shape (n_samples), default=None
             Weights of training samples in `X`.
+        probas : array-like of shape (n_estimators, n_candidates, n_classes),
+        default=None
+            Precomputed class-membership probabilities of the ensemble members
+            for the candidates, i.e., for the unlabeled samples in `X` if
+            `candidates` is None and for the samples selected by `candidates`
+            otherwise. It may be a memory-mapped array, e.g., loaded via
+            `np.load(..., mmap_mode="r")`, which is then only read in blocks
+            of candidates (cf. `block_size` and `max_memory`). If given, the
+            ensemble members' predictions are not computed.
+            The ensemble is then not fitted, even if `fit_ensemble=True`, but
+            it must already be fitted such that its classes are known.
         candidates : None or array-like of shape (n_candidates), dtype=int or
                 array-like of shape (n_candidates, n_features), default=None
             If candidates is None, the unlabeled samples from (X,y) are
@@ -134,26 +164,36 @@ class BatchBALD(QueryByCommittee):
         # Validate classifier type.
         check_type(fit_ensemble, "fit_ensemble", bool)
 
-        ensemble, est_arr, _ = _check_ensemble(
+        # Precomputed probabilities make fitting the ensemble unnecessary.
+        ensemble, est_arr, classes = _check_ensemble(
             ensemble=ensemble,
             X=X,
             y=y,
             sample_weight=sample_weight,
-            fit_ensemble=fit_ensemble,
+            fit_ensemble=fit_ensemble and probas is None,
             missing_label=self.missing_label_,
             estimator_types=[SkactivemlClassifier],
         )
 
-        probas = np.array([est.predict_proba(X_cand) for est in est_arr])
+        if probas is None:
+            probas = np.array([est.predict_proba(X_cand) for est in est_arr])
+        else:
+            probas = _check_probas(probas, len(X_cand), len(classes))
 
         if self.n_MC_samples is None:
-            n_MC_samples_ = len(est_arr)
+            n_MC_samples_ = len(probas)
         else:
             n_MC_samples_ = self.n_MC_samples
         check_scalar(n_MC_samples_, "n_MC_samples", int, min_val=1)
 
         batch_utilities_cand = batch_bald(
-            probas, batch_size, n_MC_samples_, self.random_state_
+            probas,
+            batch_size,
+            n_MC_samples_,
+            self.random_state_,
+            block_size=self.block_size,
+            max_memory=self.max_memory,
+            dtype=self.dtype,
         )
         if mapping is None:
             batch_utilities = batch_utilities_cand
@@ -171,7 +211,15 @@ class BatchBALD(QueryByCommittee):
             return best_indices
 
 
-def batch_bald(probas, batch_size, n_MC_samples=None, random_state=None):
+def batch_bald(
+    probas,
+    batch_size,
+    n_MC_samples=None,
+    random_state=None,
+    block_size=None,
+    max_memory=256,
+    dtype=np.float64,
+):
     """BatchBALD: Efficient and Diverse Batch Acquisition
         for Deep Bayesian Active Learning
 
@@ -183,13 +231,23 @@ def batch_bald(probas, batch_size, n_MC_samples=None, random_state=None):
     Parameters
     ----------
     probas : array-like of shape (n_estimators, n_samples, n_classes)
-        The probability estimates of all estimators, samples, and classes.
+        The probability estimates of all estimators, samples, and classes. It
+        may be a memory-mapped array, which is only read in blocks of
+        samples.
     batch_size : int, default=1
         The number of samples to be selected in one AL cycle.
     n_MC_samples : int > 0, default=n_estimators
         The number of monte carlo samples used for label estimation.
     random_state : int or np.random.RandomState, default=None
         The random state to use.
+    block_size : int > 0, default=None
+        The number of candidates whose joint entropies are computed together.
+        If None, it is determined by `max_memory`.
+    max_memory : float > 0, default=256
+        Maximum memory in MiB of the intermediate arrays of a block of
+        candidates, which is only used if `block_size` is None.
+    dtype : np.float32 or np.float64, default=np.float64
+        Floating point precision of the joint entropy computations.
 
     Returns
     -------
@@ -215,17 +273,34 @@ def batch_bald(probas, batch_size, n_MC_samples=None, random_state=None):
         n_MC_samples = len(probas)
     check_scalar(n_MC_samples, "n_MC_samples", int, min_val=1)
     random_state = check_random_state(random_state)
+    if block_size is not None:
+        check_scalar(block_size, "block_size", int, min_val=1)
+    check_scalar(
+        max_memory,
+        "max_memory",
+        (int, float),
+        min_val=0,
+        min_inclusive=False,
+    )
+    check_type(dtype, "dtype", target_vals=[np.float32, np.float64])
 
-    probs_N_K_C = probs_K_N_C.swapaxes(0, 1)
-    log_probs_N_K_C = np.log(probs_N_K_C)
-    N, K, C = log_probs_N_K_C.shape
+    K, N, C = probs_K_N_C.shape
 
     batch_size = min(batch_size, N)
 
-    conditional_entropies_N = _compute_conditional_entropy(log_probs_N_K_C)
+    conditional_entropies_N = _compute_conditional_entropy(
+        probs_K_N_C, block_size=block_size, max_memory=max_memory
+    )
 
     batch_joint_entropy = _DynamicJointEntropy(
-        n_MC_samples, batch_size - 1, K, C, random_state
+        n_MC_samples,
+        batch_size - 1,
+        K,
+        C,
+        random_state,
+        block_size=block_size,
+        max_memory=max_memory,
+        dtype=dtype,
     )
 
     utilities = np.zeros((batch_size, N))
@@ -235,7 +310,9 @@ def batch_bald(probas, batch_size, n_MC_samples=None, random_state=None):
         if i > 0:
             latest_index = query_indices[-1]
             batch_joint_entropy.add_variables(
-                log_probs_N_K_C[latest_index : latest_index + 1]
+                np.log(probs_K_N_C[:, latest_index : latest_index + 1])
+                .swapaxes(0, 1)
+                .astype(float)
             )
 
         shared_conditinal_entropies = conditional_entropies_N[
@@ -243,7 +320,7 @@ def batch_bald(probas, batch_size, n_MC_samples=None, random_state=None):
         ].sum()
 
         utilities[i] = batch_joint_entropy.compute_batch(
-            log_probs_N_K_C, output_entropies_B=utilities[i]
+            probs_K_N_C, output_entropies_B=utilities[i]
         )
 
         utilities[i] -= conditional_entropies_N + shared_conditinal_entropies
@@ -257,48 +334,93 @@ def batch_bald(probas, batch_size, n_MC_samples=None, random_state=None):
 
 
 class _ExactJointEntropy:
-    def __init__(self, joint_probs_M_K):
+    def __init__(
+        self, joint_probs_M_K, block_size=None, max_memory=256, dtype=float
+    ):
         self.joint_probs_M_K = joint_probs_M_K
+        self.block_size = block_size
+        self.max_memory = max_memory
+        self.dtype = dtype
 
     @staticmethod
-    def empty(K):
-        return _ExactJointEntropy(np.ones((1, K)))
+    def empty(K, **kwargs):
+        return _ExactJointEntropy(np.ones((1, K)), **kwargs)
 
     def add_variables(self, log_probs_N_K_C):
         N, K, C = log_probs_N_K_C.shape
-        joint_probs_K_M_1 = self.joint_probs_M_K.T[:, :, None]
-
-        probs_N_K_C = np.exp(log_probs_N_K_C)
+        joint_probs_M_K = self.joint_probs_M_K
 
-        # Using lots of memory.
-        for i in range(N):
-            probs_i__K_1_C = probs_N_K_C[i][:, None, :]
-            joint_probs_K_M_C = joint_probs_K_M_1 * probs_i__K_1_C
-            joint_probs_K_M_1 = joint_probs_K_M_C.reshape((K, -1, 1))
+        # Each added variable multiplies the number of joint configurations
+        # M by C.
+        for probs_K_C in np.exp(log_probs_N_K_C):
+            joint_probs_M_K = (
+                joint_probs_M_K[:, None, :] * probs_K_C.T[None, :, :]
+            ).reshape((-1, K))
 
-        self.joint_probs_M_K = joint_probs_K_M_1.squeeze(2).T
+        self.joint_probs_M_K = joint_probs_M_K
         return self
 
-    def compute_batch(self, log_probs_B_K_C, output_entropies_B=None):
-        B, K, C = log_probs_B_K_C.shape
-        M = self.joint_probs_M_K.shape[0]
-
-        probs_b_K_C = np.exp(log_probs_B_K_C)
-        b = probs_b_K_C.shape[0]
-        probs_b_M_C = np.empty((b, M, C))
-        for i in range(b):
-            np.matmul(
-                self.joint_probs_M_K,
-                probs_b_K_C[i],
-                out=probs_b_M_C[i],
-            )
-        probs_b_M_C /= K
+    def compute_batch(self, probs_K_B_C, output_entropies_B=None):
+        return _joint_entropy_blocks(
+            self.joint_probs_M_K,
+            probs_K_B_C,
+            output_entropies_B=output_entropies_B,
+            block_size=self.block_size,
+            max_memory=self.max_memory,
+            dtype=self.dtype,
+        )
+
 
-        output_entropies_B = np.sum(
-            -np.log(probs_b_M_C) * probs_b_M_C, axis=(1, 2)
+def _joint_entropy_blocks(
+    joint_probs_M_K,
+    probs_K_B_C,
+    importance_weights_M=None,
+    output_entropies_B=None,
+    block_size=None,
+    max_memory=256,
+    dtype=float,
+):
+    """Computes the joint entropies of the variables represented by
+    `joint_probs_M_K` with each candidate of `probs_K_B_C` in blocks of
+    `block_size` candidates via batched matrix products. If `block_size` is
+    None, it is chosen such that the intermediate arrays of a block require
+    at most `max_memory` MiB. If `importance_weights_M` is given, the joint
+    configurations are weighted by their inverse. Only one block of
+    `probs_K_B_C` is read at a time so that it may be memory-mapped.
+    """
+    K, B, C = probs_K_B_C.shape
+    M = joint_probs_M_K.shape[0]
+    if output_entropies_B is None:
+        output_entropies_B = np.empty(B)
+    block_size = _get_block_size(
+        block_size, max_memory, (K * C + 2 * M * C) * np.dtype(dtype).itemsize
+    )
+
+    joint_probs_M_K = np.asarray(joint_probs_M_K, dtype=dtype)
+    if importance_weights_M is not None:
+        inv_weights_M_1 = (1 / importance_weights_M)[:, None].astype(dtype)
+    for start in range(0, B, block_size):
+        probs_b_K_C = np.asarray(
+            probs_K_B_C[:, start : start + block_size], dtype=dtype
+        ).swapaxes(0, 1)
+        probs_b_M_C = np.matmul(joint_probs_M_K, probs_b_K_C)
+        probs_b_M_C /= K
+        nats_b_M_C = np.log(probs_b_M_C)
+        nats_b_M_C *= probs_b_M_C
+        if importance_weights_M is not None:
+            nats_b_M_C *= inv_weights_M_1
+        output_entropies_B[start : start + block_size] = -np.sum(
+            nats_b_M_C, axis=(1, 2)
         )
+    if importance_weights_M is not None:
+        output_entropies_B /= M
+    return output_entropies_B
 
-        return output_entropies_B
+
+def _get_block_size(block_size, max_memory, bytes_per_candidate):
+    if block_size is None:
+        block_size = max(1, int(max_memory * 2**20 // bytes_per_candidate))
+    return block_size
 
 
 def _batch_multi_choices(probs_b_C, M, random_state):
@@ -313,11 +435,13 @@ def _batch_multi_choices(probs_b_C, M, random_state):
     C = probs_B_C.shape[1]
 
     # samples: Ni... x draw_per_xx
-    choices = [
-        random_state.choice(C, size=M, p=probs_B_C[b], replace=True)
-        for b in range(B)
-    ]
-    choices = np.array(choices, dtype=int)
+    # Inverse transform sampling with the same random numbers as
+    # `random_state.choice(C, size=M, p=probs_B_C[b])` for each b in turn.
+    cdf_B_C = np.cumsum(probs_B_C, axis=-1)
+    cdf_B_C /= cdf_B_C[:, -1:]
+    uniform_B_M = random_state.random_sample((B, M))
+    choices = np.sum(cdf_B_C[:, None, :] <= uniform_B_M[:, :, None], axis=-1)
+    choices = np.minimum(choices, C - 1)
 
     choices_b_M = choices.reshape(list(probs_b_C.shape[:-1]) + [M])
     return choices_b_M
@@ -345,11 +469,21 @@ class _SampledJointEntropy:
     `_SampledJointEntropy.compute_batch` computes the joint entropy of the added variables with each of the variables in the provided batch probabilities in turn.
     """
 
-    def __init__(self, sampled_joint_probs_M_K, random_state):
+    def __init__(
+        self,
+        sampled_joint_probs_M_K,
+        random_state,
+        block_size=None,
+        max_memory=256,
+        dtype=float,
+    ):
         self.sampled_joint_probs_M_K = sampled_joint_probs_M_K
+        self.block_size = block_size
+        self.max_memory = max_memory
+        self.dtype = dtype
 
     @staticmethod
-    def sample(probs_N_K_C, M, random_state):
+    def sample(probs_N_K_C, M, random_state, **kwargs):
         K = probs_N_K_C.shape[1]
 
         # S: num of samples per w
@@ -370,44 +504,40 @@ class _SampledJointEntropy:
         samples_K_M = probs_K_K_S.reshape((K, -1))
 
         samples_M_K = samples_K_M.T
-        return _SampledJointEntropy(samples_M_K, random_state)
-
-    def compute_batch(self, log_probs_B_K_C, output_entropies_B=None):
-        B, K, C = log_probs_B_K_C.shape
-        M = self.sampled_joint_probs_M_K.shape[0]
-
-        b = log_probs_B_K_C.shape[0]
-
-        probs_b_M_C = np.empty(
-            (b, M, C),
+        return _SampledJointEntropy(samples_M_K, random_state, **kwargs)
+
+    def compute_batch(self, probs_K_B_C, output_entropies_B=None):
+        return _joint_entropy_blocks(
+            self.sampled_joint_probs_M_K,
+            probs_K_B_C,
+            importance_weights_M=self.sampled_joint_probs_M_K.mean(axis=1),
+            output_entropies_B=output_entropies_B,
+            block_size=self.block_size,
+            max_memory=self.max_memory,
+            dtype=self.dtype,
         )
-        for i in range(b):
-            np.matmul(
-                self.sampled_joint_probs_M_K,
-                np.exp(log_probs_B_K_C[i]),
-                out=probs_b_M_C[i],
-            )
-        probs_b_M_C /= K
-
-        q_1_M_1 = self.sampled_joint_probs_M_K.mean(axis=1, keepdims=True)[
-            None
-        ]
-
-        output_entropies_B = (
-            np.sum(-np.log(probs_b_M_C) * probs_b_M_C / q_1_M_1, axis=(1, 2))
-            / M
-        )
-
-        return output_entropies_B
 
 
 class _DynamicJointEntropy:
-    def __init__(self, M, max_N, K, C, random_state):
+    def __init__(
+        self,
+        M,
+        max_N,
+        K,
+        C,
+        random_state,
+        block_size=None,
+        max_memory=256,
+        dtype=float,
+    ):
         self.M = M
         self.N = 0
         self.max_N = max_N
+        self.block_kwargs = dict(
+            block_size=block_size, max_memory=max_memory, dtype=dtype
+        )
 
-        self.inner = _ExactJointEntropy.empty(K)
+        self.inner = _ExactJointEntropy.empty(K, **self.block_kwargs)
         self.log_probs_max_N_K_C = np.empty((max_N, K, C))
 
         self.random_state = random_state
@@ -425,21 +555,31 @@ class _DynamicJointEntropy:
                 np.exp(self.log_probs_max_N_K_C[: self.N]),
                 self.M,
                 self.random_state,
+                **self.block_kwargs,
             )
         else:
             self.inner.add_variables(log_probs_N_K_C)
 
         return self
 
-    def compute_batch(self, log_probs_B_K_C, output_entropies_B=None):
+    def compute_batch(self, probs_K_B_C, output_entropies_B=None):
         """Computes the joint entropy of the added variables together with the batch (one by one)."""
-        return self.inner.compute_batch(log_probs_B_K_C, output_entropies_B)
+        return self.inner.compute_batch(probs_K_B_C, output_entropies_B)
 
 
-def _compute_conditional_entropy(log_probs_N_K_C):
-    N, K, C = log_probs_N_K_C.shape
+def _compute_conditional_entropy(probs_K_N_C, block_size=None, max_memory=256):
+    K, N, C = probs_K_N_C.shape
+    block_size = _get_block_size(block_size, max_memory, 2 * K * C * 8)
 
-    nats_N_K_C = log_probs_N_K_C * np.exp(log_probs_N_K_C)
-    nats_N_K_C[np.isnan(nats_N_K_C)] = 0
-    entropies_N = -np.sum(nats_N_K_C, axis=(1, 2)) / K
+    entropies_N = np.empty(N)
+    for start in range(0, N, block_size):
+        probs_K_b_C = np.asarray(
+            probs_K_N_C[:, start : start + block_size], dtype=float
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nats_K_b_C = np.log(probs_K_b_C) * probs_K_b_C
+        nats_K_b_C[np.isnan(nats_K_b_C)] = 0
+        entropies_N[start : start + block_size] = (
+            -np.sum(nats_K_b_C, axis=(0, 2)) / K
+        )
     return entropies_N
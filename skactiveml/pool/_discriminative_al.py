@@ -7,11 +7,13 @@ import numpy as np
 from sklearn import clone
 
 from ..base import SingleAnnotatorPoolQueryStrategy, SkactivemlClassifier
+from ..classifier import ParzenWindowClassifier
 from ..utils import (
     MISSING_LABEL,
     rand_argmax,
     is_unlabeled,
     simple_batch,
+    check_scalar,
     check_type,
 )
 
@@ -31,6 +33,24 @@ class DiscriminativeAL(SingleAnnotatorPoolQueryStrategy):
         `greedy_selection=False` the classifying discriminator is refitted
         after each sample selection within a batch. Otherwise, the
         discriminator is kept fixed.
+    refit_interval : int, optional (default=1)
+        This parameter is only relevant for `greedy_selection=False`. The
+        discriminator is updated after every `refit_interval` selections
+        within a batch, while the selections in between are based on the
+        utilities of the last update. `refit_interval=1` corresponds to an
+        update after each selection.
+    use_partial_fit : bool, optional (default=False)
+        This parameter is only relevant for `greedy_selection=False`. If
+        True, the discriminator is only fitted on the whole pool before the
+        first selection of a batch. Afterward, it is updated via
+        `partial_fit` with the samples selected since its last update as
+        labeled samples, which requires the discriminator to implement
+        `partial_fit`. A `ParzenWindowClassifier` replaces the labels of
+        these samples in place, which equals refitting it. Other
+        discriminators cannot replace labels, so these samples are added
+        again as labeled samples while they remain in the training data as
+        unlabeled samples from the previous fits. This approximates refitting
+        and gets coarser the more samples are selected within a batch.
     missing_label : scalar or string or np.nan or None, optional
     (default=np.nan)
         Value to represent a missing label.
@@ -47,6 +67,8 @@ class DiscriminativeAL(SingleAnnotatorPoolQueryStrategy):
     def __init__(
         self,
         greedy_selection=False,
+        refit_interval=1,
+        use_partial_fit=False,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -54,6 +76,8 @@ class DiscriminativeAL(SingleAnnotatorPoolQueryStrategy):
             missing_label=missing_label, random_state=random_state
         )
         self.greedy_selection = greedy_selection
+        self.refit_interval = refit_interval
+        self.use_partial_fit = use_partial_fit
 
     def query(
         self,
@@ -120,6 +144,13 @@ class DiscriminativeAL(SingleAnnotatorPoolQueryStrategy):
         )
         check_type(discriminator, "discriminator", SkactivemlClassifier)
         check_type(self.greedy_selection, "greedy_selection", bool)
+        check_scalar(self.refit_interval, "refit_interval", int, min_val=1)
+        check_type(self.use_partial_fit, "use_partial_fit", bool)
+        if self.use_partial_fit and not hasattr(discriminator, "partial_fit"):
+            raise TypeError(
+                "`discriminator` must implement `partial_fit` if "
+                "`use_partial_fit=True`."
+            )
 
         # Retransform candidates and create a potential mapping to the samples
         # in `X`.
@@ -153,26 +184,46 @@ class DiscriminativeAL(SingleAnnotatorPoolQueryStrategy):
                 return_utilities=return_utilities,
             )
         else:
-            # Refit the binary classifier, i.e., the discriminator, after each
-            # selected sample in a batch.
+            # Update the binary classifier, i.e., the discriminator, after
+            # every `refit_interval` selected samples in a batch.
             X_discriminator = X
             query_indices_cand = []
             utilities_cand = np.empty((batch_size, len(X_cand)), dtype=float)
-            for i in range(batch_size):
-                # Determine unlabeled vs. labeled samples.
-                y_discriminator = is_unlabeled(
-                    y, missing_label=self.missing_label
-                )
-                y_discriminator = y_discriminator.astype(int)
-
-                # Mark already selected samples as labeled.
-                y_discriminator[mapping[query_indices_cand]] = 0
 
-                # Fit discriminator to classify unlabeled vs. labeled samples.
-                discriminator.fit(X_discriminator, y_discriminator)
-
-                # Compute utilities as probabilities of being unlabeled.
-                utilities_cand[i] = discriminator.predict_proba(X_cand)[:, 1]
+            # Determine unlabeled vs. labeled samples.
+            y_discriminator = is_unlabeled(y, missing_label=self.missing_label)
+            y_discriminator = y_discriminator.astype(int)
+            for i in range(batch_size):
+                if i % self.refit_interval == 0:
+                    # Samples selected since the last update.
+                    idx_new = query_indices_cand[
+                        max(0, i - self.refit_interval) :
+                    ]
+                    if i == 0 or not self.use_partial_fit:
+                        # Mark already selected samples as labeled and fit
+                        # the discriminator to classify unlabeled vs. labeled
+                        # samples.
+                        y_discriminator[mapping[idx_new]] = 0
+                        discriminator.fit(X_discriminator, y_discriminator)
+                    elif isinstance(discriminator, ParzenWindowClassifier):
+                        # Replace the labels of the newly selected samples.
+                        discriminator.partial_fit(
+                            X_cand[idx_new],
+                            np.zeros(len(idx_new), dtype=int),
+                            replace_idx=mapping[idx_new],
+                        )
+                    else:
+                        # Add the newly selected samples as labeled ones,
+                        # while their rows as unlabeled samples remain.
+                        discriminator.partial_fit(
+                            X_cand[idx_new], np.zeros(len(idx_new), dtype=int)
+                        )
+
+                    # Compute utilities as probabilities of being unlabeled.
+                    probas_unlabeled = discriminator.predict_proba(X_cand)[
+                        :, 1
+                    ]
+                utilities_cand[i] = probas_unlabeled
                 utilities_cand[i, query_indices_cand] = np.nan
                 query_indices_cand.append(
                     rand_argmax(utilities_cand[i], self.random_state_)[0]
@@ -3,11 +3,12 @@ Epistemic uncertainty query strategy
 """
 # Author: Pascal Mergard <Pascal.Mergard@student.uni-kassel.de>
 #         Marek Herde <marek.herde@uni-kassel.de>
+import os
 import warnings
 
 import numpy as np
-from scipy.interpolate import griddata
-from scipy.optimize import minimize_scalar, minimize, LinearConstraint
+from scipy.optimize import minimize, LinearConstraint
+from scipy.special import expit
 from sklearn import clone
 from sklearn.linear_model import LogisticRegression
 from sklearn.utils.extmath import safe_sparse_dot, log_logistic
@@ -36,6 +37,18 @@ class EpistemicUncertaintySampling(SingleAnnotatorPoolQueryStrategy):
     precompute : boolean, optional (default=False)
         Whether the epistemic uncertainty should be precomputed.
         Only for ParzenWindowClassifier significant.
+    precompute_cache_dir : str or None, optional (default=None)
+        Directory in which the precomputed epistemic uncertainty tables are
+        stored such that they can be loaded by other processes. Within a
+        process, the tables are memoized independently of this parameter.
+        Only for ParzenWindowClassifier and `precompute=True` significant.
+    logreg_solver : {'slsqp', 'newton'}, optional (default='slsqp')
+        Solver for the constrained likelihood problems of a wrapped
+        LogisticRegression. 'slsqp' solves every problem separately via
+        `scipy.optimize.minimize`, whereas 'newton' solves the problems of all
+        candidates together via a batched projected Newton method, which is
+        started from the maximum likelihood fit and its Hessian. Only for
+        LogisticRegression significant.
     missing_label : scalar or string or np.nan or None, optional
     (default=MISSING_LABEL)
         Value to represent a missing label.
@@ -50,12 +63,19 @@ class EpistemicUncertaintySampling(SingleAnnotatorPoolQueryStrategy):
     """
 
     def __init__(
-        self, precompute=False, missing_label=MISSING_LABEL, random_state=None
+        self,
+        precompute=False,
+        precompute_cache_dir=None,
+        logreg_solver="slsqp",
+        missing_label=MISSING_LABEL,
+        random_state=None,
     ):
         super().__init__(
             missing_label=missing_label, random_state=random_state
         )
         self.precompute = precompute
+        self.precompute_cache_dir = precompute_cache_dir
+        self.logreg_solver = logreg_solver
 
     def query(
         self,
@@ -143,7 +163,7 @@ class EpistemicUncertaintySampling(SingleAnnotatorPoolQueryStrategy):
 
         # Chose the correct method for the given classifier.
         if isinstance(clf, ParzenWindowClassifier):
-            if not hasattr(self, "precompute_array"):
+            if not hasattr(self, "_precompute_array"):
                 self._precompute_array = None
 
             # Create precompute_array if necessary.
@@ -154,15 +174,29 @@ class EpistemicUncertaintySampling(SingleAnnotatorPoolQueryStrategy):
                 )
             if self.precompute and self._precompute_array is None:
                 self._precompute_array = np.full((2, 2), np.nan)
+            if self.precompute_cache_dir is not None:
+                check_type(
+                    self.precompute_cache_dir,
+                    "precompute_cache_dir",
+                    str,
+                    os.PathLike,
+                )
 
             freq = clf.predict_freq(X_cand)
             (
                 utilities_cand,
                 self._precompute_array,
-            ) = _epistemic_uncertainty_pwc(freq, self._precompute_array)
+            ) = _epistemic_uncertainty_pwc(
+                freq, self._precompute_array, self.precompute_cache_dir
+            )
         elif isinstance(clf, SklearnClassifier) and isinstance(
             clf.estimator_, LogisticRegression
         ):
+            check_type(
+                self.logreg_solver,
+                "logreg_solver",
+                target_vals=["slsqp", "newton"],
+            )
             mask_labeled = is_labeled(y, self.missing_label_)
             if sample_weight is None:
                 sample_weight_masked = None
@@ -175,6 +209,7 @@ class EpistemicUncertaintySampling(SingleAnnotatorPoolQueryStrategy):
                 y=y[mask_labeled],
                 clf=clf,
                 sample_weight=sample_weight_masked,
+                solver=self.logreg_solver,
             )
         else:
             raise TypeError(
@@ -198,7 +233,7 @@ class EpistemicUncertaintySampling(SingleAnnotatorPoolQueryStrategy):
 
 
 # Epistemic uncertainty scores for pwc.
-def _epistemic_uncertainty_pwc(freq, precompute_array=None):
+def _epistemic_uncertainty_pwc(freq, precompute_array=None, cache_dir=None):
     """
     Computes the epistemic uncertainty score for a parzen window classifier
     [1]. Only for two class problems.
@@ -210,6 +245,9 @@ def _epistemic_uncertainty_pwc(freq, precompute_array=None):
     precompute_array : np.ndarray of a quadratic shape, default=None
         Used to interpolate and speed up the calculation. Will be enlarged if
         necessary. All entries that are 'np.nan' will be filled.
+    cache_dir : str or None, default=None
+        Directory in which the tables filling `precompute_array` are stored,
+        see `_pwc_precompute_table`.
 
     Returns
     -------
@@ -233,7 +271,6 @@ def _epistemic_uncertainty_pwc(freq, precompute_array=None):
         )
     n = freq[:, 0]
     p = freq[:, 1]
-    utilities = np.full((len(freq)), np.nan)
     if precompute_array is not None:
         # enlarges the precompute_array array if necessary:
         if precompute_array.shape[0] < np.max(n) + 1:
@@ -254,126 +291,158 @@ def _epistemic_uncertainty_pwc(freq, precompute_array=None):
             )
 
         # precompute the epistemic uncertainty:
-        for N in range(precompute_array.shape[0]):
-            for P in range(precompute_array.shape[1]):
-                if np.isnan(precompute_array[N, P]):
-                    pi1 = -minimize_scalar(
-                        _pwc_ml_1,
-                        method="Bounded",
-                        bounds=(0.0, 1.0),
-                        args=(N, P),
-                    ).fun
-
-                    pi0 = -minimize_scalar(
-                        _pwc_ml_0,
-                        method="Bounded",
-                        bounds=(0.0, 1.0),
-                        args=(N, P),
-                    ).fun
-
-                    pi = np.array([pi0, pi1])
-                    precompute_array[N, P] = np.min(pi, axis=0)
+        is_nan = np.isnan(precompute_array)
+        if is_nan.any():
+            table = _pwc_precompute_table(precompute_array.shape, cache_dir)
+            precompute_array[is_nan] = table[is_nan]
         utilities = _interpolate(precompute_array, freq)
     else:
-        for i, f in enumerate(freq):
-            pi1 = -minimize_scalar(
-                _pwc_ml_1,
-                method="Bounded",
-                bounds=(0.0, 1.0),
-                args=(f[0], f[1]),
-            ).fun
-
-            pi0 = -minimize_scalar(
-                _pwc_ml_0,
-                method="Bounded",
-                bounds=(0.0, 1.0),
-                args=(f[0], f[1]),
-            ).fun
-
-            pi = np.array([pi0, pi1])
-            utilities[i] = np.min(pi, axis=0)
+        utilities = np.minimum(
+            _pwc_epistemic_support(p, n), _pwc_epistemic_support(n, p)
+        )
     return utilities, precompute_array
 
 
-def _interpolate(precompute_array, freq):
+# Memoized tables of `_pwc_precompute_table` with their shapes as keys.
+_PWC_PRECOMPUTE_TABLES = {}
+
+
+def _pwc_precompute_table(shape, cache_dir=None):
     """
-    Linearly interpolation.
-    For further informations see scipy.interpolate.griddata.
+    Returns the epistemic uncertainty scores of all integer class frequency
+    estimates `(n, p)` with `n < shape[0]` and `p < shape[1]`. The table is
+    computed for the next larger power of two of each dimension and is
+    memoized per process. If `cache_dir` is given, it is additionally stored
+    in and loaded from this directory.
 
     Parameters
     ----------
-    precompute_array : np.ndarray of a quadratic shape
-        Data values. The length should be greater than int(np.max(freq) + 1).
-    freq : np.ndarray of shape (n_samples, 2)
-        Points at which to interpolate data.
+    shape : tuple of two ints
+        The shape of the requested table.
+    cache_dir : str or None, default=None
+        Directory in which computed tables are stored as `.npy` files.
 
     Returns
     -------
-        Array of interpolated values.
+    table : np.ndarray of shape `shape`
+        The epistemic uncertainty scores, where `table[n, p]` refers to the
+        frequency estimates `(n, p)`. The array is read-only.
     """
-    points = np.zeros(
-        (precompute_array.shape[0] * precompute_array.shape[1], 2)
-    )
-    for n in range(precompute_array.shape[0]):
-        for p in range(precompute_array.shape[1]):
-            points[n * precompute_array.shape[1] + p] = n, p
-    return griddata(points, precompute_array.flatten(), freq, method="linear")
+    key = tuple(int(2 ** np.ceil(np.log2(max(s, 2)))) for s in shape)
+    for table_shape, table in _PWC_PRECOMPUTE_TABLES.items():
+        if table_shape[0] >= key[0] and table_shape[1] >= key[1]:
+            return table[: shape[0], : shape[1]]
+
+    path = None
+    if cache_dir is not None:
+        check_type(cache_dir, "cache_dir", str, os.PathLike)
+        path = os.path.join(cache_dir, "epistemic_pwc_{}x{}.npy".format(*key))
+    if path is not None and os.path.exists(path):
+        table = np.load(path)
+    else:
+        n, p = np.meshgrid(
+            np.arange(key[0], dtype=float),
+            np.arange(key[1], dtype=float),
+            indexing="ij",
+        )
+        table = np.minimum(
+            _pwc_epistemic_support(p, n), _pwc_epistemic_support(n, p)
+        )
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.save(path, table)
+    table.flags.writeable = False
+    _PWC_PRECOMPUTE_TABLES[key] = table
+    return table[: shape[0], : shape[1]]
 
 
-def _pwc_ml_1(theta, n, p):
+def _pwc_epistemic_support(n, p):
     """
-    Calulates the maximum likelihood for class 1 of epistemic for pwc.
+    Computes the degree of support for class 1, i.e., the maximum of
+    `min(pi_h(theta), 2 * theta - 1)` over theta with the normalized
+    likelihood `pi_h`, for arrays of class frequency estimates. The degree of
+    support for class 0 is obtained by swapping `n` and `p`.
+
+    The normalized likelihood is maximal at `theta = p / (n + p)` and
+    decreasing for larger thetas, whereas `2 * theta - 1` is increasing.
+    Hence, the maximum is located at the intersection of both functions,
+    which is found via a vectorized bisection.
 
     Parameters
     ----------
-    theta : array-like
-        The parameter vector.
-    n : float
-        frequency estimate for the negative class.
-    p : float
-        frequency estimate for the positive class.
+    n : np.ndarray
+        Frequency estimates for the negative class.
+    p : np.ndarray
+        Frequency estimates for the positive class with the same shape as
+        `n`.
 
     Returns
     -------
-        float
-        The maximum likelihood for class 1 of epistemic for pwc.
+    pi : np.ndarray of the same shape as `n`
+        The degrees of support for class 1.
     """
-    if (n == 0.0) and (p == 0.0):
-        return -1.0
-    piH = ((theta**p) * ((1 - theta) ** n)) / (
-        ((p / (n + p)) ** p) * ((n / (n + p)) ** n)
+    n, p = np.broadcast_arrays(
+        np.asarray(n, dtype=float), np.asarray(p, dtype=float)
     )
-    return -np.minimum(piH, 2 * theta - 1)
+    total = n + p
+    is_empty = total == 0
+    total = np.where(is_empty, 1, total)
+
+    def log_pi_h(theta):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                p > 0, p * np.log(theta / (p / total)), 0
+            ) + np.where(n > 0, n * np.log((1 - theta) / (n / total)), 0)
+
+    lower = np.maximum(p / total, 0.5)
+    upper = np.ones_like(lower)
+    for _ in range(64):
+        theta = (lower + upper) / 2
+        is_lower = np.exp(log_pi_h(theta)) > 2 * theta - 1
+        lower = np.where(is_lower, theta, lower)
+        upper = np.where(is_lower, upper, theta)
+    pi = np.minimum(np.exp(log_pi_h(lower)), 2 * lower - 1)
+    return np.where(is_empty, 1.0, pi)
 
 
-def _pwc_ml_0(theta, n, p):
+def _interpolate(precompute_array, freq):
     """
-    Calulates the maximum likelihood for class 0 of epistemic for pwc.
+    Bilinear interpolation on the grid of integer frequency estimates.
+    Frequency estimates outside of the grid are clipped to its borders.
 
     Parameters
     ----------
-    theta : array-like
-        The parameter vector.
-    n : float
-        frequency estimate for the negative class.
-    p : float
-        frequency estimate for the positive class.
+    precompute_array : np.ndarray of a quadratic shape
+        Data values. The length should be greater than int(np.max(freq) + 1).
+    freq : np.ndarray of shape (n_samples, 2)
+        Points at which to interpolate data.
 
     Returns
     -------
-        float
-        The maximum likelihood for class 0 of epistemic for pwc.
+        Array of interpolated values.
     """
-    if (n == 0.0) and (p == 0.0):
-        return -1.0
-    piH = ((theta**p) * ((1 - theta) ** n)) / (
-        ((p / (n + p)) ** p) * ((n / (n + p)) ** n)
+    freq = np.asarray(freq, dtype=float)
+    indices, weights = [], []
+    for d in range(2):
+        size = precompute_array.shape[d]
+        coord = np.clip(freq[:, d], 0, size - 1)
+        idx = np.minimum(np.floor(coord).astype(int), max(size - 2, 0))
+        indices.append((idx, np.minimum(idx + 1, size - 1)))
+        weights.append(coord - idx)
+    (n0, n1), (p0, p1) = indices
+    w_n, w_p = weights
+    return (
+        (1 - w_n) * (1 - w_p) * precompute_array[n0, p0]
+        + w_n * (1 - w_p) * precompute_array[n1, p0]
+        + (1 - w_n) * w_p * precompute_array[n0, p1]
+        + w_n * w_p * precompute_array[n1, p1]
     )
-    return -np.minimum(piH, 1 - 2 * theta)
 
 
 # Epistemic uncertainty scores for logistic regression.
-def _epistemic_uncertainty_logreg(X_cand, X, y, clf, sample_weight=None):
+def _epistemic_uncertainty_logreg(
+    X_cand, X, y, clf, sample_weight=None, solver="slsqp"
+):
     """
     Calculates the epistemic uncertainty score for logistic regression [1].
     Only for two class problems.
@@ -391,6 +460,10 @@ def _epistemic_uncertainty_logreg(X_cand, X, y, clf, sample_weight=None):
     sample_weight : array-like of shape (n_samples,) (default=None)
         Sample weights for X, only used if clf is a logistic regression
         classifier.
+    solver : {'slsqp', 'newton'}, optional (default='slsqp')
+        If 'slsqp', the constrained likelihood problems are solved one after
+        another via `_theta`. If 'newton', the problems of all candidates are
+        solved together via `_theta_newton`.
 
     Returns
     -------
@@ -448,6 +521,19 @@ def _epistemic_uncertainty_logreg(X_cand, X, y, clf, sample_weight=None):
     pi1 = np.maximum(2 * probas[:, 0] - 1, 0)
     pi0 = np.maximum(1 - 2 * probas[:, 0], 0)
 
+    if solver == "newton":
+        pi0, pi1 = _epistemic_pi_newton(
+            X_cand=X_cand,
+            X=X,
+            y=y,
+            w_ml=w_ml,
+            pi0=pi0,
+            pi1=pi1,
+            sample_weight=sample_weight,
+            gamma=gamma,
+        )
+        return np.min(np.array([pi0, pi1]), axis=0)
+
     # Compute pi0, pi1 for every x in candidates.
     for i, x in enumerate(X_cand):
         Qn = np.linspace(0.01, 0.5, num=50, endpoint=True)
@@ -501,7 +587,7 @@ def _epistemic_uncertainty_logreg(X_cand, X, y, clf, sample_weight=None):
                             sample_weight=sample_weight,
                             gamma=gamma,
                         ),
-                        1 - 2 * alpha_p,
+                        1 - 2 * alpha_n,
                     ),
                 )
             Qn, Qp = np.delete(Qn, 0), np.delete(Qp, -1)
@@ -623,6 +709,331 @@ def _theta(func, alpha, x0, A, args=()):
     return res.x
 
 
+def _epistemic_pi_newton(
+    X_cand, X, y, w_ml, pi0, pi1, sample_weight=None, gamma=1
+):
+    """
+    Computes the degrees of support `pi0` and `pi1` of all candidates by
+    solving the constrained likelihood problems for all candidates and all
+    values of alpha together via `_theta_newton`.
+
+    Parameters
+    ----------
+    X_cand : np.ndarray of shape (n_candidates, n_features)
+        The unlabeled pool from which to choose.
+    X : np.ndarray of shape (n_samples, n_features)
+        The labeled pool used to fit the classifier.
+    y : np.ndarray of shape (n_samples,)
+        The labels of the labeled pool X.
+    w_ml : np.ndarray of shape (n_features + 1,)
+        The coefficient vector of the maximum likelihood fit.
+    pi0 : np.ndarray of shape (n_candidates,)
+        The initial degrees of support for class 0.
+    pi1 : np.ndarray of shape (n_candidates,)
+        The initial degrees of support for class 1.
+    sample_weight : np.ndarray of shape (n_samples,) (default=None)
+        Sample weights for X.
+    gamma : float
+        The regularization parameter.
+
+    Returns
+    -------
+    pi0 : np.ndarray of shape (n_candidates,)
+        The degrees of support for class 0.
+    pi1 : np.ndarray of shape (n_candidates,)
+        The degrees of support for class 1.
+    """
+    pi0, pi1 = pi0.copy(), pi1.copy()
+    alphas_n = np.linspace(0.01, 0.5, num=50, endpoint=True)
+    alphas_p = np.linspace(0.5, 1.0, num=50, endpoint=False)
+
+    # Only problems whose upper bound exceeds the initial degree of support
+    # can increase it, all other problems are skipped.
+    cand_n, idx_n = np.nonzero(1 - 2 * alphas_n[None, :] > pi0[:, None])
+    cand_p, idx_p = np.nonzero(2 * alphas_p[None, :] - 1 > pi1[:, None])
+    cand_idx = np.concatenate([cand_n, cand_p])
+    alphas = np.concatenate([alphas_n[idx_n], alphas_p[idx_p]])
+    is_p = np.concatenate(
+        [np.zeros(len(cand_n), dtype=bool), np.ones(len(cand_p), dtype=bool)]
+    )
+    if len(cand_idx) == 0:
+        return pi0, pi1
+
+    A = np.column_stack([X_cand, np.ones(len(X_cand))])
+    loglike_ml = _loglike_logreg(
+        w=w_ml, X=X, y=y, sample_weight=sample_weight, gamma=gamma
+    )
+    hessian_ml = _hessian_logreg(
+        W=w_ml[None, :], X=X, y=y, sample_weight=sample_weight, gamma=gamma
+    )[0]
+
+    # Bound the memory of the batched problems by solving them in chunks.
+    n_dims = A.shape[1]
+    chunk_size = max(1, 2**20 // (len(X) + n_dims**2 + 1))
+    for start in range(0, len(cand_idx), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        thetas = _theta_newton(
+            A=A[cand_idx[chunk]],
+            bounds=np.log(alphas[chunk] / (1 - alphas[chunk])),
+            w0=w_ml,
+            X=X,
+            y=y,
+            sample_weight=sample_weight,
+            gamma=gamma,
+            hessian=hessian_ml,
+        )
+        pi_h = np.exp(
+            loglike_ml
+            - _loglike_logreg_batch(
+                W=thetas, X=X, y=y, sample_weight=sample_weight, gamma=gamma
+            )
+        )
+        bound = np.where(
+            is_p[chunk], 2 * alphas[chunk] - 1, 1 - 2 * alphas[chunk]
+        )
+        support = np.minimum(pi_h, bound)
+        np.maximum.at(pi1, cand_idx[chunk][is_p[chunk]], support[is_p[chunk]])
+        np.maximum.at(
+            pi0, cand_idx[chunk][~is_p[chunk]], support[~is_p[chunk]]
+        )
+    return pi0, pi1
+
+
+def _theta_newton(
+    A,
+    bounds,
+    w0,
+    X,
+    y,
+    sample_weight=None,
+    gamma=1,
+    hessian=None,
+    max_iter=50,
+    tol=1e-10,
+):
+    """
+    Calculates the parameter vectors as it is shown in equation 22 in [1] for
+    a batch of linear equality constraints `A[i] @ theta = bounds[i]` at once.
+    The first step is a Newton step from `w0` using the given Hessian, which
+    makes all parameter vectors feasible. The following projected Newton
+    steps with backtracking line search keep them feasible.
+
+    Parameters
+    ----------
+    A : np.ndarray of shape (n_problems, n_features + 1)
+        Vectors defining the constraints.
+    bounds : np.ndarray of shape (n_problems,)
+        The right-hand sides of the constraints.
+    w0 : np.ndarray of shape (n_features + 1,)
+        Initial guess, e.g., the maximum likelihood fit.
+    X : np.ndarray of shape (n_samples, n_features)
+        The labeled pool used to fit the classifier.
+    y : np.ndarray of shape (n_samples,)
+        The labels of the labeled pool X.
+    sample_weight : np.ndarray of shape (n_samples,) (default=None)
+        Sample weights for X.
+    gamma : float
+        The regularization parameter.
+    hessian : np.ndarray of shape (n_features + 1, n_features + 1)
+        (default=None)
+        Hessian of `_loglike_logreg` at `w0`. It is computed if None.
+    max_iter : int, optional (default=50)
+        Maximum number of projected Newton steps.
+    tol : float, optional (default=1e-10)
+        The iteration of a problem stops once its Newton decrement is below
+        this value.
+
+    Returns
+    -------
+    thetas : np.ndarray of shape (n_problems, n_features + 1)
+        The optimized parameter vectors.
+
+    References
+    ---------
+    [1] Nguyen, Vu-Linh, Sébastien Destercke, and Eyke Hüllermeier.
+        "Epistemic uncertainty sampling." International Conference on
+        Discovery Science. Springer, Cham, 2019.
+    """
+    args = dict(X=X, y=y, sample_weight=sample_weight, gamma=gamma)
+    if hessian is None:
+        hessian = _hessian_logreg(W=w0[None, :], **args)[0]
+    thetas = np.tile(w0, (len(A), 1)).astype(float)
+    grads = _gradient_logreg(W=thetas, **args)
+    residuals = bounds - A @ w0
+    thetas += _kkt_step(hessian[None], grads, A, residuals)
+
+    active = np.arange(len(A))
+    for _ in range(max_iter):
+        W = thetas[active]
+        A_active = A[active]
+        grads = _gradient_logreg(W=W, **args)
+        steps = _kkt_step(
+            _hessian_logreg(W=W, **args),
+            grads,
+            A_active,
+            np.zeros(len(active)),
+        )
+        decrement = -np.sum(grads * steps, axis=1)
+        is_active = decrement > tol
+        active, W = active[is_active], W[is_active]
+        if len(active) == 0:
+            break
+        steps, decrement = steps[is_active], decrement[is_active]
+
+        # Backtracking line search with the Armijo condition.
+        loglike = _loglike_logreg_batch(W=W, **args)
+        step_sizes = np.ones(len(active))
+        searching = np.ones(len(active), dtype=bool)
+        for _ in range(30):
+            W_new = (
+                W[searching] + step_sizes[searching, None] * steps[searching]
+            )
+            loglike_new = _loglike_logreg_batch(W=W_new, **args)
+            accepted = loglike_new <= loglike[searching] - (
+                1e-4 * step_sizes[searching] * decrement[searching]
+            )
+            searching[np.flatnonzero(searching)[accepted]] = False
+            if not searching.any():
+                break
+            step_sizes[searching] /= 2
+        thetas[active] = W + step_sizes[:, None] * steps
+    return thetas
+
+
+def _kkt_step(hessians, grads, A, residuals):
+    """
+    Solves the KKT systems of the equality constrained Newton steps.
+
+    Parameters
+    ----------
+    hessians : np.ndarray of shape (n_problems, n_dims, n_dims) or
+        (1, n_dims, n_dims)
+        The Hessians of the objective.
+    grads : np.ndarray of shape (n_problems, n_dims)
+        The gradients of the objective.
+    A : np.ndarray of shape (n_problems, n_dims)
+        Vectors defining the constraints.
+    residuals : np.ndarray of shape (n_problems,)
+        Violations `bounds - A @ theta` of the constraints.
+
+    Returns
+    -------
+    steps : np.ndarray of shape (n_problems, n_dims)
+        The Newton steps.
+    """
+    n_problems, n_dims = A.shape
+    kkt = np.zeros((n_problems, n_dims + 1, n_dims + 1))
+    kkt[:, :n_dims, :n_dims] = hessians
+    kkt[:, :n_dims, n_dims] = A
+    kkt[:, n_dims, :n_dims] = A
+    rhs = np.column_stack([-grads, residuals])
+    try:
+        solution = np.linalg.solve(kkt, rhs[:, :, None])[:, :, 0]
+    except np.linalg.LinAlgError:
+        solution = np.einsum("bij,bj->bi", np.linalg.pinv(kkt), rhs)
+    return solution[:, :n_dims]
+
+
+def _loglike_logreg_batch(W, X, y, sample_weight=None, gamma=1):
+    """Computes `_loglike_logreg` for a batch of coefficient vectors.
+
+    Parameters
+    ----------
+    W : np.ndarray of shape (n_problems, n_features + 1)
+        Coefficient vectors.
+    X : np.ndarray of shape (n_samples, n_features)
+        Training data.
+    y : np.ndarray of shape (n_samples,)
+        The labels of the training data X.
+    sample_weight : array-like of shape (n_samples,) default=None
+        Array of weights that are assigned to individual samples.
+        If not provided, then each sample is given unit weight.
+    gamma : float
+        Regularization parameter. gamma is equal to 1 / C.
+
+    Returns
+    -------
+    out : np.ndarray of shape (n_problems,)
+        Logistic losses of the coefficient vectors.
+    """
+    if len(y) == 0:
+        return np.full(len(W), np.log(2) * len(X))
+    if sample_weight is None:
+        sample_weight = np.ones(len(y))
+    yz = y * (W[:, :-1] @ np.asarray(X).T + W[:, -1:])
+    out = -np.sum(sample_weight * log_logistic(yz), axis=1)
+    out += 0.5 * gamma * np.sum(W[:, :-1] ** 2, axis=1)
+    return out
+
+
+def _gradient_logreg(W, X, y, sample_weight=None, gamma=1):
+    """Computes the gradients of `_loglike_logreg` for a batch of coefficient
+    vectors.
+
+    Parameters
+    ----------
+    W : np.ndarray of shape (n_problems, n_features + 1)
+        Coefficient vectors.
+    X : np.ndarray of shape (n_samples, n_features)
+        Training data.
+    y : np.ndarray of shape (n_samples,)
+        The labels of the training data X.
+    sample_weight : array-like of shape (n_samples,) default=None
+        Array of weights that are assigned to individual samples.
+    gamma : float
+        Regularization parameter. gamma is equal to 1 / C.
+
+    Returns
+    -------
+    grads : np.ndarray of shape (n_problems, n_features + 1)
+        The gradients.
+    """
+    X = np.asarray(X).reshape(len(X), W.shape[1] - 1)
+    if sample_weight is None:
+        sample_weight = np.ones(len(y))
+    yz = y * (W[:, :-1] @ X.T + W[:, -1:])
+    dz = -sample_weight * y * expit(-yz)
+    grads = np.column_stack([dz @ X, dz.sum(axis=1)])
+    grads[:, :-1] += gamma * W[:, :-1]
+    return grads
+
+
+def _hessian_logreg(W, X, y, sample_weight=None, gamma=1):
+    """Computes the Hessians of `_loglike_logreg` for a batch of coefficient
+    vectors.
+
+    Parameters
+    ----------
+    W : np.ndarray of shape (n_problems, n_features + 1)
+        Coefficient vectors.
+    X : np.ndarray of shape (n_samples, n_features)
+        Training data.
+    y : np.ndarray of shape (n_samples,)
+        The labels of the training data X.
+    sample_weight : array-like of shape (n_samples,) default=None
+        Array of weights that are assigned to individual samples.
+    gamma : float
+        Regularization parameter. gamma is equal to 1 / C.
+
+    Returns
+    -------
+    hessians : np.ndarray of shape (n_problems, n_features + 1,
+        n_features + 1)
+        The Hessians.
+    """
+    X = np.asarray(X).reshape(len(X), W.shape[1] - 1)
+    if sample_weight is None:
+        sample_weight = np.ones(len(y))
+    X_ext = np.column_stack([X, np.ones(len(X))])
+    p = expit(y * (W[:, :-1] @ X.T + W[:, -1:]))
+    d = sample_weight * y**2 * p * (1 - p)
+    hessians = np.einsum("bn,ni,nj->bij", d, X_ext, X_ext)
+    reg = np.full(W.shape[1], gamma, dtype=float)
+    reg[-1] = 0
+    hessians += np.diag(reg)
+    return hessians
+
+
 def _logistic_loss(w, X, y, alpha, sample_weight=None):
     """Computes the logistic loss. This function is a copy taken from
     https://github.com/scikit-learn/scikit-learn/blob/1.0.X/sklearn/
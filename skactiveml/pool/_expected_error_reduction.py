@@ -1,10 +1,13 @@
+import os
 from copy import deepcopy
 
 import numpy as np
+from sklearn.utils import gen_batches, get_chunk_n_rows
 
 from .utils import IndexClassifierWrapper
 from ..base import SingleAnnotatorPoolQueryStrategy, SkactivemlClassifier
 from ..utils import (
+    check_scalar,
     check_type,
     is_labeled,
     simple_batch,
@@ -46,6 +49,27 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
         Cost matrix with `cost_matrix[i,j]` defining the cost of predicting
         class `j` for a sample with the actual class `i`.
         Used for misclassification loss and ignored for log loss.
+    batch_simulation : bool, optional (default=True)
+        If True, all candidate-label pairs are simulated at once, which is
+        particularly efficient for the `ParzenWindowClassifier` whose
+        frequency estimates are updated with the precomputed kernel. The
+        number of simultaneously simulated candidates is limited by
+        sklearn's `working_memory`. If False, each pair is simulated
+        separately via `_estimate_error_for_candidate`.
+    kernel_tile_size : int, optional (default=1024)
+        Only relevant for the `ParzenWindowClassifier`, whose kernel matrix is
+        stored in square tiles of `kernel_tile_size` rows and columns that are
+        computed when needed.
+    kernel_max_memory : int or float or None, optional (default=1024)
+        Only relevant for the `ParzenWindowClassifier`. Maximum memory in MiB
+        used for storing kernel tiles, where the least recently used tiles
+        are evicted if it is exceeded. If None, the memory is not limited.
+    kernel_cache_dir : str or os.PathLike or None, optional (default=None)
+        Only relevant for the `ParzenWindowClassifier`. Directory in which
+        computed kernel tiles are stored as memory-mapped files, which are
+        reused by subsequent queries with equal samples and kernel, e.g., in
+        the next active learning cycles. If None, the tiles are only kept in
+        memory during a query.
     missing_label : scalar or string or np.nan or None, default=np.nan
         Value to represent a missing label.
     random_state : int or np.random.RandomState
@@ -69,6 +93,10 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
         self,
         enforce_mapping,
         cost_matrix=None,
+        batch_simulation=True,
+        kernel_tile_size=1024,
+        kernel_max_memory=1024,
+        kernel_cache_dir=None,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -77,6 +105,10 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
         )
         self.cost_matrix = cost_matrix
         self.enforce_mapping = enforce_mapping
+        self.batch_simulation = batch_simulation
+        self.kernel_tile_size = kernel_tile_size
+        self.kernel_max_memory = kernel_max_memory
+        self.kernel_cache_dir = kernel_cache_dir
 
     def query(
         self,
@@ -224,6 +256,9 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
             ignore_partial_fit=ignore_partial_fit,
             enforce_unique_samples=True,
             use_speed_up=True,
+            kernel_tile_size=self.kernel_tile_size,
+            kernel_max_memory=self.kernel_max_memory,
+            kernel_cache_dir=self.kernel_cache_dir,
             missing_label=self.missing_label_,
         )
 
@@ -249,22 +284,44 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
             id_clf, idx_train, idx_cand, idx_eval, w_eval
         )
 
-        # Storage for computed errors per candidate sample
-        errors = np.zeros([len(idx_cand), len(classes)])
-
-        # Iterate over candidate samples
-        for i_cx, idx_cx in enumerate(idx_cand):
-            # Simulate acquisition of label for each candidate sample and class
-            for i_cy, cy in enumerate(classes):
-                errors[i_cx, i_cy] = self._estimate_error_for_candidate(
+        # Simulate acquisition of label for each candidate sample and class
+        if self.batch_simulation:
+            errors = np.zeros([len(idx_cand), len(classes)])
+            n_batch = get_chunk_n_rows(
+                row_bytes=8 * len(classes) ** 2 * len(idx_eval) * 3,
+                max_n_rows=len(idx_cand),
+            )
+            for batch in gen_batches(len(idx_cand), n_batch):
+                probs_sim = id_clf.predict_proba_simulated(
+                    idx_cand[batch], classes, idx_eval
+                )
+                errors[batch] = self._estimate_errors_for_candidates(
                     id_clf,
-                    [idx_cx],
-                    [cy],
+                    probs_sim,
+                    idx_cand[batch],
+                    classes,
                     idx_train,
                     idx_cand,
                     idx_eval,
                     w_eval,
                 )
+        else:
+            # Storage for computed errors per candidate sample
+            errors = np.zeros([len(idx_cand), len(classes)])
+
+            # Iterate over candidate samples
+            for i_cx, idx_cx in enumerate(idx_cand):
+                # Simulate acquisition of label for each candidate and class
+                for i_cy, cy in enumerate(classes):
+                    errors[i_cx, i_cy] = self._estimate_error_for_candidate(
+                        id_clf,
+                        [idx_cx],
+                        [cy],
+                        idx_train,
+                        idx_cand,
+                        idx_eval,
+                        w_eval,
+                    )
 
         # utils are maximized, errors minimized: hence multiply by (-1)
         future_error = np.sum(probs_cand * errors, axis=1)
@@ -338,7 +395,23 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
         """Function used to evaluate parameters of the `__init__` function that
         are not part of the abstract class to avoid redundancies.
         """
-        pass
+        check_type(self.batch_simulation, "batch_simulation", bool)
+        check_scalar(self.kernel_tile_size, "kernel_tile_size", int, min_val=1)
+        if self.kernel_max_memory is not None:
+            check_scalar(
+                self.kernel_max_memory,
+                "kernel_max_memory",
+                (int, float),
+                min_val=0,
+                min_inclusive=False,
+            )
+        check_type(
+            self.kernel_cache_dir,
+            "kernel_cache_dir",
+            str,
+            os.PathLike,
+            target_vals=[None],
+        )
 
     def _precompute_and_fit_clf(
         self,
@@ -370,6 +443,28 @@ class ExpectedErrorReduction(SingleAnnotatorPoolQueryStrategy):
             "by the query strategy."
         )
 
+    def _estimate_errors_for_candidates(
+        self,
+        id_clf,
+        probs_sim,
+        idx_cx,
+        classes,
+        idx_train,
+        idx_cand,
+        idx_eval,
+        w_eval,
+    ):
+        """
+        `probs_sim` has shape (len(idx_cx), len(classes), len(idx_eval),
+        len(classes)) and contains the probabilities of the evaluation samples
+        after simulating each candidate-label pair. Result must be of shape
+        (len(idx_cx), len(classes)).
+        """
+        raise NotImplementedError(
+            "Batched error estimation method must be implemented"
+            "by the query strategy."
+        )
+
     def _validate_cost_matrix(self, n_classes):
         cost_matrix = (
             1 - np.eye(n_classes)
@@ -530,6 +625,24 @@ class MonteCarloEER(ExpectedErrorReduction):
     subtract_current : bool, optional (default=False)
         If True, the current error estimate is subtracted from the simulated
         score. This might be helpful to define a stopping criterion.
+    batch_simulation : bool, optional (default=True)
+        If True, all candidate-label pairs are simulated at once, which is
+        particularly efficient for the `ParzenWindowClassifier`. If False,
+        each pair is simulated separately.
+    kernel_tile_size : int, optional (default=1024)
+        Only relevant for the `ParzenWindowClassifier`, whose kernel matrix is
+        stored in square tiles of `kernel_tile_size` rows and columns that are
+        computed when needed.
+    kernel_max_memory : int or float or None, optional (default=1024)
+        Only relevant for the `ParzenWindowClassifier`. Maximum memory in MiB
+        used for storing kernel tiles, where the least recently used tiles
+        are evicted if it is exceeded. If None, the memory is not limited.
+    kernel_cache_dir : str or os.PathLike or None, optional (default=None)
+        Only relevant for the `ParzenWindowClassifier`. Directory in which
+        computed kernel tiles are stored as memory-mapped files, which are
+        reused by subsequent queries with equal samples and kernel, e.g., in
+        the next active learning cycles. If None, the tiles are only kept in
+        memory during a query.
     missing_label : scalar or string or np.nan or None, default=np.nan
         Value to represent a missing label.
     random_state : int or np.random.RandomState
@@ -545,12 +658,20 @@ class MonteCarloEER(ExpectedErrorReduction):
         method="misclassification_loss",
         cost_matrix=None,
         subtract_current=False,
+        batch_simulation=True,
+        kernel_tile_size=1024,
+        kernel_max_memory=1024,
+        kernel_cache_dir=None,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
         super().__init__(
             enforce_mapping=False,
             cost_matrix=cost_matrix,
+            batch_simulation=batch_simulation,
+            kernel_tile_size=kernel_tile_size,
+            kernel_max_memory=kernel_max_memory,
+            kernel_cache_dir=kernel_cache_dir,
             missing_label=missing_label,
             random_state=random_state,
         )
@@ -611,6 +732,29 @@ class MonteCarloEER(ExpectedErrorReduction):
             err = self._logloss_estimation(probs, probs)
         return err
 
+    def _estimate_errors_for_candidates(
+        self,
+        id_clf,
+        probs_sim,
+        idx_cx,
+        classes,
+        idx_train,
+        idx_cand,
+        idx_eval,
+        w_eval,
+    ):
+        if self.method == "misclassification_loss":
+            # The predicted class minimizes the expected costs such that the
+            # risk of each sample is its minimal expected cost.
+            costs = np.min(probs_sim @ self.cost_matrix_, axis=-1)
+            err = np.sum(costs * w_eval[idx_eval], axis=-1)
+        elif self.method == "log_loss":
+            err = -np.sum(
+                probs_sim * np.log(probs_sim + np.finfo(float).eps),
+                axis=(-2, -1),
+            )
+        return err
+
     def _precompute_and_fit_clf(
         self, id_clf, X_full, y_full, idx_train, idx_cand, idx_eval, fit_clf
     ):
@@ -662,6 +806,24 @@ class ValueOfInformationEER(ExpectedErrorReduction):
         samples such that the errors represent the average error instead of the
         summed error. This will be done independently for the simulated and the
         current error.
+    batch_simulation : bool, optional (default=True)
+        If True, all candidate-label pairs are simulated at once, which is
+        particularly efficient for the `ParzenWindowClassifier`. If False,
+        each pair is simulated separately.
+    kernel_tile_size : int, optional (default=1024)
+        Only relevant for the `ParzenWindowClassifier`, whose kernel matrix is
+        stored in square tiles of `kernel_tile_size` rows and columns that are
+        computed when needed.
+    kernel_max_memory : int or float or None, optional (default=1024)
+        Only relevant for the `ParzenWindowClassifier`. Maximum memory in MiB
+        used for storing kernel tiles, where the least recently used tiles
+        are evicted if it is exceeded. If None, the memory is not limited.
+    kernel_cache_dir : str or os.PathLike or None, optional (default=None)
+        Only relevant for the `ParzenWindowClassifier`. Directory in which
+        computed kernel tiles are stored as memory-mapped files, which are
+        reused by subsequent queries with equal samples and kernel, e.g., in
+        the next active learning cycles. If None, the tiles are only kept in
+        memory during a query.
     missing_label : scalar or string or np.nan or None, default=np.nan
         Value to represent a missing label.
     random_state : int or np.random.RandomState
@@ -687,12 +849,20 @@ class ValueOfInformationEER(ExpectedErrorReduction):
         candidate_to_labeled=True,
         subtract_current=False,
         normalize=False,
+        batch_simulation=True,
+        kernel_tile_size=1024,
+        kernel_max_memory=1024,
+        kernel_cache_dir=None,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
         super().__init__(
             enforce_mapping=True,
             cost_matrix=cost_matrix,
+            batch_simulation=batch_simulation,
+            kernel_tile_size=kernel_tile_size,
+            kernel_max_memory=kernel_max_memory,
+            kernel_cache_dir=kernel_cache_dir,
             missing_label=missing_label,
             random_state=random_state,
         )
@@ -847,6 +1017,75 @@ class ValueOfInformationEER(ExpectedErrorReduction):
         else:
             return err
 
+    def _estimate_errors_for_candidates(
+        self,
+        id_clf,
+        probs_sim,
+        idx_cx,
+        classes,
+        idx_train,
+        idx_cand,
+        idx_eval,
+        w_eval,
+    ):
+        y_eval = id_clf.y[idx_eval]
+        is_lbld = is_labeled(y_eval, missing_label=self.missing_label_)
+        idx_labeled = idx_eval[is_lbld]
+        idx_unlabeled = idx_eval[~is_lbld]
+        y_labeled_c_id = id_clf._le.transform(y_eval[is_lbld])
+
+        # Position of each candidate within the evaluation samples.
+        pos_eval = np.full(len(id_clf.y), -1)
+        pos_eval[idx_eval] = np.arange(len(idx_eval))
+        pos_cx = pos_eval[idx_cx]
+        cx_range = np.arange(len(idx_cx))
+
+        err = np.zeros((len(idx_cx), len(classes)))
+        n_labeled = np.full(len(idx_cx), len(idx_labeled))
+        n_unlabeled = np.full(len(idx_cx), len(idx_unlabeled))
+
+        if self.consider_labeled:
+            probs = probs_sim[:, :, is_lbld, :]
+            costs = self.cost_matrix_[y_labeled_c_id, :]
+            err += np.sum(
+                probs * (w_eval[idx_labeled, np.newaxis] * costs),
+                axis=(-2, -1),
+            )
+
+        if self.consider_unlabeled:
+            risks = np.sum(
+                (probs_sim @ self.cost_matrix_) * probs_sim, axis=-1
+            )
+            err += np.sum(
+                risks[:, :, ~is_lbld] * w_eval[idx_unlabeled], axis=-1
+            )
+
+        if self.candidate_to_labeled:
+            n_labeled += 1
+            probs_cx = probs_sim[cx_range, :, pos_cx, :]
+            if self.consider_labeled:
+                costs = np.sum(probs_cx * self.cost_matrix_, axis=-1)
+                err += w_eval[idx_cx, np.newaxis] * costs
+            is_cx_unlbld = np.isin(idx_cx, idx_unlabeled)
+            n_unlabeled -= is_cx_unlbld
+            if self.consider_unlabeled:
+                risks_cx = risks[cx_range, :, pos_cx]
+                err -= (is_cx_unlbld * w_eval[idx_cx])[
+                    :, np.newaxis
+                ] * risks_cx
+
+        norm = np.zeros(len(idx_cx))
+        if self.consider_labeled:
+            norm += n_labeled
+        if self.consider_unlabeled:
+            norm += n_unlabeled
+
+        if self.normalize:
+            is_pos = norm > 0
+            err[is_pos] /= norm[is_pos, np.newaxis]
+            err[~is_pos] = 0.0
+        return err
+
     def _estimate_current_error(
         self, id_clf, idx_train, idx_cand, idx_eval, w_eval
     ):
@@ -1,6 +1,7 @@
 import math
 
 import numpy as np
+from joblib import Parallel, delayed
 from sklearn import clone
 
 from skactiveml.base import (
@@ -15,8 +16,10 @@ from skactiveml.utils import (
     MISSING_LABEL,
     check_X_y,
     check_random_state,
+    is_labeled,
     _check_callable,
 )
+from ._query_by_committee import _MemberHasher, _predict_committee
 
 
 class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
@@ -41,6 +44,22 @@ class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
         output a np.array of dimension 2. The default value is the identity
         function. An example feature map is
         `sklearn.preprocessing.PolynomialFeatures().fit_transform`.
+    n_jobs : int or None, optional (default=None)
+        The number of jobs to fit the bootstrap estimators and to compute
+        their predictions in parallel. The bootstraps are drawn before, so
+        that the results do not depend on `n_jobs`. None means 1 and -1 means
+        using all processors. The backend can be chosen via
+        `joblib.parallel_backend`.
+    warm_start : bool, optional (default=False)
+        If True, the bootstrap estimators are kept between queries. If the
+        labeled samples of a query contain those of the previous query and
+        the regressor's parameters did not change, each bootstrap estimator
+        is only updated with the newly labeled samples. Each of them is added
+        to a bootstrap a Poisson distributed number of times, whose mean is
+        the bootstrap size relative to the number of samples (online bagging
+        [2]). Estimators implementing `partial_fit` are updated
+        incrementally, others are refitted on their extended bootstrap.
+        Otherwise, new bootstraps are drawn.
     missing_label : scalar or string or np.nan or None,
     (default=skactiveml.utils.MISSING_LABEL)
         Value to represent a missing label.
@@ -52,6 +71,9 @@ class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
     [1] Cai, Wenbin, Ya Zhang, and Jun Zhou. Maximizing expected model change
     for active learning in regression, 2013 IEEE 13th international conference
     on data mining pages 51--60, 2013.
+    [2] Oza, Nikunj C., and Stuart J. Russell. Online bagging and boosting.
+    International Workshop on Artificial Intelligence and Statistics, pages
+    229--236, 2001.
 
     """
 
@@ -61,6 +83,8 @@ class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
         n_train=0.5,
         ord=2,
         feature_map=None,
+        n_jobs=None,
+        warm_start=False,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -71,6 +95,8 @@ class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
         self.n_train = n_train
         self.ord = ord
         self.feature_map = feature_map
+        self.n_jobs = n_jobs
+        self.warm_start = warm_start
 
     def query(
         self,
@@ -147,24 +173,32 @@ class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
         if self.feature_map is None:
             self.feature_map = lambda x: x
         _check_callable(self.feature_map, "self.feature_map")
+        check_type(self.n_jobs, "n_jobs", int, target_vals=[None])
+        if self.n_jobs == 0:
+            raise ValueError("`n_jobs` must not be 0.")
+        check_type(self.warm_start, "warm_start", bool)
 
         if fit_reg:
             reg = clone(reg).fit(X, y, sample_weight)
 
         X_cand, mapping = self._transform_candidates(candidates, X, y)
 
-        learners = _bootstrap_estimators(
-            reg,
-            X,
-            y,
-            bootstrap_size=self.bootstrap_size,
-            n_train=self.n_train,
-            sample_weight=sample_weight,
-            random_state=self.random_state_,
-        )
+        if self.warm_start:
+            learners = self._update_bootstrap(reg, X, y, sample_weight)
+        else:
+            learners = _bootstrap_estimators(
+                reg,
+                X,
+                y,
+                bootstrap_size=self.bootstrap_size,
+                n_train=self.n_train,
+                sample_weight=sample_weight,
+                random_state=self.random_state_,
+                n_jobs=self.n_jobs,
+            )
 
-        results_learner = np.array(
-            [learner.predict(X_cand) for learner in learners]
+        results_learner = _predict_committee(
+            learners, X_cand, "predict", self.n_jobs
         )
         pred = reg.predict(X_cand).reshape(1, -1)
         scalars = np.average(np.abs(results_learner - pred), axis=0)
@@ -185,6 +219,118 @@ class ExpectedModelChangeMaximization(SingleAnnotatorPoolQueryStrategy):
             return_utilities=return_utilities,
         )
 
+    def _update_bootstrap(self, reg, X, y, sample_weight):
+        # Identify the labeled samples by their features, labels, and weights.
+        is_lbld = is_labeled(y, missing_label=self.missing_label_)
+        weights = np.ones(len(X)) if sample_weight is None else sample_weight
+        lbld_indices = np.flatnonzero(is_lbld)
+        keys = [
+            X[i].tobytes() + np.array([y[i], weights[i]]).tobytes()
+            for i in lbld_indices
+        ]
+        settings = (
+            _MemberHasher().hash(clone(reg)),
+            self.bootstrap_size,
+            self.n_train,
+            sample_weight is None,
+        )
+        state = getattr(self, "_bootstrap", None)
+        if (
+            state is None
+            or state["settings"] != settings
+            or not state["keys"].issubset(keys)
+        ):
+            learners, subsets = _bootstrap_estimators(
+                reg,
+                X,
+                y,
+                bootstrap_size=self.bootstrap_size,
+                n_train=self.n_train,
+                sample_weight=sample_weight,
+                random_state=self.random_state_,
+                n_jobs=self.n_jobs,
+                return_subsets=True,
+            )
+            # Only the labeled samples of a bootstrap need to be kept.
+            subsets = [subset[is_lbld[subset]] for subset in subsets]
+            training_sets = [
+                (X[subset], y[subset], weights[subset]) for subset in subsets
+            ]
+        else:
+            learners = state["learners"]
+            training_sets = state["training_sets"]
+            is_new = [key not in state["keys"] for key in keys]
+            new_indices = lbld_indices[np.array(is_new, dtype=bool)]
+            rate = _bootstrap_size(self.n_train, len(X)) / len(X)
+            updated, fit_args = [], []
+            for b, learner in enumerate(learners):
+                counts = self.random_state_.poisson(rate, len(new_indices))
+                add = np.repeat(new_indices, counts)
+                if len(add) == 0:
+                    continue
+                X_b, y_b, w_b = training_sets[b]
+                training_sets[b] = (
+                    np.concatenate([X_b, X[add]]),
+                    np.concatenate([y_b, y[add]]),
+                    np.concatenate([w_b, weights[add]]),
+                )
+                updated.append(b)
+                if hasattr(learner, "partial_fit"):
+                    fit_args.append(
+                        (learner, "partial_fit", X[add], y[add], weights[add])
+                    )
+                else:
+                    fit_args.append((clone(reg), "fit", *training_sets[b]))
+            fitted = _fit_estimators(
+                fit_args,
+                use_sample_weight=sample_weight is not None,
+                n_jobs=self.n_jobs,
+            )
+            learners = list(learners)
+            for b, learner in zip(updated, fitted):
+                learners[b] = learner
+
+        self._bootstrap = {
+            "settings": settings,
+            "keys": set(keys),
+            "learners": learners,
+            "training_sets": training_sets,
+        }
+        return learners
+
+
+def _bootstrap_size(n_train, n_samples):
+    check_type(n_train, "n_train", int, float)
+    if isinstance(n_train, int) and n_train < 1:
+        raise ValueError(
+            f"`n_train` has value `{type(n_train)}`, but must have a value "
+            f"greater or equal to one, if of type `int`."
+        )
+    elif isinstance(n_train, float) and (n_train <= 0 or n_train > 1):
+        raise ValueError(
+            f"`n_train` has value `{type(n_train)}`, but must have a value "
+            f"between zero and one, excluding zero, if of type `float`."
+        )
+    if isinstance(n_train, float):
+        n_train = math.ceil(n_train * n_samples)
+    return n_train
+
+
+def _fit_estimators(fit_args, use_sample_weight=True, n_jobs=None):
+    # Fit each estimator of the tuples (est, fit_function, X, y,
+    # sample_weight) in `fit_args`, optionally in parallel.
+    if n_jobs in [None, 1]:
+        return [_fit_estimator(*args, use_sample_weight) for args in fit_args]
+    return Parallel(n_jobs=n_jobs)(
+        delayed(_fit_estimator)(*args, use_sample_weight) for args in fit_args
+    )
+
+
+def _fit_estimator(est, fit_function, X, y, sample_weight, use_sample_weight):
+    if use_sample_weight:
+        return getattr(est, fit_function)(X, y, sample_weight)
+    return getattr(est, fit_function)(X, y)
+
 
 def _bootstrap_estimators(
     est,
@@ -194,6 +340,8 @@ def _bootstrap_estimators(
     n_train=0.5,
     sample_weight=None,
     random_state=None,
+    n_jobs=None,
+    return_subsets=False,
 ):
     """Train the estimator on bootstraps of `X` and `y`.
 
@@ -215,47 +363,54 @@ def _bootstrap_estimators(
     random_state : int | np.random.RandomState (default=None)
         The random state to use. If `random_state is None` random
         `random_state` is used.
+    n_jobs : int or None, optional (default=None)
+        The number of jobs to fit the estimators in parallel. None means 1
+        and -1 means using all processors.
+    return_subsets : bool, optional (default=False)
+        If True, the indices of the samples of each bootstrap are returned.
 
     Returns
     -------
     bootstrap_est : list of SkactivemlClassifier or list of SkactivemlRegressor
         The estimators trained on different bootstraps.
+    subsets_indices : list of np.ndarray of shape (n_train)
+        The indices of the samples of each bootstrap. Only returned if
+        `return_subsets` is True.
     """
 
     check_X_y(X=X, y=y, sample_weight=sample_weight)
     check_scalar(bootstrap_size, "bootstrap_size", int, min_val=1)
 
-    check_type(n_train, "n_train", int, float)
-    if isinstance(n_train, int) and n_train < 1:
-        raise ValueError(
-            f"`n_train` has value `{type(n_train)}`, but must have a value "
-            f"greater or equal to one, if of type `int`."
-        )
-    elif isinstance(n_train, float) and n_train <= 0 or n_train > 1:
-        raise ValueError(
-            f"`n_train` has value `{type(n_train)}`, but must have a value "
-            f"between zero and one, excluding zero, if of type `float`."
-        )
-    if isinstance(n_train, float):
-        n_train = math.ceil(n_train * len(X))
+    n_train = _bootstrap_size(n_train, len(X))
 
     check_type(est, "est", SkactivemlClassifier, SkactivemlRegressor)
     random_state = check_random_state(random_state)
 
-    bootstrap_est = [clone(est) for _ in range(bootstrap_size)]
     sample_indices = np.arange(len(X))
     subsets_indices = [
-        random_state.choice(sample_indices, size=int(len(X) * n_train + 1))
+        random_state.choice(sample_indices, size=n_train)
         for _ in range(bootstrap_size)
     ]
 
-    for est_b, subset_indices in zip(bootstrap_est, subsets_indices):
-        X_for_learner = X[subset_indices]
-        y_for_learner = y[subset_indices]
-        if sample_weight is None:
-            est_b.fit(X_for_learner, y_for_learner)
-        else:
-            weight_for_learner = sample_weight[subset_indices]
-            est_b.fit(X_for_learner, y_for_learner, weight_for_learner)
+    bootstrap_est = _fit_estimators(
+        [
+            (
+                clone(est),
+                "fit",
+                X[subset_indices],
+                y[subset_indices],
+                (
+                    None
+                    if sample_weight is None
+                    else sample_weight[subset_indices]
+                ),
+            )
+            for subset_indices in subsets_indices
+        ],
+        use_sample_weight=sample_weight is not None,
+        n_jobs=n_jobs,
+    )
 
+    if return_subsets:
+        return bootstrap_est, subsets_indices
     return bootstrap_est
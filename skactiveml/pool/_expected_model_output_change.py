@@ -9,7 +9,11 @@ from skactiveml.base import (
     ProbabilisticRegressor,
     SingleAnnotatorPoolQueryStrategy,
 )
-from skactiveml.pool.utils import _update_reg, _conditional_expect
+from skactiveml.pool.utils import (
+    _update_reg,
+    _conditional_expect,
+    _cache_reg,
+)
 from skactiveml.utils import (
     check_type,
     simple_batch,
@@ -167,6 +171,7 @@ class ExpectedModelOutputChange(SingleAnnotatorPoolQueryStrategy):
 
         if fit_reg:
             reg = clone(reg).fit(X, y, sample_weight)
+            reg = _cache_reg(reg, X_eval)
 
         y_pred = reg.predict(X_eval)
 
@@ -180,6 +185,7 @@ class ExpectedModelOutputChange(SingleAnnotatorPoolQueryStrategy):
                 idx_update=idx,
                 X_update=x_cand,
                 mapping=mapping,
+                use_partial_fit=fit_reg,
             )
             y_pred_new = reg_new.predict(X_eval)
 
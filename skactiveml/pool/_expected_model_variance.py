@@ -7,7 +7,11 @@ from skactiveml.base import (
     SingleAnnotatorPoolQueryStrategy,
 )
 from skactiveml.utils import check_type, simple_batch, MISSING_LABEL
-from skactiveml.pool.utils import _update_reg, _conditional_expect
+from skactiveml.pool.utils import (
+    _update_reg,
+    _conditional_expect,
+    _cache_reg,
+)
 
 
 class ExpectedModelVarianceReduction(SingleAnnotatorPoolQueryStrategy):
@@ -23,6 +27,9 @@ class ExpectedModelVarianceReduction(SingleAnnotatorPoolQueryStrategy):
         Dictionary for integration arguments, i.e. `integration method` etc.,
         used for calculating the expected `y` value for the candidate samples.
         For details see method `skactiveml.pool.utils._conditional_expect`.
+        For a `NICKernelRegressor`, `method='two_point'` computes the
+        expected model variance exactly without numerical integration, as the
+        updated model variance is quadratic in the target value.
     missing_label : scalar or string or np.nan or None,
     (default=skactiveml.utils.MISSING_LABEL)
         Value to represent a missing label.
@@ -135,6 +142,7 @@ class ExpectedModelVarianceReduction(SingleAnnotatorPoolQueryStrategy):
 
         if fit_reg:
             reg = clone(reg).fit(X, y, sample_weight)
+            reg = _cache_reg(reg, X_eval)
 
         old_model_variance = np.average(
             reg.predict(X_eval, return_std=True)[1] ** 2
@@ -150,6 +158,7 @@ class ExpectedModelVarianceReduction(SingleAnnotatorPoolQueryStrategy):
                 idx_update=idx,
                 X_update=x_cand,
                 mapping=mapping,
+                use_partial_fit=fit_reg,
             )
             _, new_model_std = reg_new.predict(X_eval, return_std=True)
 
@@ -155,8 +155,10 @@ class FourDs(SingleAnnotatorPoolQueryStrategy):
         # Fit the classifier and get the probabilities.
         if fit_clf:
             clf = clone(clf).fit(X, y, sample_weight)
+        # The responsibilities and log-densities of the candidates are
+        # obtained in one pass, which is cached by the classifier.
         P_cand = clf.predict_proba(X_cand)
-        R_cand = clf.mixture_model_.predict_proba(X_cand)
+        R_cand, density_cand = clf._estimate_mixture(X_cand)
         is_lbld = is_labeled(y, missing_label=clf.missing_label)
         if np.sum(is_lbld) >= 1:
             R_lbld = clf.mixture_model_.predict_proba(X[is_lbld])
@@ -173,7 +175,6 @@ class FourDs(SingleAnnotatorPoolQueryStrategy):
         )
 
         # Compute densities according to Eq. 10 in [1].
-        density_cand = clf.mixture_model_.score_samples(X_cand)
         density_cand = (density_cand - np.min(density_cand) + 1.0e-5) / (
             np.max(density_cand) - np.min(density_cand) + 1.0e-5
         )
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import numpy as np
 from sklearn import clone
 from sklearn.metrics import pairwise_distances, pairwise
@@ -13,6 +15,7 @@ from skactiveml.utils import (
     is_labeled,
     check_type,
     check_scalar,
+    NeighborIndex,
 )
 
 
@@ -32,6 +35,11 @@ class GreedySamplingX(SingleAnnotatorPoolQueryStrategy):
     metric_dict : dict, optional (default=None)
         Any further parameters are passed directly to the pairwise_distances
         function.
+    neighbor_algorithm : str, optional (default="brute")
+        Algorithm of the `skactiveml.utils.NeighborIndex` used to find the
+        nearest labeled sample of each candidate. The index is kept across
+        queries and newly labeled samples are inserted incrementally. If
+        "brute", all distances are computed without an index.
     missing_label : scalar or string or np.nan or None,
     (default=skactiveml.utils.MISSING_LABEL)
         Value to represent a missing label.
@@ -49,6 +57,7 @@ class GreedySamplingX(SingleAnnotatorPoolQueryStrategy):
         self,
         metric=None,
         metric_dict=None,
+        neighbor_algorithm="brute",
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -57,6 +66,7 @@ class GreedySamplingX(SingleAnnotatorPoolQueryStrategy):
         )
         self.metric = metric
         self.metric_dict = metric_dict
+        self.neighbor_algorithm = neighbor_algorithm
 
     def query(
         self, X, y, candidates=None, batch_size=1, return_utilities=False
@@ -114,6 +124,14 @@ class GreedySamplingX(SingleAnnotatorPoolQueryStrategy):
 
         X_cand, mapping = self._transform_candidates(candidates, X, y)
 
+        self._neighbor_index = _check_neighbor_index(
+            getattr(self, "_neighbor_index", None),
+            self.neighbor_algorithm,
+            self.metric,
+            self.metric_dict,
+            self.random_state_,
+        )
+
         sample_indices = np.arange(len(X), dtype=int)
         selected_indices = labeled_indices(y, missing_label=self.missing_label)
 
@@ -135,6 +153,7 @@ class GreedySamplingX(SingleAnnotatorPoolQueryStrategy):
             method="x",
             metric_x=self.metric,
             metric_dict_x=self.metric_dict,
+            neighbor_index=self._neighbor_index,
         )
 
         if mapping is not None:
@@ -184,6 +203,12 @@ class GreedySamplingTarget(SingleAnnotatorPoolQueryStrategy):
         Specifies whether only the diversity in the target space (`GSy`) or the
         diversity in the feature and the target space (`GSi`) should be
         maximized, when the number of selected samples exceeds `n_GSx_samples`.
+    neighbor_algorithm : str, optional (default="brute")
+        Algorithm of the `skactiveml.utils.NeighborIndex` used to find the
+        nearest labeled sample of each candidate in the feature space and, for
+        `GSy`, in the target space. The indices are kept across queries and
+        newly labeled samples are inserted incrementally. If "brute", all
+        distances are computed without an index.
     missing_label : scalar or string or np.nan or None,
     (default=skactiveml.utils.MISSING_LABEL)
         Value to represent a missing label.
@@ -205,6 +230,7 @@ class GreedySamplingTarget(SingleAnnotatorPoolQueryStrategy):
         y_metric_dict=None,
         method=None,
         n_GSx_samples=1,
+        neighbor_algorithm="brute",
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -217,6 +243,7 @@ class GreedySamplingTarget(SingleAnnotatorPoolQueryStrategy):
         self.x_metric_dict = x_metric_dict
         self.y_metric_dict = y_metric_dict
         self.n_GSx_samples = n_GSx_samples
+        self.neighbor_algorithm = neighbor_algorithm
 
     def query(
         self,
@@ -296,6 +323,21 @@ class GreedySamplingTarget(SingleAnnotatorPoolQueryStrategy):
 
         X_cand, mapping = self._transform_candidates(candidates, X, y)
 
+        self._neighbor_index_x = _check_neighbor_index(
+            getattr(self, "_neighbor_index_x", None),
+            self.neighbor_algorithm,
+            self.x_metric,
+            self.x_metric_dict,
+            self.random_state_,
+        )
+        self._neighbor_index_y = _check_neighbor_index(
+            getattr(self, "_neighbor_index_y", None),
+            self.neighbor_algorithm,
+            self.y_metric,
+            self.y_metric_dict,
+            self.random_state_,
+        )
+
         n_labeled = np.sum(is_labeled(y, missing_label=self.missing_label_))
         batch_size_x = max(0, min(self.n_GSx_samples - n_labeled, batch_size))
         batch_size_y = batch_size - batch_size_x
@@ -334,6 +376,7 @@ class GreedySamplingTarget(SingleAnnotatorPoolQueryStrategy):
                 metric_x=self.x_metric,
                 metric_dict_x=self.x_metric_dict,
                 method="x",
+                neighbor_index=self._neighbor_index_x,
             )
 
             query_indices[0:batch_size_x] = query_indices_x
@@ -369,6 +412,7 @@ class GreedySamplingTarget(SingleAnnotatorPoolQueryStrategy):
                 metric_y=self.y_metric,
                 metric_dict_y=self.y_metric_dict,
                 method="xy" if self.method == "GSi" else "y",
+                neighbor_index=self._neighbor_index_y,
             )
 
             query_indices[batch_size_x:] = unselected_cands[query_indices_y]
@@ -397,48 +441,124 @@ def _greedy_sampling(
     y=None,
     random_state=None,
     method=None,
+    chunk_size=2**20,
+    neighbor_index=None,
     **kwargs,
 ):
-    dist_dict = dict(
-        X_cand=X_cand, y_cand=y_cand, X=X, y=y, method=method, **kwargs
-    )
+    """Selects candidates via k-center greedy while only keeping the minimum
+    distance of each candidate to the selected samples. Distances are
+    computed in blocks of at most `chunk_size` entries. If a `neighbor_index`
+    is given and `method` is "x" or "y", the initial minimum distances are
+    obtained from this index after updating it with the selected samples.
+    """
+    dist_dict = dict(y=y, X=X, method=method, **kwargs)
     query_indices = np.zeros(batch_size, dtype=int)
     utilities = np.full((batch_size, len(X_cand)), np.nan)
-    distances = np.full((len(X_cand), len(X)), np.nan)
+    is_selected = np.zeros(len(X_cand), dtype=bool)
 
     if len(selected_indices) == 0:
-        distances[:, sample_indices] = _measure_distance(
-            sample_indices, **dist_dict
+        # Without selected samples, the first candidate is the one with the
+        # minimum sum of distances to all samples.
+        min_dist = np.full(len(X_cand), np.inf)
+        util = -_reduce_distance(
+            sample_indices, X_cand, y_cand, np.sum, chunk_size, dist_dict
         )
+    elif neighbor_index is not None and method in ["x", "y"]:
+        if method == "x":
+            points, queries = X[selected_indices], X_cand
+        else:
+            points = y[selected_indices].reshape(-1, 1)
+            queries = y_cand.reshape(-1, 1)
+        min_dist = neighbor_index.update(points).query(queries)[0]
+        util = min_dist
     else:
-        distances[:, selected_indices] = _measure_distance(
-            selected_indices, **dist_dict
+        min_dist = _reduce_distance(
+            selected_indices, X_cand, y_cand, np.min, chunk_size, dist_dict
         )
-
-    not_selected_candidates = np.arange(len(X_cand), dtype=int)
+        util = min_dist
 
     for i in range(batch_size):
-        if len(selected_indices) == 0:
-            dist = distances[not_selected_candidates][:, sample_indices]
-            util = -np.sum(dist, axis=1)
-        else:
-            dist = distances[not_selected_candidates][:, selected_indices]
-            util = np.min(dist, axis=1)
-        utilities[i, not_selected_candidates] = util
-
-        idx = rand_argmax(util, random_state=random_state)
-        query_indices[i] = not_selected_candidates[idx]
-        distances[:, candidate_indices[idx]] = _measure_distance(
-            candidate_indices[idx], **dist_dict
+        utilities[i, ~is_selected] = util[~is_selected]
+        not_selected_candidates = np.flatnonzero(~is_selected)
+        idx = not_selected_candidates[
+            rand_argmax(util[~is_selected], random_state=random_state)[0]
+        ]
+        query_indices[i] = idx
+        is_selected[idx] = True
+        min_dist = np.minimum(
+            min_dist,
+            _reduce_distance(
+                candidate_indices[[idx]],
+                X_cand,
+                y_cand,
+                np.min,
+                chunk_size,
+                dist_dict,
+            ),
         )
+        util = min_dist
 
-        selected_indices = np.append(
-            selected_indices, candidate_indices[idx], axis=0
+    return query_indices, utilities
+
+
+def _check_neighbor_index(
+    neighbor_index, algorithm, metric, metric_dict, random_state
+):
+    """Returns the given neighbor index if it fits the given parameters, a
+    new one otherwise, and None for the algorithm "brute".
+    """
+    check_type(
+        algorithm,
+        "neighbor_algorithm",
+        target_vals=["brute", "kd_tree", "ball_tree", "random_projection"],
+    )
+    if algorithm == "brute":
+        return None
+    metric = metric if metric is not None else "euclidean"
+    metric_dict = metric_dict if metric_dict is not None else {}
+    check_type(
+        metric,
+        "metric",
+        target_vals=pairwise.PAIRWISE_DISTANCE_FUNCTIONS.keys(),
+    )
+    check_type(metric_dict, "metric_dict", dict)
+    if neighbor_index is None or (
+        neighbor_index.algorithm != algorithm
+        or neighbor_index.metric != metric
+        or neighbor_index.metric_dict != metric_dict
+    ):
+        neighbor_index = NeighborIndex(
+            algorithm=algorithm,
+            metric=metric,
+            metric_dict=metric_dict,
+            random_state=deepcopy(random_state).randint(2**31 - 1),
         )
-        candidate_indices = np.delete(candidate_indices, idx, axis=0)
-        not_selected_candidates = np.delete(not_selected_candidates, idx)
+    return neighbor_index
 
-    return query_indices, utilities
+
+def _reduce_distance(indices, X_cand, y_cand, func, chunk_size, dist_dict):
+    """Reduces the distances of the candidates to the samples at `indices`
+    via `func` along the samples without storing all distances at once.
+    """
+    n_cand_chunk = max(1, chunk_size // max(len(indices), 1))
+    n_idx_chunk = max(1, chunk_size // n_cand_chunk)
+    reduced = np.empty(len(X_cand))
+    for c in range(0, len(X_cand), n_cand_chunk):
+        cand_slice = slice(c, c + n_cand_chunk)
+        partial = [
+            func(
+                _measure_distance(
+                    indices[i : i + n_idx_chunk],
+                    X_cand=X_cand[cand_slice],
+                    y_cand=None if y_cand is None else y_cand[cand_slice],
+                    **dist_dict,
+                ),
+                axis=1,
+            )
+            for i in range(0, len(indices), n_idx_chunk)
+        ]
+        reduced[cand_slice] = func(np.array(partial), axis=0)
+    return reduced
 
 
 def _measure_distance(
@@ -11,6 +11,7 @@ from skactiveml.pool.utils import (
     _update_reg,
     _conditional_expect,
     _cross_entropy,
+    _cache_reg,
 )
 from skactiveml.utils import (
     check_type,
@@ -37,7 +38,11 @@ class KLDivergenceMaximization(SingleAnnotatorPoolQueryStrategy):
         Dictionary for integration arguments, i.e. `integration method` etc.,
         used for calculating the cross entropy between the updated conditional
         estimator by the `X_cand` value and the old conditional estimator.
-        For details see method `conditional_expect`.
+        For details see method `conditional_expect`. If `reg` predicts normal
+        distributions, `method='analytic'` computes the cross entropy in
+        closed form without numerical integration. For other distributions,
+        e.g., the t-distributions of a `NICKernelRegressor`, no closed form
+        exists and `method='analytic'` raises a `ValueError`.
     missing_label : scalar or string or np.nan or None,
     (default=skactiveml.utils.MISSING_LABEL)
         Value to represent a missing label.
@@ -165,9 +170,17 @@ class KLDivergenceMaximization(SingleAnnotatorPoolQueryStrategy):
 
         if fit_reg:
             reg = clone(reg).fit(X, y, sample_weight)
+            reg = _cache_reg(reg, X_eval)
 
         utilities_cand = self._kullback_leibler_divergence(
-            X_eval, X_cand, mapping, reg, X, y, sample_weight=sample_weight
+            X_eval,
+            X_cand,
+            mapping,
+            reg,
+            X,
+            y,
+            sample_weight=sample_weight,
+            use_partial_fit=fit_reg,
         )
 
         if mapping is None:
@@ -184,7 +197,15 @@ class KLDivergenceMaximization(SingleAnnotatorPoolQueryStrategy):
         )
 
     def _kullback_leibler_divergence(
-        self, X_eval, X_cand, mapping, reg, X, y, sample_weight=None
+        self,
+        X_eval,
+        X_cand,
+        mapping,
+        reg,
+        X,
+        y,
+        sample_weight=None,
+        use_partial_fit=False,
     ):
         """Calculates the expected kullback leibler divergence over the
         evaluation set if each candidate sample where to be labeled.
@@ -207,6 +228,9 @@ class KLDivergenceMaximization(SingleAnnotatorPoolQueryStrategy):
             indicated by `self.missing_label`).
         sample_weight: array-like of shape (n_samples,), optional (default=None)
             Weights of training samples in `X`.
+        use_partial_fit : bool, optional (default=False)
+            Whether `reg` has been fitted on `X` and `y` such that it may be
+            updated via `partial_fit` instead of being refitted.
 
         Returns
         -------
@@ -224,6 +248,7 @@ class KLDivergenceMaximization(SingleAnnotatorPoolQueryStrategy):
                 idx_update=idx,
                 X_update=x_cand,
                 mapping=mapping,
+                use_partial_fit=use_partial_fit,
             )
             entropy_post = np.sum(
                 reg_new.predict(X_eval, return_entropy=True)[1]
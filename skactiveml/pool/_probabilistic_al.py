@@ -1,7 +1,7 @@
-import itertools
+from functools import lru_cache
 
 import numpy as np
-from scipy.special import factorial, gammaln
+from scipy.special import gammaln
 from sklearn import clone
 from sklearn.utils.validation import check_array
 
@@ -208,6 +208,10 @@ class ProbabilisticAL(SingleAnnotatorPoolQueryStrategy):
         )
 
 
+# Maximum number of elements of the intermediate arrays of `cost_reduction`.
+_BLOCK_ELEMENTS = 2**22
+
+
 def cost_reduction(k_vec_list, C=None, m_max=2, prior=1.0e-3):
     """Calculate the expected cost reduction.
 
@@ -236,61 +240,53 @@ def cost_reduction(k_vec_list, C=None, m_max=2, prior=1.0e-3):
     # Check if 'm_max' is valid
     check_scalar(m_max, "m_max", int, min_val=1)
 
-    n_classes = len(k_vec_list[0])
-    n_samples = len(k_vec_list)
+    k_vec_list = np.asarray(k_vec_list)
+    n_samples, n_classes = k_vec_list.shape
 
     # check cost matrix
     C = 1 - np.eye(n_classes) if C is None else np.asarray(C)
 
-    # generate labelling vectors for all possible m values
-    l_vec_list = np.vstack(
-        [_gen_l_vec_list(m, n_classes) for m in range(m_max + 1)]
-    )
-    m_list = np.sum(l_vec_list, axis=1)
-    n_l_vecs = len(l_vec_list)
-
-    # compute optimal cost-sensitive decision for all combination of k-vectors
-    # and l-vectors
-    tile = np.tile(k_vec_list, (n_l_vecs, 1, 1))
-    k_l_vec_list = np.swapaxes(tile, 0, 1) + l_vec_list
-    y_hats = np.argmin(k_l_vec_list @ C, axis=2)
-
-    # add prior to k-vectors
+    # labelling vectors for all possible m values
+    l_vec_list, m_list, log_multinomials = _l_vec_table(n_classes, m_max)
+    m_indicators = m_list[:, np.newaxis] == np.arange(m_max + 1)
     prior = prior * np.ones(n_classes)
-    k_vec_list = np.asarray(k_vec_list) + prior
 
-    # all combination of k-, l-, and prediction indicator vectors
-    combs = [k_vec_list, l_vec_list, np.eye(n_classes)]
-    combs = np.asarray(
-        [list(elem) for elem in list(itertools.product(*combs))]
-    )
+    # process the samples in blocks to bound the memory of the
+    # (n_samples, n_l_vecs, n_classes) arrays
+    block_size = max(1, _BLOCK_ELEMENTS // (len(l_vec_list) * n_classes))
+    gains = np.empty((n_samples, m_max))
+    for start in range(0, n_samples, block_size):
+        k_vecs = k_vec_list[start : start + block_size]
+
+        # optimal cost-sensitive decision for all combination of k-vectors
+        # and l-vectors
+        k_l_vecs = k_vecs[:, np.newaxis, :] + l_vec_list
+        y_hats = np.argmin(k_l_vecs @ C, axis=2)
+
+        # add prior to k-vectors
+        k_vecs = k_vecs + prior
+        k_l_vecs = k_l_vecs + prior
+        k_sums = np.sum(k_vecs, axis=1)[:, np.newaxis]
+
+        # probability of each l-vector, i.e., the multinomial coefficient
+        # times B(k + l) / B(k) with the Euler beta function B
+        log_probas = (
+            log_multinomials
+            + np.sum(gammaln(k_l_vecs), axis=2)
+            - np.sum(gammaln(k_vecs), axis=1)[:, np.newaxis]
+            - gammaln(k_sums + m_list)
+            + gammaln(k_sums)
+        )
 
-    # three factors of the closed form solution
-    factor_1 = 1 / _euler_beta(k_vec_list)
-    factor_2 = _multinomial(l_vec_list)
-    factor_3 = _euler_beta(np.sum(combs, axis=1)).reshape(
-        n_samples, n_l_vecs, n_classes
-    )
+        # expected cost of the decision y_hat given k + l, using
+        # B(a + e_j) = B(a) * a_j / sum(a)
+        costs = np.sum(C.T[y_hats] * k_l_vecs, axis=2) / (k_sums + m_list)
 
-    # expected classification cost for each m
-    m_sums = np.asarray(
-        [
-            factor_1[k_idx]
-            * np.bincount(
-                m_list,
-                factor_2
-                * [
-                    C[:, y_hats[k_idx, l_idx]] @ factor_3[k_idx, l_idx]
-                    for l_idx in range(n_l_vecs)
-                ],
-            )
-            for k_idx in range(n_samples)
-        ]
-    )
+        # expected classification cost for each m
+        m_sums = (np.exp(log_probas) * costs) @ m_indicators
 
-    # compute classification cost reduction as difference
-    gains = np.zeros((n_samples, m_max)) + m_sums[:, 0].reshape(-1, 1)
-    gains -= m_sums[:, 1:]
+        # compute classification cost reduction as difference
+        gains[start : start + block_size] = m_sums[:, :1] - m_sums[:, 1:]
 
     # normalize  cost reduction by number of hypothetical label acquisitions
     gains /= np.arange(1, m_max + 1)
@@ -298,6 +294,41 @@ def cost_reduction(k_vec_list, C=None, m_max=2, prior=1.0e-3):
     return np.max(gains, axis=1)
 
 
+@lru_cache(maxsize=32)
+def _l_vec_table(n_classes, m_max):
+    """
+    Creates all class labeling vectors for up to `m_max` hypothetically
+    acquired labels, their numbers of labels and the logarithms of their
+    multinomial coefficients. The tables are cached and read-only.
+
+    Parameters
+    ----------
+    n_classes: int,
+        Number of classes
+    m_max: int
+        Maximal number of hypothetically acquired labels.
+
+    Returns
+    -------
+    l_vec_list: np.ndarray, shape = [n_labelings, n_classes]
+        All possible class labelings for given parameters.
+    m_list: np.ndarray, shape = [n_labelings]
+        Number of labels of each labeling.
+    log_multinomials: np.ndarray, shape = [n_labelings]
+        Logarithms of the multinomial coefficients of each labeling.
+    """
+    l_vec_list = np.vstack(
+        [_gen_l_vec_list(m, n_classes) for m in range(m_max + 1)]
+    )
+    m_list = np.sum(l_vec_list, axis=1)
+    log_multinomials = gammaln(m_list + 1) - np.sum(
+        gammaln(l_vec_list + 1), axis=1
+    )
+    for table in [l_vec_list, m_list, log_multinomials]:
+        table.flags.writeable = False
+    return l_vec_list, m_list, log_multinomials
+
+
 def _gen_l_vec_list(m_approx, n_classes):
     """
     Creates all possible class labeling vectors for given number of
@@ -333,39 +364,3 @@ def _gen_l_vec_list(m_approx, n_classes):
     label_vec_list = np.array(new_label_vec_list, int)
 
     return label_vec_list
-
-
-def _euler_beta(a):
-    """
-    Represents Euler beta function:
-    B(a(i)) = Gamma(a(i,1))*...*Gamma(a_n)/Gamma(a(i,1)+...+a(i,n))
-
-    Parameters
-    ----------
-    a: array-like, shape (m, n)
-        Vectors to evaluated.
-
-    Returns
-    -------
-    result: array-like, shape (m)
-        Euler beta function results [B(a(0)), ..., B(a(m))
-    """
-    return np.exp(np.sum(gammaln(a), axis=1) - gammaln(np.sum(a, axis=1)))
-
-
-def _multinomial(a):
-    """
-    Computes Multinomial coefficient:
-    Mult(a(i)) = (a(i,1)+...+a(i,n))!/(a(i,1)!...a(i,n)!)
-
-    Parameters
-    ----------
-    a: array-like, shape (m, n)
-        Vectors to evaluated.
-
-    Returns
-    -------
-    result: array-like, shape (m)
-        Multinomial coefficients [Mult(a(0)), ..., Mult(a(m))
-    """
-    return factorial(np.sum(a, axis=1)) / np.prod(factorial(a), axis=1)
@@ -7,6 +7,8 @@ Query-by-committee strategies.
 import copy
 
 import numpy as np
+from joblib import Parallel, delayed
+from joblib.hashing import NumpyHasher
 from sklearn import clone
 from sklearn.utils.validation import check_array, check_is_fitted
 
@@ -17,6 +19,7 @@ from ..base import (
 )
 from ..utils import (
     simple_batch,
+    check_scalar,
     check_type,
     compute_vote_vectors,
     MISSING_LABEL,
@@ -36,6 +39,23 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
         The method to calculate the disagreement in the case of classification.
         KL_divergence or vote_entropy are possible. In the case of regression
         the empirical variance is used.
+    chunk_size : int > 0, default=None
+        The number of candidates whose predictions are computed and evaluated
+        at once. If None, all candidates are processed at once. Smaller
+        chunks avoid holding the predictions of all ensemble members for all
+        candidates in memory.
+    n_jobs : int or None, default=None
+        The number of jobs to compute the predictions of the ensemble members
+        in parallel. None means 1 and -1 means using all processors. The
+        backend can be chosen via `joblib.parallel_backend`.
+    cache_predictions : bool, default=False
+        If True, the predictions of each ensemble member are cached across
+        queries for each candidate. A member is identified by a hash of its
+        (fitted) state ignoring random states, so that only members that
+        changed since the last query and candidates that were not predicted
+        before are evaluated.
+        The cache holds the predictions of all members for all candidates
+        of the last query.
     missing_label : scalar or string or np.nan or None, default=np.nan
         Value to represent a missing label.
     random_state : int or np.random.RandomState, default=None
@@ -58,6 +78,9 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
     def __init__(
         self,
         method="KL_divergence",
+        chunk_size=None,
+        n_jobs=None,
+        cache_predictions=False,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -65,6 +88,9 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
             missing_label=missing_label, random_state=random_state
         )
         self.method = method
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        self.cache_predictions = cache_predictions
 
     def query(
         self,
@@ -73,6 +99,7 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
         ensemble,
         fit_ensemble=True,
         sample_weight=None,
+        probas=None,
         candidates=None,
         batch_size=1,
         return_utilities=False,
@@ -97,9 +124,22 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
             as committee member.
         fit_ensemble : bool, default=True
             Defines whether the ensemble should be fitted on `X`, `y`, and
-            `sample_weight`.
+            `sample_weight`. It is ignored if `probas` is given.
         sample_weight: array-like of shape (n_samples), default=None
             Weights of training samples in `X`.
+        probas : array-like of shape (n_estimators, n_candidates, n_classes),
+        default=None
+            Precomputed class-membership probabilities of the ensemble members
+            for the candidates, i.e., for the unlabeled samples in `X` if
+            `candidates` is None and for the samples selected by `candidates`
+            otherwise. It may be a memory-mapped array, e.g., loaded via
+            `np.load(..., mmap_mode="r")`, which is then only read in chunks
+            of `chunk_size` candidates. If given, the ensemble members'
+            predictions are not computed and the votes for `vote_entropy` are
+            the classes with the highest probabilities. It is only supported
+            for ensembles of classifiers.
+            The ensemble is then not fitted, even if `fit_ensemble=True`, but
+            it must already be fitted such that its classes are known.
         candidates : None or array-like of shape (n_candidates), dtype=int or
                 array-like of shape (n_candidates, n_features), default=None
             If candidates is None, the unlabeled samples from (X,y) are
@@ -145,12 +185,13 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
         # Validate classifier type.
         check_type(fit_ensemble, "fit_ensemble", bool)
 
+        # Precomputed probabilities make fitting the ensemble unnecessary.
         ensemble, est_arr, classes = _check_ensemble(
             ensemble=ensemble,
             X=X,
             y=y,
             sample_weight=sample_weight,
-            fit_ensemble=fit_ensemble,
+            fit_ensemble=fit_ensemble and probas is None,
             missing_label=self.missing_label_,
             estimator_types=[SkactivemlClassifier, SkactivemlRegressor],
         )
@@ -162,23 +203,69 @@ class QueryByCommittee(SingleAnnotatorPoolQueryStrategy):
             target_vals=["KL_divergence", "vote_entropy"],
         )
 
-        # classes is None if the ensemble is a regressor
-        if classes is not None:
-            # Compute utilities.
-            if self.method == "KL_divergence":
-                probas = np.array(
-                    [est.predict_proba(X_cand) for est in est_arr]
+        # Validate 'chunk_size', 'n_jobs', and 'cache_predictions'.
+        if self.chunk_size is not None:
+            check_scalar(self.chunk_size, "chunk_size", int, min_val=1)
+        check_type(self.n_jobs, "n_jobs", int, target_vals=[None])
+        if self.n_jobs == 0:
+            raise ValueError("`n_jobs` must not be 0.")
+        check_type(self.cache_predictions, "cache_predictions", bool)
+
+        n_cand = len(X_cand)
+        if probas is not None:
+            if classes is None:
+                raise ValueError(
+                    "`probas` can only be given for ensembles of classifiers."
                 )
-                utilities_cand = average_kl_divergence(probas)
-            else:  # self.method == "vote_entropy":
-                votes = np.array([est.predict(X_cand) for est in est_arr]).T
-                utilities_cand = vote_entropy(votes, classes)
-
-        else:
-            results = np.array(
-                [learner.predict(X_cand) for learner in est_arr]
+            probas = _check_probas(probas, n_cand, len(classes))
+
+        # Determine the prediction method of the ensemble members.
+        if classes is None:
+            predict_method = "predict"
+        elif self.method == "KL_divergence":
+            predict_method = "predict_proba"
+        else:  # self.method == "vote_entropy":
+            predict_method = "predict"
+
+        if probas is None and self.cache_predictions:
+            cache = getattr(self, "_prediction_cache", None)
+            if cache is None:
+                cache = _CommitteePredictionCache()
+            predictions = cache.predict(
+                est_arr, X_cand, predict_method, self.n_jobs
             )
-            utilities_cand = np.std(results, axis=0)
+            self._prediction_cache = cache
+
+        # Compute utilities in chunks of candidates.
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, n_cand)
+        utilities_cand = np.empty(n_cand)
+        for start in range(0, n_cand, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            if probas is not None:
+                probas_chunk = np.asarray(probas[:, chunk])
+            elif self.cache_predictions:
+                predictions_chunk = predictions[:, chunk]
+            else:
+                predictions_chunk = _predict_committee(
+                    est_arr, X_cand[chunk], predict_method, self.n_jobs
+                )
+            # classes is None if the ensemble is a regressor
+            if classes is None:
+                utilities_cand[chunk] = np.std(predictions_chunk, axis=0)
+            elif self.method == "KL_divergence":
+                if probas is None:
+                    probas_chunk = predictions_chunk
+                utilities_cand[chunk] = average_kl_divergence(probas_chunk)
+            else:  # self.method == "vote_entropy":
+                if probas is None:
+                    votes = predictions_chunk.T
+                else:
+                    votes = np.asarray(classes)[
+                        np.argmax(probas_chunk, axis=-1).T
+                    ]
+                utilities_cand[chunk] = vote_entropy(votes, classes)
 
         if mapping is None:
             utilities = utilities_cand
@@ -272,6 +359,118 @@ def vote_entropy(votes, classes):
     return scores
 
 
+def _predict_committee(est_arr, X, predict_method, n_jobs=None):
+    # Compute the predictions of all ensemble members, optionally in parallel.
+    if n_jobs in [None, 1]:
+        return np.array([getattr(est, predict_method)(X) for est in est_arr])
+    predictions = Parallel(n_jobs=n_jobs)(
+        delayed(getattr(est, predict_method))(X) for est in est_arr
+    )
+    return np.array(predictions)
+
+
+class _MemberHasher(NumpyHasher):
+    # Random states are ignored since they change with each draw, e.g., of a
+    # member referencing the global random state, without affecting the
+    # (deterministic) predictions of a fitted member.
+    dispatch = NumpyHasher.dispatch.copy()
+
+    def _save_random_state(self, obj):
+        self.save(type(obj).__name__)
+
+    dispatch[np.random.RandomState] = _save_random_state
+
+
+class _CommitteePredictionCache:
+    """Cache of the predictions of ensemble members for candidates across
+    queries. Members are identified by a hash of their state and candidates
+    by their feature values.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def predict(self, est_arr, X_cand, predict_method, n_jobs=None):
+        if X_cand.dtype == object or len(X_cand) == 0:
+            # Object arrays cannot be identified by their bytes.
+            return _predict_committee(est_arr, X_cand, predict_method, n_jobs)
+        cand_keys = [x.tobytes() for x in X_cand]
+        member_keys = [
+            (predict_method, _MemberHasher().hash(est)) for est in est_arr
+        ]
+
+        # Collect the candidates to be predicted per unique member.
+        tasks = {}
+        for est, member_key in zip(est_arr, member_keys):
+            if member_key in tasks:
+                continue
+            entry = self._entries.get(member_key)
+            if entry is None:
+                is_missing = np.ones(len(X_cand), dtype=bool)
+            else:
+                is_missing = np.array(
+                    [key not in entry[0] for key in cand_keys], dtype=bool
+                )
+            tasks[member_key] = (est, np.flatnonzero(is_missing))
+
+        # Predict all missing candidates, optionally in parallel.
+        jobs = [
+            (member_key, est, idx)
+            for member_key, (est, idx) in tasks.items()
+            if len(idx) > 0
+        ]
+        if n_jobs in [None, 1]:
+            results = [
+                getattr(est, predict_method)(X_cand[idx])
+                for _, est, idx in jobs
+            ]
+        else:
+            results = Parallel(n_jobs=n_jobs)(
+                delayed(getattr(est, predict_method))(X_cand[idx])
+                for _, est, idx in jobs
+            )
+
+        # Assemble the predictions and keep only the current members and
+        # candidates in the cache.
+        new_results = {
+            member_key: (idx, result)
+            for (member_key, _, idx), result in zip(jobs, results)
+        }
+        entries = {}
+        for member_key in tasks:
+            pos = np.full(len(X_cand), -1)
+            stored = []
+            if member_key in self._entries:
+                index, values = self._entries[member_key]
+                pos = np.array([index.get(key, -1) for key in cand_keys])
+                stored.append(values)
+            if member_key in new_results:
+                idx, result = new_results[member_key]
+                pos[idx] = sum(len(v) for v in stored) + np.arange(len(idx))
+                stored.append(np.asarray(result))
+            values = np.concatenate(stored)[pos]
+            index = {key: i for i, key in enumerate(cand_keys)}
+            entries[member_key] = (index, values)
+        self._entries = entries
+        return np.array([entries[member_key][1] for member_key in member_keys])
+
+
+def _check_probas(probas, n_candidates, n_classes):
+    # Check precomputed probabilities without copying memory-mapped arrays.
+    probas = check_array(probas, allow_nd=True, ensure_min_samples=0)
+    if probas.ndim != 3:
+        raise ValueError(
+            f"Expected 3D array for `probas`, got {probas.ndim}D array "
+            f"instead."
+        )
+    if probas.shape[1:] != (n_candidates, n_classes):
+        raise ValueError(
+            f"`probas` must be of shape (n_estimators, {n_candidates}, "
+            f"{n_classes}), got {probas.shape} instead."
+        )
+    return probas
+
+
 def _check_ensemble(
     ensemble,
     estimator_types,
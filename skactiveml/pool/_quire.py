@@ -1,6 +1,5 @@
-import warnings
-
 import numpy as np
+from scipy.linalg import solve_triangular
 from sklearn.metrics.pairwise import pairwise_kernels, KERNEL_PARAMS
 
 from skactiveml.base import SingleAnnotatorPoolQueryStrategy
@@ -173,40 +172,30 @@ class Quire(SingleAnnotatorPoolQueryStrategy):
         )
 
         # --- Computation ----------------------------------------------------
-        # Compute kernel (metric) matrix.
-        if self.metric == "precomputed":
-            K = np.array(X)
-            if K.shape != (len(y), len(y)):
-                raise ValueError(
-                    "The kernel matrix 'K' must have the shape "
-                    "(n_samples, n_samples)."
-                )
-        else:
-            K = pairwise_kernels(X, X, metric=self.metric, **self.metric_dict_)
-        # compute L and L_aa
-        L = np.linalg.inv(K + lmbda * np.eye(len(X)))
-        # Compute the inverse of L_aa
-        L_aa_inv = _L_aa_inv(K, lmbda, mask_a, mask_l)
+        # Check shape of the kernel (metric) matrix.
+        if self.metric == "precomputed" and X.shape != (len(y), len(y)):
+            raise ValueError(
+                "The kernel matrix 'K' must have the shape "
+                "(n_samples, n_samples)."
+            )
+        # Reuse the Cholesky factor of the previous query if only labels
+        # were added.
+        engine = getattr(self, "_engine", None)
+        if engine is None or not engine.is_compatible(
+            X, lmbda, self.metric, self.metric_dict_
+        ):
+            engine = _QuireCholeskyEngine(
+                X, lmbda, self.metric, self.metric_dict_
+            )
+        self._engine = engine
+        idx_l = engine.update(np.flatnonzero(mask_l))
 
         utilities_cand = np.full((len(X)), fill_value=np.nan)
         y_labeled_ovr = _one_versus_rest_transform(
-            y[mask_l], classes_, l_rest=-1
+            y[idx_l], classes_, l_rest=-1
         )
-        for i, s in enumerate(mapping):
-            mask_u = mask_a.copy()
-            mask_u[s] = False
-            L_uu_inv = _del_i_inv(L_aa_inv, i, "L_aa_inv")
-
-            utilities_cand[s] = L[s, s] + np.max(
-                [
-                    yl.T.dot(L[mask_l][:, mask_l]).dot(yl)
-                    + 2 * L[s][mask_l].dot(yl)
-                    - (L[mask_u][:, mask_l].dot(yl) + L[mask_u][:, [s]])
-                    .T.dot(L_uu_inv)
-                    .dot(L[mask_u][:, mask_l].dot(yl) + L[mask_u][:, [s]])
-                    for yl in y_labeled_ovr.T[:, :, np.newaxis]
-                ]
-            )
+        cand_a = mapping[mask_a[mapping]]
+        utilities_cand[cand_a] = engine.utilities(cand_a, y_labeled_ovr)
 
         # If we want to use enforce_mapping = False later
         # if not map_candidates:
@@ -233,34 +222,139 @@ def _one_versus_rest_transform(y, classes, l_one=1, l_rest=-1):
     return y_ovr.T
 
 
-def _del_i_inv(A_inv, s, name="A"):
-    if not np.allclose(A_inv, A_inv.T):
-        err = np.abs(A_inv - A_inv.T)
-        warnings.warn(
-            f"The approximation of the inverse of matrix `{name}` "
-            f"may be inaccurate because the matrix is not symmetric "
-            f"with an absolut error of \n{err}.\n To avoid this "
-            f"warning you can increase `lmbda`."
+class _QuireCholeskyEngine:
+    """Engine computing the utilities of Quire via a Cholesky factor.
+
+    With `P = K + lmbda * I`, the labeled samples `l`, and a candidate `s`
+    among the unlabeled samples, the utility of Quire simplifies to
+
+        max_y [y^T P_ll^-1 y + (1 - P_sl P_ll^-1 y)^2 / S_ss],
+
+    where `S_ss = P_ss - P_sl P_ll^-1 P_ls` is the diagonal of the Schur
+    complement of `P_ll`. Hence, only the Cholesky factor `C` of `P_ll` and
+    `W = C^-1 K_l` are needed, which are extended block-wise if labeled
+    samples are added in successive queries.
+
+    Parameters
+    ----------
+    X : np.ndarray of shape (n_samples, n_features) or shape
+    (n_samples, n_samples) if metric == 'precomputed'
+        Training data set, including the labeled and unlabeled samples.
+    lmbda : float
+        Regularization parameter of Quire.
+    metric : str or callable
+        The metric must a be a valid kernel defined by the function
+        `sklearn.metrics.pairwise.pairwise_kernels` or 'precomputed'.
+    metric_dict : dict
+        Any further parameters are passed directly to the metric function.
+    """
+
+    def __init__(self, X, lmbda, metric, metric_dict):
+        self.X = np.array(X)
+        self.lmbda = lmbda
+        self.metric = metric
+        self.metric_dict = dict(metric_dict)
+        self.idx_l = np.empty(0, dtype=int)
+        self.C = np.empty((0, 0))
+        self.W = np.empty((0, len(self.X)))
+        self.K_diag = self._kernel_diag()
+
+    def is_compatible(self, X, lmbda, metric, metric_dict):
+        """Checks whether the engine was created for the given arguments."""
+        return (
+            lmbda == self.lmbda
+            and metric == self.metric
+            and metric_dict == self.metric_dict
+            and np.array_equal(X, self.X)
         )
 
-    a = A_inv[s, s]
-    b = np.delete(A_inv[:, [s]], s, axis=0)
-    D = np.delete(np.delete(A_inv, [s], axis=0), [s], axis=1)
-    B_inv = D - (1 / a) * np.dot(b, b.T)
-    return B_inv
-
-
-def _L_aa_inv(K, lmbda, is_unlabeled, is_labeled):
-    L_aa_inv = (
-        lmbda * np.eye(sum(is_unlabeled)) + K[is_unlabeled][:, is_unlabeled]
-    )
-    L_aa_inv -= (
-        K[is_unlabeled][:, is_labeled]
-        .dot(
-            np.linalg.inv(
-                lmbda * np.eye(sum(is_labeled)) + K[is_labeled][:, is_labeled]
+    def update(self, idx_l):
+        """Updates the Cholesky factor to the given labeled samples.
+
+        The factor is extended if `idx_l` contains all previously labeled
+        samples and recomputed otherwise.
+
+        Parameters
+        ----------
+        idx_l : np.ndarray of shape (n_labeled_samples,)
+            Indices of the labeled samples.
+
+        Returns
+        -------
+        idx_l : np.ndarray of shape (n_labeled_samples,)
+            Indices of the labeled samples in the order of the factor.
+        """
+        if not np.isin(self.idx_l, idx_l).all():
+            self.idx_l = np.empty(0, dtype=int)
+            self.C = np.empty((0, 0))
+            self.W = np.empty((0, len(self.X)))
+        idx_new = idx_l[~np.isin(idx_l, self.idx_l)]
+        if len(idx_new) > 0:
+            K_new = self._kernel_rows(idx_new)
+            B = self.W[:, idx_new]
+            D = np.linalg.cholesky(
+                K_new[:, idx_new]
+                + self.lmbda * np.eye(len(idx_new))
+                - B.T.dot(B)
             )
+            W_new = solve_triangular(D, K_new - B.T.dot(self.W), lower=True)
+            n_l = len(self.idx_l)
+            C = np.zeros((n_l + len(idx_new), n_l + len(idx_new)))
+            C[:n_l, :n_l] = self.C
+            C[n_l:, :n_l] = B.T
+            C[n_l:, n_l:] = D
+            self.C = C
+            self.W = np.vstack([self.W, W_new])
+            self.idx_l = np.concatenate([self.idx_l, idx_new])
+        return self.idx_l
+
+    def utilities(self, idx_cand, y_labeled_ovr):
+        """Computes the utilities of unlabeled candidates.
+
+        Parameters
+        ----------
+        idx_cand : np.ndarray of shape (n_candidates,)
+            Indices of the unlabeled candidates.
+        y_labeled_ovr : np.ndarray of shape (n_labeled_samples, n_classes)
+            One-versus-rest encoded labels of the labeled samples in the order
+            returned by `update`.
+
+        Returns
+        -------
+        utilities : np.ndarray of shape (n_candidates,)
+            The utilities of the candidates.
+        """
+        if len(self.idx_l) == 0:
+            y_P_y = np.zeros(y_labeled_ovr.shape[1])
+            r = np.zeros((len(idx_cand), y_labeled_ovr.shape[1]))
+        else:
+            # y^T P_ll^-1 y = ||C^-1 y||^2 and P_sl P_ll^-1 y = W_s^T C^-1 y.
+            C_inv_y = solve_triangular(self.C, y_labeled_ovr, lower=True)
+            y_P_y = np.sum(C_inv_y**2, axis=0)
+            r = self.W[:, idx_cand].T.dot(C_inv_y)
+        S = (
+            self.K_diag[idx_cand]
+            + self.lmbda
+            - np.sum(self.W[:, idx_cand] ** 2, axis=0)
         )
-        .dot(K[is_labeled][:, is_unlabeled])
-    )
-    return L_aa_inv
+        return np.max(y_P_y + (1 - r) ** 2 / S[:, np.newaxis], axis=1)
+
+    def _kernel_rows(self, idx):
+        if self.metric == "precomputed":
+            return self.X[idx]
+        return pairwise_kernels(
+            self.X[idx], self.X, metric=self.metric, **self.metric_dict
+        )
+
+    def _kernel_diag(self, chunk_size=256):
+        if self.metric == "precomputed":
+            return np.diag(self.X).copy()
+        K_diag = np.empty(len(self.X))
+        for start in range(0, len(self.X), chunk_size):
+            X_chunk = self.X[start : start + chunk_size]
+            K_diag[start : start + chunk_size] = np.diag(
+                pairwise_kernels(
+                    X_chunk, X_chunk, metric=self.metric, **self.metric_dict
+                )
+            )
+        return K_diag
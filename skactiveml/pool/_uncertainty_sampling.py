@@ -360,49 +360,107 @@ def expected_average_precision(classes, probas):
 
     score = np.zeros(len(probas))
     for i in range(len(classes)):
-        for j in range(len(probas)):
-            # The i-th column of p without p[j,i]
-            p = probas[:, i]
-            p = np.delete(p, [j])
-            # Sort p in descending order
-            p = np.flipud(np.sort(p, axis=0))
-
-            # calculate g_arr
-            g_arr = np.zeros((len(p), len(p)))
-            for n in range(len(p)):
-                for h in range(n + 1):
-                    g_arr[n, h] = _g(n, h, p, g_arr)
-
-            # calculate f_arr
-            f_arr = np.zeros((len(p) + 1, len(p) + 1))
-            for a in range(len(p) + 1):
-                for b in range(a + 1):
-                    f_arr[a, b] = _f(a, b, p, f_arr, g_arr)
-
-            # calculate score
-            for t in range(len(p)):
-                score[j] += f_arr[len(p), t + 1] / (t + 1)
+        # Sort the i-th column in descending order. Removing the candidate
+        # with rank `r` from this sorted column yields the sequence whose
+        # expected average precision is the candidate's score.
+        order = np.argsort(-probas[:, i], kind="stable")
+        score[order] += _expected_average_precision_sorted(probas[order, i])
 
     return score
 
 
-# g-function for expected_average_precision
-def _g(n, t, p, g_arr):
-    if t > n or (t == 0 and n > 0):
-        return 0
-    if t == 0 and n == 0:
-        return 1
-    return p[n - 1] * g_arr[n - 1, t - 1] + (1 - p[n - 1]) * g_arr[n - 1, t]
-
-
-# f-function for expected_average_precision
-def _f(n, t, p, f_arr, g_arr):
-    if t > n or (t == 0 and n > 0):
-        return 0
-    if t == 0 and n == 0:
-        return 1
-    return (
-        p[n - 1] * f_arr[n - 1, t - 1]
-        + p[n - 1] * t * g_arr[n - 1, t - 1] / n
-        + (1 - p[n - 1]) * f_arr[n - 1, t]
-    )
+def _expected_average_precision_sorted(p):
+    """Computes the dynamic program of the expected average precision [1] for
+    all leave-one-out subsequences of `p` in shared sweeps.
+
+    The recurrences of the g- and f-tables are linear in their previous rows.
+    Hence, the score of the subsequence without the element of rank `r` is the
+    inner product of the forward state after the first `r` elements and the
+    adjoint (backward) state of the remaining elements. Backward states are
+    stored only at every `ceil(sqrt(n_samples))`-th rank and recomputed
+    block-wise, such that the computation requires O(n_samples^2) time and
+    O(n_samples^1.5) memory.
+
+    Parameters
+    ----------
+    p : np.ndarray, shape=(n_samples)
+        Probabilities of one class sorted in descending order.
+
+    Returns
+    -------
+    score : np.ndarray, shape=(n_samples)
+        The score of each rank in `p`, i.e., `score[r]` is the expected
+        average precision of `p` without `p[r]`.
+
+    References
+    ----------
+    [1] Wang, Hanmo, et al. "Uncertainty sampling for action recognition
+        via maximizing expected average precision."
+        IJCAI International Joint Conference on Artificial Intelligence. 2018.
+    """
+    n_samples = len(p)
+    n_last = n_samples - 1
+    t_arr = np.arange(n_samples)
+    block_size = int(np.ceil(np.sqrt(n_samples)))
+
+    # The backward state of the last rank weights the f-table's last row.
+    a_last = np.zeros(n_samples)
+    b_last = np.zeros(n_samples)
+    b_last[1:] = 1 / t_arr[1:]
+
+    # Store the backward states at the beginning of each block.
+    checkpoints = {n_last: (a_last, b_last)}
+    a, b = a_last, b_last
+    for r in range(n_last - 1, -1, -1):
+        a, b = _eap_backward_step(a, b, p[r + 1], r + 1, t_arr)
+        if r % block_size == 0 and r > 0:
+            checkpoints[r] = (a, b)
+
+    score = np.empty(n_samples)
+    g = np.zeros(n_samples)
+    f = np.zeros(n_samples)
+    g[0] = f[0] = 1
+    for start in range(0, n_samples, block_size):
+        end = min(start + block_size, n_samples) - 1
+        # Recompute the backward states of the block from its checkpoint.
+        a_block = np.empty((end - start + 1, n_samples))
+        b_block = np.empty((end - start + 1, n_samples))
+        if end == n_last:
+            a, b = a_last, b_last
+        else:
+            a, b = checkpoints[end + 1]
+            a, b = _eap_backward_step(a, b, p[end + 1], end + 1, t_arr)
+        a_block[-1], b_block[-1] = a, b
+        for r in range(end - 1, start - 1, -1):
+            a, b = _eap_backward_step(a, b, p[r + 1], r + 1, t_arr)
+            a_block[r - start], b_block[r - start] = a, b
+
+        # Combine forward and backward states.
+        for r in range(start, end + 1):
+            score[r] = a_block[r - start] @ g + b_block[r - start] @ f
+            if r < n_last:
+                g, f = _eap_forward_step(g, f, p[r], r + 1, t_arr)
+
+    return score
+
+
+# forward step of the g- and f-tables for expected_average_precision
+def _eap_forward_step(g, f, p_n, n, t_arr):
+    g_new = (1 - p_n) * g
+    g_new[1:] += p_n * g[:-1]
+    g_new[0] = 0
+    f_new = (1 - p_n) * f
+    f_new[1:] += p_n * (f[:-1] + t_arr[1:] / n * g[:-1])
+    f_new[0] = 0
+    return g_new, f_new
+
+
+# adjoint step of the g- and f-tables for expected_average_precision
+def _eap_backward_step(a, b, p_n, n, t_arr):
+    a_new = (1 - p_n) * a
+    a_new[0] = 0
+    a_new[:-1] += p_n * (a[1:] + t_arr[1:] / n * b[1:])
+    b_new = (1 - p_n) * b
+    b_new[0] = 0
+    b_new[:-1] += p_n * b[1:]
+    return a_new, b_new
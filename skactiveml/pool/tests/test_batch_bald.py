@@ -1,5 +1,8 @@
+import os
 import unittest
 from copy import deepcopy
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 import numpy as np
 from sklearn import clone
@@ -55,6 +58,18 @@ class TestBatchBALD(
         ]
         self._test_param("init", "n_MC_samples", test_cases)
 
+    def test_init_param_block_size(self):
+        test_cases = [(0, ValueError), (1.2, TypeError), (2, None)]
+        self._test_param("init", "block_size", test_cases)
+
+    def test_init_param_max_memory(self):
+        test_cases = [(0, ValueError), ("1", TypeError), (0.5, None)]
+        self._test_param("init", "max_memory", test_cases)
+
+    def test_init_param_dtype(self):
+        test_cases = [(int, TypeError), (np.float32, None)]
+        self._test_param("init", "dtype", test_cases)
+
     def test_query_param_ensemble(self, test_cases=None):
         test_cases = [] if test_cases is None else test_cases
         test_cases += [
@@ -120,6 +135,53 @@ class TestBatchBALD(
                 exclude_reg=True,
             )
 
+    def test_query_param_probas(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        test_cases += [
+            ("string", ValueError),
+            (np.full((3, 2), 0.5), ValueError),
+            (np.full((3, 3, 2), 0.5), ValueError),
+            (np.full((3, 2, 2), 0.5), None),
+        ]
+        query_params = deepcopy(self.query_default_params_clf)
+        ensemble = clone(self.ensemble_clf).fit(
+            query_params["X"], query_params["y"]
+        )
+        self._test_param(
+            "query",
+            "probas",
+            test_cases,
+            replace_query_params={"ensemble": ensemble},
+        )
+
+        # The ensemble is not fitted if probabilities are given.
+        probas = np.full((3, 2, 2), 0.5)
+        self.assertRaises(
+            NotFittedError, BatchBALD().query, **query_params, probas=probas
+        )
+        query_params["ensemble"] = ensemble
+        with patch.object(SklearnClassifier, "fit") as fit:
+            BatchBALD().query(**query_params, probas=probas)
+            fit.assert_not_called()
+
+        # Precomputed probabilities yield the same utilities as the ensemble
+        # members' predictions.
+        query_params = deepcopy(self.query_default_params_clf)
+        query_params["return_utilities"] = True
+        query_params["batch_size"] = 2
+        probas = np.array(
+            [
+                est.predict_proba(query_params["X"][2:])
+                for est in ensemble.estimators_
+            ]
+        )
+        qs = self.qs_class(random_state=0)
+        _, u = qs.query(**query_params)
+        qs = self.qs_class(random_state=0)
+        query_params["ensemble"] = ensemble
+        _, u_probas = qs.query(**query_params, probas=probas)
+        np.testing.assert_allclose(u, u_probas)
+
     def test_query_param_fit_ensemble(self, test_cases=None):
         test_cases = [] if test_cases is None else test_cases
         test_cases += [("string", TypeError), (None, TypeError)]
@@ -191,6 +253,18 @@ class Testbatch_bald(unittest.TestCase):
         test_cases = [(np.nan, ValueError), ("state", ValueError), (1, None)]
         self._test_param(batch_bald, "random_state", test_cases)
 
+    def test_param_block_size(self):
+        test_cases = [(0, ValueError), (1.2, TypeError), (None, None)]
+        self._test_param(batch_bald, "block_size", test_cases)
+
+    def test_param_max_memory(self):
+        test_cases = [(0, ValueError), ("1", TypeError), (1e-3, None)]
+        self._test_param(batch_bald, "max_memory", test_cases)
+
+    def test_param_dtype(self):
+        test_cases = [("float", TypeError), (np.float64, None)]
+        self._test_param(batch_bald, "dtype", test_cases)
+
     def test_batch_bald(self):
         # test _BALD and _BatchBald
         probas = np.random.rand(10, 100, 5)
@@ -253,6 +327,40 @@ class Testbatch_bald(unittest.TestCase):
             expected_max_utilities, np.nanmax(utils, axis=1), rtol=1e-6
         )
 
+        # The results must not depend on the block size.
+        for block_size in [1, 7]:
+            utils_block = batch_bald(
+                probas,
+                batch_size=batch_size,
+                n_MC_samples=n_estimators,
+                random_state=np.random.RandomState(0),
+                block_size=block_size,
+            )
+            np.testing.assert_allclose(utils, utils_block)
+        utils_float32 = batch_bald(
+            probas,
+            batch_size=5,
+            n_MC_samples=n_estimators,
+            random_state=np.random.RandomState(0),
+            dtype=np.float32,
+        )
+        np.testing.assert_allclose(utils[:5], utils_float32, atol=1e-4)
+
+        # Memory-mapped probabilities are processed in blocks.
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "probas.npy")
+            np.save(path, probas)
+            probas_mmap = np.load(path, mmap_mode="r")
+            utils_mmap = batch_bald(
+                probas_mmap,
+                batch_size=batch_size,
+                n_MC_samples=n_estimators,
+                random_state=np.random.RandomState(0),
+                block_size=16,
+            )
+            del probas_mmap
+        np.testing.assert_allclose(utils, utils_mmap)
+
     def _test_param(
         self,
         test_func,
@@ -3,10 +3,12 @@ import unittest
 import numpy as np
 from sklearn.datasets import load_breast_cancer
 from sklearn.gaussian_process import GaussianProcessClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
 from sklearn.preprocessing import StandardScaler
 from sklearn.svm import SVC
 
-from skactiveml.classifier import ParzenWindowClassifier
+from skactiveml.classifier import ParzenWindowClassifier, SklearnClassifier
 from skactiveml.pool import DiscriminativeAL
 from skactiveml.tests.template_query_strategy import (
     TemplateSingleAnnotatorPoolQueryStrategy,
@@ -51,6 +53,33 @@ class TestDiscriminativeAL(
         ]
         self._test_param("init", "greedy_selection", test_cases)
 
+    def test_init_param_refit_interval(self):
+        test_cases = [(0, ValueError), (1.5, TypeError), (2, None)]
+        self._test_param(
+            "init",
+            "refit_interval",
+            test_cases,
+            replace_query_params={"batch_size": 3},
+        )
+
+    def test_init_param_use_partial_fit(self):
+        test_cases = [("True", TypeError), (None, TypeError)]
+        self._test_param("init", "use_partial_fit", test_cases)
+        gpc = SklearnClassifier(GaussianProcessClassifier())
+        self._test_param(
+            "init",
+            "use_partial_fit",
+            [(True, TypeError)],
+            replace_query_params={"discriminator": gpc},
+        )
+        sgd = SklearnClassifier(SGDClassifier(loss="log_loss", random_state=0))
+        self._test_param(
+            "init",
+            "use_partial_fit",
+            [(True, None)],
+            replace_query_params={"discriminator": sgd, "batch_size": 3},
+        )
+
     def test_query_param_discriminator(self):
         test_cases = [
             (0, TypeError),
@@ -116,3 +145,62 @@ class TestDiscriminativeAL(
                             utilities[i, ~is_nan],
                             utilities[i + 1, ~is_nan],
                         )
+
+    def test_query_refit_interval(self):
+        X = np.random.RandomState(0).rand(30, 2)
+        y = np.full(30, MISSING_LABEL)
+        y[:3] = [0, 1, 0]
+        discriminators = [
+            self.discriminator,
+            SklearnClassifier(SGDClassifier(loss="log_loss", random_state=0)),
+        ]
+        for discriminator, use_partial_fit in zip(discriminators, [0, 1]):
+            dal = DiscriminativeAL(random_state=0)
+            idx_ref, utilities_ref = dal.query(
+                X, y, discriminator, batch_size=7, return_utilities=True
+            )
+            dal = DiscriminativeAL(
+                refit_interval=3,
+                use_partial_fit=bool(use_partial_fit),
+                random_state=0,
+            )
+            idx, utilities = dal.query(
+                X, y, discriminator, batch_size=7, return_utilities=True
+            )
+            self.assertEqual(len(np.unique(idx)), 7)
+            self.assertEqual(idx[0], idx_ref[0])
+            np.testing.assert_array_equal(utilities[0], utilities_ref[0])
+            for i in range(1, 7):
+                # The utilities only change after every third selection.
+                is_nan = np.isnan(utilities[i])
+                np.testing.assert_equal(
+                    i % 3 == 0,
+                    np.any(utilities[i, ~is_nan] != utilities[i - 1, ~is_nan]),
+                )
+
+        # Replacing the labels of the ParzenWindowClassifier equals refitting.
+        dal = DiscriminativeAL(random_state=0)
+        idx_ref, utilities_ref = dal.query(
+            X, y, self.discriminator, batch_size=7, return_utilities=True
+        )
+        dal = DiscriminativeAL(use_partial_fit=True, random_state=0)
+        idx, utilities = dal.query(
+            X, y, self.discriminator, batch_size=7, return_utilities=True
+        )
+        np.testing.assert_array_equal(idx, idx_ref)
+        np.testing.assert_allclose(utilities, utilities_ref)
+
+        # Other discriminators keep the selected samples as unlabeled ones
+        # and additionally learn them as labeled ones.
+        gnb = SklearnClassifier(GaussianNB())
+        dal = DiscriminativeAL(use_partial_fit=True, random_state=0)
+        idx, utilities = dal.query(
+            X, y, gnb, batch_size=2, return_utilities=True
+        )
+        y_discriminator = np.append(np.isnan(y), 0).astype(int)
+        X_discriminator = np.append(X, X[idx[:1]], axis=0)
+        probas = GaussianNB().fit(X_discriminator, y_discriminator)
+        probas = probas.predict_proba(X)[:, 1]
+        probas[idx[0]] = np.nan
+        probas[~np.isnan(y)] = np.nan
+        np.testing.assert_allclose(utilities[1], probas)
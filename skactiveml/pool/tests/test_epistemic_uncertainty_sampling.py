@@ -1,7 +1,10 @@
+import os
+import tempfile
 import unittest
 from copy import deepcopy
 
 import numpy as np
+from scipy.optimize import minimize_scalar
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
@@ -10,13 +13,15 @@ from skactiveml.classifier import SklearnClassifier, ParzenWindowClassifier
 from skactiveml.pool import EpistemicUncertaintySampling
 from skactiveml.pool._epistemic_uncertainty_sampling import (
     _interpolate,
-    _pwc_ml_1,
-    _pwc_ml_0,
     _epistemic_uncertainty_pwc,
+    _pwc_epistemic_support,
+    _pwc_precompute_table,
+    _PWC_PRECOMPUTE_TABLES,
     _loglike_logreg,
     _pi_h,
     _epistemic_uncertainty_logreg,
     _theta,
+    _theta_newton,
 )
 from skactiveml.tests.template_query_strategy import (
     TemplateSingleAnnotatorPoolQueryStrategy,
@@ -62,6 +67,36 @@ class TestEpistemicUncertaintySampling(
         test_cases += [(None, TypeError), ([], TypeError), (0, TypeError)]
         self._test_param("init", "precompute", test_cases)
 
+    def test_init_param_precompute_cache_dir(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        with tempfile.TemporaryDirectory() as cache_dir:
+            test_cases += [(0, TypeError), (None, None), (cache_dir, None)]
+            self._test_param(
+                "init",
+                "precompute_cache_dir",
+                test_cases,
+                replace_init_params={"precompute": True},
+            )
+
+    def test_init_param_logreg_solver(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        test_cases += [
+            (None, TypeError),
+            ("lbfgs", TypeError),
+            ("slsqp", None),
+            ("newton", None),
+        ]
+        self._test_param(
+            "init",
+            "logreg_solver",
+            test_cases,
+            replace_query_params={
+                "clf": SklearnClassifier(
+                    LogisticRegression(), classes=self.classes
+                )
+            },
+        )
+
     def test_query_param_clf(self):
         add_test_cases = [
             (LogisticRegression(), TypeError),
@@ -96,17 +131,56 @@ class TestEpistemicUncertaintySampling(
         )
         np.testing.assert_array_equal(interpolated, np.array([0.5]))
 
-    def test_pwc_ml_1(self):
-        self.assertEqual(1.0, -_pwc_ml_1(None, 0.0, 0.0))
-        self.assertEqual(0.0, -_pwc_ml_1(1, 0.5, 0.8))
-        self.assertAlmostEqual(0.36, -_pwc_ml_1(0.9, 1, 1))
-        self.assertEqual(-0.8, -_pwc_ml_1(0.1, 1, 1))
-
-    def test_pwc_ml_0(self):
-        self.assertEqual(1.0, -_pwc_ml_0(None, 0.0, 0.0))
-        self.assertEqual(-1.0, -_pwc_ml_0(1, 0.5, 0.8))
-        self.assertAlmostEqual(0.36, -_pwc_ml_0(0.1, 1, 1))
-        self.assertEqual(-0.8, -_pwc_ml_0(0.9, 1, 1))
+    def test_pwc_precompute_table(self):
+        _PWC_PRECOMPUTE_TABLES.clear()
+        table = _pwc_precompute_table((3, 5))
+        self.assertEqual(table.shape, (3, 5))
+        self.assertEqual(list(_PWC_PRECOMPUTE_TABLES), [(4, 8)])
+        self.assertFalse(table.flags.writeable)
+        n, p = np.meshgrid(np.arange(3), np.arange(5), indexing="ij")
+        expected = np.minimum(
+            _pwc_epistemic_support(n, p), _pwc_epistemic_support(p, n)
+        )
+        np.testing.assert_array_equal(table, expected)
+
+        # Smaller tables are sliced from the memoized ones.
+        self.assertTrue(np.shares_memory(_pwc_precompute_table((2, 2)), table))
+        self.assertEqual(len(_PWC_PRECOMPUTE_TABLES), 1)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            table = _pwc_precompute_table((9, 3), cache_dir)
+            path = os.path.join(cache_dir, "epistemic_pwc_16x4.npy")
+            self.assertTrue(os.path.exists(path))
+            _PWC_PRECOMPUTE_TABLES.clear()
+            np.save(path, np.zeros((16, 4)))
+            table = _pwc_precompute_table((9, 3), cache_dir)
+            np.testing.assert_array_equal(table, np.zeros((9, 3)))
+            self.assertRaises(TypeError, _pwc_precompute_table, (33, 3), 0)
+        _PWC_PRECOMPUTE_TABLES.clear()
+
+    def test_pwc_epistemic_support(self):
+        def neg_support(theta, n, p):
+            pi_h = ((theta**p) * ((1 - theta) ** n)) / (
+                ((p / (n + p)) ** p) * ((n / (n + p)) ** n)
+            )
+            return -np.minimum(pi_h, 2 * theta - 1)
+
+        for n, p in [(0, 2), (1, 1), (0.5, 0.8), (3, 1), (2.5, 1.5)]:
+            pi1 = -minimize_scalar(
+                neg_support, method="Bounded", bounds=(0.0, 1.0), args=(n, p)
+            ).fun
+            pi0 = -minimize_scalar(
+                neg_support, method="Bounded", bounds=(0.0, 1.0), args=(p, n)
+            ).fun
+            self.assertAlmostEqual(pi1, _pwc_epistemic_support(n, p), 4)
+            self.assertAlmostEqual(pi0, _pwc_epistemic_support(p, n), 4)
+            self.assertGreaterEqual(_pwc_epistemic_support(n, p), pi1)
+
+        self.assertEqual(1.0, _pwc_epistemic_support(0.0, 0.0))
+        np.testing.assert_array_equal(
+            _pwc_epistemic_support(np.array([[0, 1]]), np.array([[0, 1]])),
+            [[1.0, _pwc_epistemic_support(1, 1)]],
+        )
 
     def test_epistemic_uncertainty_pwc(self):
         freq = np.empty((121, 2))
@@ -117,11 +191,11 @@ class TestEpistemicUncertaintySampling(
         indices = [39, 27, 18, 68, 20]
         expected = np.array(
             [
-                0.23132135217407046,
-                0.22057583593855598,
-                0.056099946963575974,
-                0.16316360415548017,
-                0.021220951860586187,
+                0.2313234361543164,
+                0.22057762376323042,
+                0.05610168086278833,
+                0.1631664116143745,
+                0.021222378769914396,
             ]
         )
 
@@ -237,6 +311,47 @@ class TestEpistemicUncertaintySampling(
         # TODO
         # np.testing.assert_array_equal(utils_expected, utils)
 
+        X = np.array([[1, 2], [5, 8], [8, 4], [5, 4], [2, 1], [7, 7]])
+        y = np.array([0, 0, 1, 1, 0, 1])
+        X_cand = np.array([[8, 1], [9, 1], [5, 1], [3, 3], [6, 6]])
+        for sample_weight in [None, np.array([0.5, 1, 2, 1, 1, 0.5])]:
+            clf = SklearnClassifier(LogisticRegression(), classes=[0, 1])
+            clf.fit(X, y, sample_weight)
+            utils_slsqp = _epistemic_uncertainty_logreg(
+                X_cand, X, y, clf, sample_weight
+            )
+            utils_newton = _epistemic_uncertainty_logreg(
+                X_cand, X, y, clf, sample_weight, solver="newton"
+            )
+            np.testing.assert_allclose(utils_slsqp, utils_newton, atol=1e-5)
+
+        clf = SklearnClassifier(LogisticRegression(), classes=[0, 1])
+        clf.fit(X[:0], y[:0])
+        for solver in ["slsqp", "newton"]:
+            with self.assertWarns(Warning):
+                utils = _epistemic_uncertainty_logreg(
+                    X_cand, X[:0], y[:0], clf, solver=solver
+                )
+            np.testing.assert_allclose(utils, np.full(len(X_cand), 0.98))
+
+    def test_theta_newton(self):
+        X = np.array([[1, 2], [5, 8], [8, 4], [5, 4]])
+        y = np.array([-1, -1, 1, 1])
+        A = np.array([[8, 1, 1], [9, 1, 1], [5, 1, 1]])
+        bounds = np.array([-1.0, 0.5, 2.0])
+        w0 = np.zeros(3)
+        thetas = _theta_newton(A, bounds, w0, X, y, gamma=0.5)
+        self.assertEqual(thetas.shape, (3, 3))
+        np.testing.assert_allclose(np.sum(A * thetas, axis=1), bounds)
+        for a, b, theta in zip(A, bounds, thetas):
+            theta_slsqp = _theta(
+                _loglike_logreg, 1 / (1 + np.exp(-b)), w0, a, (X, y, None, 0.5)
+            )
+            self.assertLessEqual(
+                _loglike_logreg(theta, X, y, gamma=0.5),
+                _loglike_logreg(theta_slsqp, X, y, gamma=0.5) + 1e-6,
+            )
+
     def test_query(self):
         query_params = deepcopy(self.query_default_params_clf)
         query_params["return_utilities"] = True
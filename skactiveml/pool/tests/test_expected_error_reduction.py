@@ -1,8 +1,13 @@
+import os
+import tempfile
 import unittest
 from copy import deepcopy
+from itertools import product
+from unittest.mock import patch
 
 import numpy as np
 from sklearn.gaussian_process import GaussianProcessClassifier
+from sklearn.metrics.pairwise import pairwise_kernels
 from sklearn.naive_bayes import GaussianNB
 from sklearn.svm import SVC
 
@@ -117,6 +122,85 @@ class TemplateTestExpectedErrorReduction(
         test_cases = [(2, TypeError), ("string", TypeError)]
         self._test_param("init", "subtract_current", test_cases)
 
+    def test_init_param_batch_simulation(self):
+        test_cases = [(2, TypeError), ("string", TypeError), (False, None)]
+        self._test_param("init", "batch_simulation", test_cases)
+
+        # check if batched and sequential simulation yield equal utilities
+        X = np.linspace(0, 1, 40).reshape(20, 2)
+        y = np.hstack([[0, 1, 2, 0], np.full(16, MISSING_LABEL)])
+        sample_weight = np.linspace(0.5, 1.5, 20)
+        clfs = [
+            ParzenWindowClassifier(classes=self.classes, class_prior=0.1),
+            SklearnClassifier(GaussianNB(), classes=self.classes),
+        ]
+        for clf, candidates in product(clfs, [None, np.arange(2, 10)]):
+            with self.subTest(clf=clf, candidates=candidates):
+                utilities = []
+                for batch_simulation in [True, False]:
+                    init_params = deepcopy(self.init_default_params)
+                    init_params["batch_simulation"] = batch_simulation
+                    qs = self.qs_class(**init_params)
+                    _, utils = qs.query(
+                        X,
+                        y,
+                        clf,
+                        sample_weight=sample_weight,
+                        candidates=candidates,
+                        return_utilities=True,
+                    )
+                    utilities.append(utils)
+                np.testing.assert_allclose(utilities[0], utilities[1])
+
+    def test_init_param_kernel_tile_size(self):
+        test_cases = [("string", TypeError), (1.5, TypeError)]
+        test_cases += [(0, ValueError), (2, None)]
+        self._test_param("init", "kernel_tile_size", test_cases)
+
+    def test_init_param_kernel_max_memory(self):
+        test_cases = [("string", TypeError), (0, ValueError), (1e-5, None)]
+        test_cases += [(None, None)]
+        self._test_param("init", "kernel_max_memory", test_cases)
+
+        # check if the tiling of the kernel does not change the utilities
+        utilities = []
+        for tile_size, max_memory in [(1024, None), (2, 1e-5)]:
+            init_params = deepcopy(self.init_default_params)
+            init_params["kernel_tile_size"] = tile_size
+            init_params["kernel_max_memory"] = max_memory
+            qs = self.qs_class(**init_params)
+            _, utils = qs.query(
+                **self.query_default_params_clf, return_utilities=True
+            )
+            utilities.append(utils)
+        np.testing.assert_allclose(utilities[0], utilities[1])
+
+    def test_init_param_kernel_cache_dir(self):
+        test_cases = [(1, TypeError), (["dir"], TypeError)]
+        self._test_param("init", "kernel_cache_dir", test_cases)
+
+        # check if a second query reuses the stored kernel tiles
+        with tempfile.TemporaryDirectory() as cache_dir:
+            init_params = deepcopy(self.init_default_params)
+            init_params["kernel_cache_dir"] = cache_dir
+            qs = self.qs_class(**init_params)
+            utilities = []
+            for i in range(2):
+                with patch(
+                    "skactiveml.pool.utils.pairwise_kernels",
+                    wraps=pairwise_kernels,
+                ) as kernel_mock:
+                    _, utils = qs.query(
+                        **self.query_default_params_clf, return_utilities=True
+                    )
+                utilities.append(utils)
+                if i == 0:
+                    self.assertGreater(kernel_mock.call_count, 0)
+                    self.assertEqual(len(os.listdir(cache_dir)), 1)
+                else:
+                    kernel_mock.assert_not_called()
+            np.testing.assert_array_equal(utilities[0], utilities[1])
+
     def test_query_param_ignore_partial_fit(self):
         test_cases = [(2, TypeError), ("string", TypeError)]
         self._test_param("query", "ignore_partial_fit", test_cases)
@@ -153,6 +237,21 @@ class TestExpectedErrorReduction(unittest.TestCase):
             None,
         )
 
+    def test__estimate_errors_for_candidates(self):
+        qs = ExpectedErrorReduction(enforce_mapping=False)
+        self.assertRaises(
+            NotImplementedError,
+            qs._estimate_errors_for_candidates,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+
     def test__concatenate_samples(self):
         X = np.array([[1], [2], [3], [4]])
         y = np.array([0, 1, MISSING_LABEL, MISSING_LABEL])
@@ -728,7 +827,7 @@ class TestValueOfInformationEER(
                 True,
                 True,
                 False,
-                np.full(shape=(1, len(cand)), fill_value=0.5)
+                np.full(shape=(1, len(cand)), fill_value=0.5),
                 # TODO Normalize each term individually
             ],
             [
@@ -738,7 +837,7 @@ class TestValueOfInformationEER(
                 True,
                 True,
                 True,
-                np.full(shape=(1, len(cand)), fill_value=0)
+                np.full(shape=(1, len(cand)), fill_value=0),
                 # TODO Normalize each term individually
             ],
             [
@@ -14,6 +14,7 @@ from skactiveml.tests.template_query_strategy import (
     TemplateSingleAnnotatorPoolQueryStrategy,
 )
 from skactiveml.utils import is_unlabeled, call_func, MISSING_LABEL
+from sklearn import clone
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.linear_model import LinearRegression
 
@@ -67,6 +68,14 @@ class TestExpectedModelChangeMaximization(
         ]
         self._test_param("init", "ord", test_cases)
 
+    def test_init_param_n_jobs(self):
+        test_cases = [(0, ValueError), (1.5, TypeError), (2, None)]
+        self._test_param("init", "n_jobs", test_cases)
+
+    def test_init_param_warm_start(self):
+        test_cases = [("True", TypeError), (None, TypeError), (True, None)]
+        self._test_param("init", "warm_start", test_cases)
+
     def test_query_param_reg(self):
         test_cases = [
             (NICKernelRegressor(), None),
@@ -93,3 +102,53 @@ class TestExpectedModelChangeMaximization(
             np.zeros_like(query_dict["y"]),
             np.where(is_unlabeled(utilities), 0, utilities),
         )
+
+    def test_query_n_jobs(self):
+        query_dict = deepcopy(self.query_default_params_reg)
+        query_dict["return_utilities"] = True
+        for warm_start in [False, True]:
+            qs = self.qs_class(random_state=0, warm_start=warm_start)
+            utilities = qs.query(**query_dict)[1]
+            qs = self.qs_class(random_state=0, warm_start=warm_start, n_jobs=2)
+            np.testing.assert_allclose(utilities, qs.query(**query_dict)[1])
+
+    def test_query_warm_start(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(30, 2)
+        y_true = X[:, 0] + X[:, 1] ** 2
+        y = np.full(30, MISSING_LABEL)
+        y[:10] = y_true[:10]
+        for reg in [
+            NICKernelRegressor(),
+            SklearnRegressor(LinearRegression()),
+        ]:
+            qs = self.qs_class(
+                bootstrap_size=5, warm_start=True, random_state=0
+            )
+            qs.query(X, y, reg)
+            learners = qs._bootstrap["learners"]
+            self.assertEqual(len(learners), 5)
+
+            # Newly labeled samples only update the bootstrap estimators.
+            y[10:15] = y_true[10:15]
+            idx, utilities = qs.query(X, y, reg, return_utilities=True)
+            self.assertTrue(np.isfinite(utilities[0, 15:]).all())
+            n_samples = [len(t[0]) for t in qs._bootstrap["training_sets"]]
+            for b, learner in enumerate(qs._bootstrap["learners"]):
+                if hasattr(reg, "partial_fit"):
+                    self.assertIs(learner, learners[b])
+                    self.assertEqual(len(learner.X_), n_samples[b])
+                elif learner is not learners[b]:
+                    np.testing.assert_allclose(
+                        learner.predict(X),
+                        clone(reg)
+                        .fit(*qs._bootstrap["training_sets"][b][:2])
+                        .predict(X),
+                    )
+
+            # Changed labels lead to new bootstraps.
+            y[:5] = MISSING_LABEL
+            qs.query(X, y, reg)
+            for b, learner in enumerate(qs._bootstrap["learners"]):
+                self.assertIsNot(learner, learners[b])
+            y[:5] = y_true[:5]
@@ -37,6 +37,8 @@ class TestExpectedModelVarianceMinimization(
         test_cases = [
             ({"method": "assume_linear"}, None),
             ({"method": "monte_carlo"}, None),
+            ({"method": "two_point"}, None),
+            ({"method": "analytic"}, ValueError),
             ({}, None),
             ({"method": "illegal"}, TypeError),
             ("illegal", TypeError),
@@ -78,3 +80,12 @@ class TestExpectedModelVarianceMinimization(
             np.zeros_like(query_dict["y"]),
             np.where(is_unlabeled(utilities), 0, utilities),
         )
+
+        # Expected variance of NICKernelRegressor is quadratic in the target.
+        query_dict = deepcopy(self.query_default_params_reg)
+        query_dict["return_utilities"] = True
+        utilities = []
+        for method in ["two_point", "dynamic_quad"]:
+            qs = self.qs_class(integration_dict={"method": method})
+            utilities.append(call_func(qs.query, **query_dict)[1][0])
+        np.testing.assert_allclose(*utilities)
@@ -4,6 +4,7 @@ import numpy as np
 
 from skactiveml.base import SkactivemlRegressor
 from skactiveml.pool import GreedySamplingX, GreedySamplingTarget
+from skactiveml.pool._greedy_sampling import _greedy_sampling
 from skactiveml.regressor import NICKernelRegressor, SklearnRegressor
 from skactiveml.tests.template_query_strategy import (
     TemplateSingleAnnotatorPoolQueryStrategy,
@@ -49,6 +50,49 @@ class TestGreedySamplingX(
         ]
         self._test_param("init", "metric_dict", test_cases)
 
+    def test_init_param_neighbor_algorithm(self):
+        test_cases = [
+            (np.nan, TypeError),
+            ("illegal", TypeError),
+            ("brute", None),
+            ("kd_tree", None),
+            ("ball_tree", None),
+            ("random_projection", None),
+        ]
+        self._test_param("init", "neighbor_algorithm", test_cases)
+
+    def test_query_neighbor_algorithm(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(50, 3)
+        y = np.full(50, MISSING_LABEL)
+        y[:5] = 1
+        _, expected = GreedySamplingX().query(
+            X, y, batch_size=3, return_utilities=True
+        )
+        for algorithm in ["kd_tree", "ball_tree", "random_projection"]:
+            qs = GreedySamplingX(neighbor_algorithm=algorithm)
+            _, utilities = qs.query(X, y, batch_size=3, return_utilities=True)
+            np.testing.assert_allclose(expected, utilities)
+
+            # The index is reused and extended by newly labeled samples.
+            neighbor_index = qs._neighbor_index
+            y[5:8] = 1
+            _, utilities = qs.query(X, y, batch_size=3, return_utilities=True)
+            self.assertIs(neighbor_index, qs._neighbor_index)
+            self.assertEqual(len(neighbor_index.X_), 8)
+            _, expected_new = GreedySamplingX().query(
+                X, y, batch_size=3, return_utilities=True
+            )
+            np.testing.assert_allclose(expected_new, utilities)
+            y[5:8] = MISSING_LABEL
+
+            qs.metric = "manhattan"
+            if algorithm == "random_projection":
+                self.assertRaises(ValueError, qs.query, X, y)
+            else:
+                qs.query(X, y)
+                self.assertIsNot(neighbor_index, qs._neighbor_index)
+
     def test_query(self):
         X = np.arange(7).reshape(7, 1)
         y = np.append([1], np.full(6, MISSING_LABEL))
@@ -59,6 +103,48 @@ class TestGreedySamplingX(
             utilities, np.append([MISSING_LABEL], np.arange(1, 7))
         )
 
+    def test_greedy_sampling_chunk_size(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(20, 2)
+        y = random_state.rand(20)
+        candidate_indices = np.arange(5, 20)
+        sample_indices = np.arange(20)
+        for selected_indices in [np.array([], dtype=int), np.arange(3)]:
+            for method in ["x", "xy"]:
+                # Reference with the full distance matrix.
+                distances = np.linalg.norm(
+                    X[candidate_indices, None] - X[None], axis=-1
+                )
+                if method == "xy":
+                    distances *= np.abs(y[candidate_indices, None] - y[None])
+                selected = list(selected_indices)
+                is_selected = np.zeros(len(candidate_indices), dtype=bool)
+                expected = np.full((4, len(candidate_indices)), np.nan)
+                for i in range(4):
+                    if len(selected) == 0:
+                        util = -distances.sum(axis=1)
+                    else:
+                        util = distances[:, selected].min(axis=1)
+                    expected[i, ~is_selected] = util[~is_selected]
+                    util[is_selected] = -np.inf
+                    is_selected[np.argmax(util)] = True
+                    selected.append(candidate_indices[np.argmax(util)])
+
+                for chunk_size in [1, 7, 2**20]:
+                    _, utilities = _greedy_sampling(
+                        X_cand=X[candidate_indices],
+                        y_cand=y[candidate_indices],
+                        X=X,
+                        y=y,
+                        sample_indices=sample_indices,
+                        selected_indices=selected_indices,
+                        candidate_indices=candidate_indices,
+                        batch_size=4,
+                        method=method,
+                        chunk_size=chunk_size,
+                    )
+                    np.testing.assert_allclose(expected, utilities)
+
 
 class TestGreedySamplingTarget(
     TemplateSingleAnnotatorPoolQueryStrategy, unittest.TestCase
@@ -121,6 +207,34 @@ class TestGreedySamplingTarget(
         ]
         self._test_param("init", "method", test_cases)
 
+    def test_init_param_neighbor_algorithm(self):
+        test_cases = [
+            (np.nan, TypeError),
+            ("illegal", TypeError),
+            ("brute", None),
+            ("kd_tree", None),
+            ("ball_tree", None),
+        ]
+        self._test_param("init", "neighbor_algorithm", test_cases)
+
+    def test_query_neighbor_algorithm(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(50, 3)
+        y = np.full(50, MISSING_LABEL)
+        y[:5] = random_state.rand(5)
+        reg = NICKernelRegressor()
+        for method in ["GSy", "GSi"]:
+            _, expected = GreedySamplingTarget(method=method).query(
+                X, y, reg, batch_size=3, return_utilities=True
+            )
+            qs = GreedySamplingTarget(
+                method=method, neighbor_algorithm="kd_tree"
+            )
+            _, utilities = qs.query(
+                X, y, reg, batch_size=3, return_utilities=True
+            )
+            np.testing.assert_allclose(expected, utilities)
+
     def test_init_param_n_GSx_samples(self):
         test_cases = [
             (np.nan, TypeError),
@@ -36,6 +36,8 @@ class TestKLDivergenceMaximization(
         test_cases = [
             ({"method": "assume_linear"}, None),
             ({"method": "monte_carlo"}, None),
+            ({"method": "two_point"}, None),
+            ({"method": "analytic"}, ValueError),
             ({}, None),
             ({"method": "illegal"}, TypeError),
             ("illegal", TypeError),
@@ -46,6 +48,8 @@ class TestKLDivergenceMaximization(
         test_cases = [
             ({"method": "assume_linear"}, None),
             ({"method": "monte_carlo"}, None),
+            ({"method": "two_point"}, None),
+            ({"method": "analytic"}, ValueError),
             ({}, None),
             ({"method": "illegal"}, TypeError),
             ("illegal", TypeError),
@@ -79,6 +83,18 @@ class TestKLDivergenceMaximization(
             np.where(is_unlabeled(utilities), 0, utilities),
         )
 
+        # Closed form of the cross entropy for normal distributions.
+        query_dict = deepcopy(self.query_default_params_reg)
+        query_dict["reg"] = SklearnNormalRegressor(GaussianProcessRegressor())
+        query_dict["return_utilities"] = True
+        utilities = []
+        for method in ["analytic", "gauss_hermite"]:
+            qs = self.qs_class(
+                integration_dict_cross_entropy={"method": method}
+            )
+            utilities.append(call_func(qs.query, **query_dict)[1][0])
+        np.testing.assert_allclose(*utilities)
+
         qs = self.qs_class(**self.init_default_params)
         query_dict = deepcopy(self.query_default_params_reg)
         query_dict["X"] = np.arange(5).reshape(5, 1)
@@ -1,11 +1,14 @@
+import itertools
 import unittest
+from unittest.mock import patch
 
 import numpy as np
+from scipy.special import gammaln
 from sklearn.gaussian_process import GaussianProcessClassifier
 from sklearn.naive_bayes import GaussianNB
 
 from skactiveml.classifier import ParzenWindowClassifier, SklearnClassifier
-from skactiveml.pool import ProbabilisticAL
+from skactiveml.pool import ProbabilisticAL, cost_reduction
 from skactiveml.tests.template_query_strategy import (
     TemplateSingleAnnotatorPoolQueryStrategy,
 )
@@ -169,3 +172,51 @@ class TestProbabilisticAL(
             X=[[0], [2]], y=[0, 1], clf=clf, candidates=[[0], [1], [2]]
         )
         np.testing.assert_array_equal(best_indices, [1])
+
+
+class TestCostReduction(unittest.TestCase):
+    def test_cost_reduction(self):
+        random_state = np.random.RandomState(0)
+        for n_classes, m_max in [(2, 1), (3, 2), (4, 3)]:
+            k_vec_list = random_state.rand(7, n_classes)
+            k_vec_list *= random_state.choice([0, 1, 10], size=(7, 1))
+            C = random_state.rand(n_classes, n_classes)
+            np.fill_diagonal(C, 0)
+            for C_, prior in [(None, 1.0e-3), (C, 1)]:
+                C_ref = 1 - np.eye(n_classes) if C_ is None else C_
+                gains_ref = [
+                    _cost_reduction_ref(k_vec, C_ref, m_max, prior)
+                    for k_vec in k_vec_list
+                ]
+                gains = cost_reduction(k_vec_list, C_, m_max, prior)
+                np.testing.assert_allclose(gains, gains_ref, atol=1e-12)
+
+                # Processing the samples in blocks yields the same results.
+                with patch(
+                    "skactiveml.pool._probabilistic_al._BLOCK_ELEMENTS", 1
+                ):
+                    gains_block = cost_reduction(k_vec_list, C_, m_max, prior)
+                np.testing.assert_allclose(gains, gains_block, atol=1e-12)
+
+
+def _cost_reduction_ref(k_vec, C, m_max, prior):
+    # Enumerate all labelings explicitly.
+    k_prior = k_vec + prior
+    costs = np.zeros(m_max + 1)
+    for l_vec in itertools.product(range(m_max + 1), repeat=len(k_vec)):
+        l_vec = np.array(l_vec)
+        m = l_vec.sum()
+        if m > m_max:
+            continue
+        log_mult = gammaln(m + 1) - np.sum(gammaln(l_vec + 1))
+        proba = np.exp(
+            log_mult + _log_beta(k_prior + l_vec) - _log_beta(k_prior)
+        )
+        y_hat = np.argmin((k_vec + l_vec) @ C)
+        posterior = (k_prior + l_vec) / np.sum(k_prior + l_vec)
+        costs[m] += proba * (C[:, y_hat] @ posterior)
+    return np.max((costs[0] - costs[1:]) / np.arange(1, m_max + 1))
+
+
+def _log_beta(a):
+    return np.sum(gammaln(a)) - gammaln(np.sum(a))
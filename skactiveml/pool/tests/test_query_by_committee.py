@@ -1,7 +1,10 @@
+import os
 import numpy as np
 import unittest
 
 from copy import deepcopy
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from sklearn import clone
 from sklearn.ensemble import (
@@ -65,6 +68,92 @@ class TestQueryByCommittee(
         test_cases += [(1, TypeError), ("string", TypeError)]
         self._test_param("init", "method", test_cases)
 
+    def test_init_param_chunk_size(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        test_cases += [(0, ValueError), (1.5, TypeError), (1, None)]
+        self._test_param("init", "chunk_size", test_cases)
+
+    def test_init_param_n_jobs(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        test_cases += [(0, ValueError), (1.5, TypeError), (2, None)]
+        self._test_param("init", "n_jobs", test_cases)
+
+    def test_init_param_cache_predictions(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        test_cases += [("True", TypeError), (None, TypeError), (True, None)]
+        self._test_param("init", "cache_predictions", test_cases)
+
+    def test_query_param_probas(self, test_cases=None):
+        test_cases = [] if test_cases is None else test_cases
+        test_cases += [
+            ("string", ValueError),
+            (np.full((3, 2), 0.5), ValueError),
+            (np.full((3, 3, 2), 0.5), ValueError),
+            (np.full((3, 2, 3), 1 / 3), ValueError),
+            (np.full((3, 2, 2), 0.5), None),
+        ]
+        X, y = (
+            self.query_default_params_clf["X"],
+            self.query_default_params_clf["y"],
+        )
+        ensemble = clone(self.ensemble_clf).fit(X, y)
+        self._test_param(
+            "query",
+            "probas",
+            test_cases,
+            replace_query_params={"ensemble": ensemble},
+            exclude_reg=True,
+        )
+        test_cases = [(np.full((3, 2, 2), 0.5), ValueError)]
+        self._test_param(
+            "query",
+            "probas",
+            test_cases,
+            replace_query_params={
+                "ensemble": clone(self.ensemble_reg).fit(X, y)
+            },
+            exclude_clf=True,
+        )
+
+        # The ensemble is not fitted if probabilities are given.
+        query_params = deepcopy(self.query_default_params_clf)
+        probas = np.full((3, 2, 2), 0.5)
+        self.assertRaises(
+            NotFittedError,
+            QueryByCommittee().query,
+            **query_params,
+            probas=probas
+        )
+        for ens in [ensemble, [ensemble, ensemble]]:
+            query_params["ensemble"] = ens
+            with patch.object(SklearnClassifier, "fit") as fit:
+                QueryByCommittee().query(**query_params, probas=probas)
+                fit.assert_not_called()
+
+        # Precomputed and memory-mapped probabilities yield the same
+        # utilities as the ensemble members' predictions.
+        query_params = deepcopy(self.query_default_params_clf)
+        query_params["return_utilities"] = True
+        X_cand = query_params["X"][2:]
+        probas = np.array(
+            [est.predict_proba(X_cand) for est in ensemble.estimators_]
+        )
+        with TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "probas.npy")
+            np.save(path, probas)
+            probas_mmap = np.load(path, mmap_mode="r")
+            for method in ["KL_divergence", "vote_entropy"]:
+                for chunk_size in [None, 1]:
+                    qs = QueryByCommittee(method=method, chunk_size=chunk_size)
+                    _, u = qs.query(**query_params)
+                    query_params["ensemble"] = ensemble
+                    _, u_probas = qs.query(**query_params, probas=probas)
+                    np.testing.assert_allclose(u, u_probas)
+                    _, u_mmap = qs.query(**query_params, probas=probas_mmap)
+                    query_params["ensemble"] = self.ensemble_clf
+                    np.testing.assert_allclose(u, u_mmap)
+            del probas_mmap
+
     def test_query_param_ensemble(self, test_cases=None):
         estimators = [
             ("pwc1", ParzenWindowClassifier()),
@@ -182,7 +271,7 @@ class TestQueryByCommittee(
         ensemble_classifiers = [member[1] for member in voting_classifiers]
         gpc = ParzenWindowClassifier(classes=self.classes)
         ensemble_bagging = SklearnClassifier(
-            estimator=BaggingClassifier(estimator=gpc),
+            estimator=BaggingClassifier(estimator=gpc, random_state=0),
             classes=self.classes,
         )
         ensemble_voting = SklearnClassifier(
@@ -211,6 +300,56 @@ class TestQueryByCommittee(
                 idx, u = qs.query(**query_params)
                 self.assertEqual(len(idx), 1)
                 self.assertEqual(len(u), 1)
+                qs = QueryByCommittee(method=method, chunk_size=1)
+                _, u_chunk = qs.query(**query_params)
+                np.testing.assert_allclose(u, u_chunk)
+                qs = QueryByCommittee(method=method, n_jobs=2)
+                _, u_parallel = qs.query(**query_params)
+                np.testing.assert_allclose(u, u_parallel)
+
+    def test_query_cache_predictions(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.rand(20, 2)
+        y = np.full(20, MISSING_LABEL)
+        y[:4] = [0, 1, 0, 1]
+        y_new = y.copy()
+        y_new[4] = 0
+        predict_proba = ParzenWindowClassifier.predict_proba
+        for method in ["KL_divergence", "vote_entropy"]:
+            ensemble = [
+                ParzenWindowClassifier(
+                    classes=self.classes, metric_dict={"gamma": g}
+                ).fit(X, y)
+                for g in [1, 2, 3]
+            ]
+            qs = QueryByCommittee(method=method, cache_predictions=True)
+            qs_ref = QueryByCommittee(method=method)
+            for y_query, candidates, refit, n_calls in [
+                (y, None, False, 3),
+                (y, None, False, 0),
+                (y_new, None, True, 1),
+                (y, np.arange(3, 20), False, 3),
+            ]:
+                if refit:
+                    ensemble[0] = clone(ensemble[0]).fit(X, y_query)
+                query_params = {
+                    "X": X,
+                    "y": y_query,
+                    "ensemble": ensemble,
+                    "fit_ensemble": False,
+                    "candidates": candidates,
+                    "return_utilities": True,
+                }
+                with patch.object(
+                    ParzenWindowClassifier,
+                    "predict_proba",
+                    autospec=True,
+                    side_effect=predict_proba,
+                ) as mock:
+                    _, u = qs.query(**query_params)
+                    self.assertEqual(mock.call_count, n_calls)
+                _, u_ref = qs_ref.query(**query_params)
+                np.testing.assert_allclose(u, u_ref)
 
 
 class TestAverageKlDivergence(unittest.TestCase):
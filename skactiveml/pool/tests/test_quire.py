@@ -4,9 +4,8 @@ import numpy as np
 from sklearn.metrics import pairwise_kernels
 
 from skactiveml.pool._quire import (
-    _del_i_inv,
-    _L_aa_inv,
     _one_versus_rest_transform,
+    _QuireCholeskyEngine,
     Quire,
 )
 from skactiveml.tests.template_query_strategy import (
@@ -106,31 +105,78 @@ class TestQuire(TemplateSingleAnnotatorPoolQueryStrategy, unittest.TestCase):
         qs = Quire(self.classes)
         _, utils = qs.query(**self.kwargs, return_utilities=True)
 
-    def test__del_i_inv(self):
-        self.assertWarns(Warning, _del_i_inv, np.tri(5), 2)
+    def test_query_dense_reference(self):
+        random_state = np.random.RandomState(0)
+        X = random_state.randn(30, 2)
+        y = random_state.randint(0, 3, 30).astype(float)
+        y[random_state.rand(30) < 0.6] = MISSING_LABEL
+        lmbda = 0.5
+        is_lbld = is_labeled(y)
+        is_unlbld = is_unlabeled(y)
 
-        A = np.random.random((3, 3))
-        A = A + A.T
-        A_inv = np.linalg.inv(A)
-        for i in range(len(A)):
-            B = np.delete(np.delete(A, i, axis=0), i, axis=1)
-            B_inv = np.linalg.inv(B)
-            np.testing.assert_allclose(B_inv, _del_i_inv(A_inv, i))
-
-    def test__L_aa_inv(self):
-        lmbda = 1
-        X = np.append(self.X, self.X_cand, axis=0)
-        y = np.append(self.y_true, np.full(len(self.X_cand), MISSING_LABEL))
-        is_lbld = is_labeled(y=y, missing_label=MISSING_LABEL)
-        is_unlbld = is_unlabeled(y=y, missing_label=MISSING_LABEL)
+        # Dense reference computation via the inverse kernel matrix.
         K = pairwise_kernels(X, X, metric="rbf")
-        # compute L and L_aa
         L = np.linalg.inv(K + lmbda * np.eye(len(X)))
-        L_aa = L[is_unlbld][:, is_unlbld]
-        L_aa_inv = np.linalg.inv(L_aa)
-        np.testing.assert_allclose(
-            L_aa_inv, _L_aa_inv(K, lmbda, is_unlbld, is_lbld)
+        y_ovr = _one_versus_rest_transform(y[is_lbld], [0, 1, 2])
+        expected = np.full(len(X), np.nan)
+        for s in np.flatnonzero(is_unlbld):
+            is_u = is_unlbld.copy()
+            is_u[s] = False
+            L_uu_inv = np.linalg.inv(L[is_u][:, is_u])
+            expected[s] = -L[s, s] - np.max(
+                [
+                    yl.dot(L[is_lbld][:, is_lbld]).dot(yl)
+                    + 2 * L[s, is_lbld].dot(yl)
+                    - (L[is_u][:, is_lbld].dot(yl) + L[is_u, s])
+                    .dot(L_uu_inv)
+                    .dot(L[is_u][:, is_lbld].dot(yl) + L[is_u, s])
+                    for yl in y_ovr.T
+                ]
+            )
+
+        qs = Quire([0, 1, 2], lmbda=lmbda)
+        _, utils = qs.query(X, y, return_utilities=True)
+        np.testing.assert_allclose(expected, utils[0])
+
+        # A subset of candidates refers to the same utilities.
+        candidates = np.flatnonzero(is_unlbld)[::2]
+        _, utils = qs.query(X, y, candidates=candidates, return_utilities=True)
+        np.testing.assert_allclose(expected[candidates], utils[0, candidates])
+
+        # Adding labels extends the Cholesky factor of the previous query.
+        engine = qs._engine
+        y_new = y.copy()
+        y_new[candidates[:3]] = 1
+        _, utils = qs.query(X, y_new, return_utilities=True)
+        self.assertIs(engine, qs._engine)
+        _, utils_new = Quire([0, 1, 2], lmbda=lmbda).query(
+            X, y_new, return_utilities=True
         )
+        np.testing.assert_allclose(utils_new, utils)
+
+        # Removing labels or changing the data recomputes the factor.
+        _, utils = qs.query(X, y, return_utilities=True)
+        np.testing.assert_allclose(expected, utils[0])
+        qs.query(X + 1, y)
+        self.assertIsNot(engine, qs._engine)
+
+    def test__quire_cholesky_engine(self):
+        X = np.append(self.X, self.X_cand, axis=0)
+        lmbda = 2
+        K = pairwise_kernels(X, X, metric="rbf")
+        engine = _QuireCholeskyEngine(X, lmbda, "rbf", {})
+        engine_k = _QuireCholeskyEngine(K, lmbda, "precomputed", {})
+        np.testing.assert_allclose(engine.K_diag, np.ones(len(X)))
+        for idx_l in [[0, 2], [0, 2, 5], [2, 3]]:
+            idx_l = engine.update(np.array(idx_l))
+            np.testing.assert_array_equal(idx_l, engine_k.update(idx_l))
+            P_ll = K[idx_l][:, idx_l] + lmbda * np.eye(len(idx_l))
+            np.testing.assert_allclose(engine.C.dot(engine.C.T), P_ll)
+            np.testing.assert_allclose(engine.C, engine_k.C)
+        self.assertTrue(engine.is_compatible(X, lmbda, "rbf", {}))
+        self.assertFalse(engine.is_compatible(X, 1, "rbf", {}))
+        self.assertFalse(engine.is_compatible(X, lmbda, "linear", {}))
+        self.assertFalse(engine.is_compatible(X[:-1], lmbda, "rbf", {}))
 
     def test__one_versus_rest_transform(self):
         y = np.array([0, 1, 2, 1, 2, 0])
@@ -229,6 +229,34 @@ class TestExpectedAveragePrecision(unittest.TestCase):
         self.assertTrue(scores.shape == (len(self.probas),))
         np.testing.assert_array_equal(scores, self.scores_val)
 
+        # Compare to the direct evaluation of the g- and f-tables.
+        random_state = np.random.RandomState(0)
+        probas = random_state.dirichlet(np.ones(3), size=13)
+        probas[1] = probas[0]
+        probas[-1] = [1.0, 0.0, 0.0]
+        scores = expected_average_precision(classes=[0, 1, 2], probas=probas)
+        scores_ref = np.zeros(len(probas))
+        for i in range(probas.shape[1]):
+            for j in range(len(probas)):
+                p = np.flipud(np.sort(np.delete(probas[:, i], [j])))
+                n_p = len(p)
+                g_arr = np.zeros((n_p + 1, n_p + 1))
+                f_arr = np.zeros((n_p + 1, n_p + 1))
+                g_arr[0, 0] = f_arr[0, 0] = 1
+                for n in range(1, n_p + 1):
+                    for t in range(1, n + 1):
+                        g_arr[n, t] = (
+                            p[n - 1] * g_arr[n - 1, t - 1]
+                            + (1 - p[n - 1]) * g_arr[n - 1, t]
+                        )
+                        f_arr[n, t] = (
+                            p[n - 1] * f_arr[n - 1, t - 1]
+                            + p[n - 1] * t * g_arr[n - 1, t - 1] / n
+                            + (1 - p[n - 1]) * f_arr[n - 1, t]
+                        )
+                scores_ref[j] += np.sum(f_arr[n_p, 1:] / np.arange(1, n_p + 1))
+        np.testing.assert_allclose(scores, scores_ref, rtol=1e-10)
+
 
 class TestUncertaintyScores(unittest.TestCase):
     def setUp(self):
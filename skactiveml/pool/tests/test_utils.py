@@ -1,8 +1,14 @@
 import itertools
+import os
+import tempfile
 import unittest
+from copy import deepcopy
+from functools import partial
 from itertools import product
+from unittest.mock import patch
 
 import numpy as np
+from joblib import parallel_backend
 from scipy.stats import norm
 from sklearn.exceptions import NotFittedError
 from sklearn.gaussian_process import GaussianProcessRegressor
@@ -15,10 +21,13 @@ from skactiveml.classifier import ParzenWindowClassifier, SklearnClassifier
 from skactiveml.pool.utils import _cross_entropy
 from skactiveml.pool.utils import (
     IndexClassifierWrapper,
+    expected_target_val,
     _conditional_expect,
+    _copy_clf,
     _reshape_scipy_dist,
     _update_X_y,
     _update_reg,
+    _cache_reg,
 )
 from skactiveml.pool._expected_model_change_maximization import (
     _bootstrap_estimators,
@@ -36,6 +45,14 @@ from skactiveml.utils import (
 )
 
 
+def _linear_kernel(a, b):
+    return a @ b
+
+
+def _polynomial_kernel(a, b, degree=3):
+    return (a @ b + 1) ** degree
+
+
 class TestIndexClassifierWrapper(unittest.TestCase):
     def setUp(self):
         self.X = np.linspace(0, 1, 4).reshape(-1, 1)
@@ -167,6 +184,190 @@ class TestIndexClassifierWrapper(unittest.TestCase):
         self.assertWarns(Warning, iclf.predict_proba, [0])
         self.assertWarns(Warning, iclf.predict_freq, [0])
 
+    def test_init_param_kernel_tile_size(self):
+        self.assertEqual(self.iclf().kernel_tile_size, 1024)
+        for tile_size in ["string", 0, 1.5]:
+            self.assertRaises(
+                (ValueError, TypeError),
+                self.iclf,
+                use_speed_up=True,
+                kernel_tile_size=tile_size,
+            )
+
+        all_idx = np.arange(len(self.X))
+        P_ref = self.clf.fit(self.X, self.y).predict_proba(self.X)
+        for tile_size in [1, 3, 4]:
+            with self.subTest(tile_size=tile_size):
+                iclf = self.iclf(use_speed_up=True, kernel_tile_size=tile_size)
+                iclf.precompute(all_idx, all_idx)
+                self.assertEqual(iclf.pwc_K_.cache_info()["misses"], 0)
+                iclf.fit(all_idx)
+                np.testing.assert_allclose(
+                    iclf.predict_proba(all_idx[::-1]), P_ref[::-1]
+                )
+                n_tiles = int(np.ceil(len(self.X) / tile_size)) ** 2
+                self.assertEqual(iclf.pwc_K_.cache_info()["n_tiles"], n_tiles)
+
+        iclf = self.iclf(use_speed_up=True, kernel_tile_size=3)
+        iclf.precompute([0], [1, 3])
+        K = iclf.pwc_K_.toarray()
+        self.assertEqual(np.sum(~np.isnan(K)), 2)
+
+        # Duplicate indices are requested only once.
+        iclf = self.iclf(use_speed_up=True, kernel_tile_size=1)
+        iclf.precompute([0, 0], [1, 1])
+        self.assertEqual(iclf.pwc_K_._requests[(0, 1)], [(None, None)])
+
+        # New requests extend a tile in memory instead of discarding its
+        # computed entries.
+        iclf = self.iclf(use_speed_up=True, kernel_tile_size=4)
+        iclf.precompute([0], [1])
+        K_ref = pairwise_kernels(self.X, metric="rbf")
+        self.assertAlmostEqual(iclf.pwc_K_.get([0], [1])[0, 0], K_ref[0, 1])
+        tile = iclf.pwc_K_._tiles[(0, 0)]
+        iclf.precompute([0], [2])
+        with patch(
+            "skactiveml.pool.utils.pairwise_kernels", wraps=pairwise_kernels
+        ) as kernel:
+            np.testing.assert_allclose(
+                iclf.pwc_K_.get([0], [1, 2]), K_ref[[0]][:, [1, 2]]
+            )
+            np.testing.assert_allclose(
+                iclf.pwc_K_.get([0], [1, 2]), K_ref[[0]][:, [1, 2]]
+            )
+        self.assertEqual(kernel.call_count, 1)
+        np.testing.assert_array_equal(kernel.call_args[0][1], self.X[[2]])
+        self.assertIs(iclf.pwc_K_._tiles[(0, 0)], tile)
+        info = iclf.pwc_K_.cache_info()
+        self.assertEqual(info["misses"], 2)
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["evictions"], 0)
+
+    def test_init_param_kernel_max_memory(self):
+        self.assertEqual(self.iclf().kernel_max_memory, 1024)
+        for max_memory in ["string", 0, -1]:
+            self.assertRaises(
+                (ValueError, TypeError),
+                self.iclf,
+                use_speed_up=True,
+                kernel_max_memory=max_memory,
+            )
+
+        all_idx = np.arange(len(self.X))
+        P_ref = self.clf.fit(self.X, self.y).predict_proba(self.X)
+        iclf = self.iclf(
+            use_speed_up=True, kernel_tile_size=2, kernel_max_memory=1e-5
+        )
+        iclf.precompute(all_idx, all_idx)
+        iclf.fit(all_idx)
+        for _ in range(2):
+            np.testing.assert_allclose(iclf.predict_proba(all_idx), P_ref)
+        info = iclf.pwc_K_.cache_info()
+        self.assertEqual(info["n_tiles"], 1)
+        self.assertEqual(info["misses"], 8)
+        self.assertEqual(info["evictions"], 7)
+        self.assertEqual(info["memory"], 4 * 8 / 2**20)
+
+        iclf = self.iclf(use_speed_up=True, kernel_tile_size=2)
+        iclf.precompute(all_idx, all_idx)
+        iclf.fit(all_idx)
+        for _ in range(2):
+            np.testing.assert_allclose(iclf.predict_proba(all_idx), P_ref)
+        info = iclf.pwc_K_.cache_info()
+        self.assertEqual(info["hits"], 4)
+        self.assertEqual(info["misses"], 4)
+        self.assertEqual(info["evictions"], 0)
+
+    def test_init_param_kernel_cache_dir(self):
+        self.assertIsNone(self.iclf().kernel_cache_dir)
+        self.assertRaises(
+            TypeError, self.iclf, use_speed_up=True, kernel_cache_dir=1
+        )
+
+        all_idx = np.arange(len(self.X))
+        P_ref = self.clf.fit(self.X, self.y).predict_proba(self.X)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            iclf = self.iclf(
+                use_speed_up=True,
+                kernel_tile_size=2,
+                kernel_max_memory=1e-5,
+                kernel_cache_dir=cache_dir,
+            )
+            iclf.precompute(all_idx, all_idx)
+            iclf.fit(all_idx)
+            for _ in range(2):
+                np.testing.assert_allclose(iclf.predict_proba(all_idx), P_ref)
+            info = iclf.pwc_K_.cache_info()
+            self.assertEqual(info["misses"], 4)
+            self.assertEqual(info["loads"], 4)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            cache_path = iclf.pwc_K_.cache_path_
+            self.assertEqual(len(os.listdir(cache_path)), 4)
+
+            iclf = self.iclf(
+                use_speed_up=True,
+                kernel_tile_size=2,
+                kernel_cache_dir=cache_dir,
+            )
+            iclf.precompute(all_idx, all_idx)
+            iclf.fit(all_idx)
+            np.testing.assert_allclose(iclf.predict_proba(all_idx), P_ref)
+            info = iclf.pwc_K_.cache_info()
+            self.assertEqual(info["misses"], 0)
+            self.assertEqual(info["loads"], 4)
+            self.assertEqual(iclf.pwc_K_.cache_path_, cache_path)
+
+            iclf = IndexClassifierWrapper(
+                self.clf,
+                self.X + 1,
+                self.y,
+                use_speed_up=True,
+                kernel_tile_size=2,
+                kernel_cache_dir=cache_dir,
+            )
+            self.assertNotEqual(iclf.pwc_K_.cache_path_, cache_path)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+            # Callable kernels are identified by their pickled representation
+            # such that different callables never share tiles.
+            cache_paths = []
+            for metric in [
+                _linear_kernel,
+                _polynomial_kernel,
+                partial(_polynomial_kernel, degree=2),
+                partial(_polynomial_kernel, degree=3),
+            ]:
+                clf = ParzenWindowClassifier(classes=[0, 1], metric=metric)
+                iclf = IndexClassifierWrapper(
+                    clf,
+                    self.X,
+                    self.y,
+                    use_speed_up=True,
+                    kernel_cache_dir=cache_dir,
+                )
+                iclf.precompute(all_idx, all_idx)
+                np.testing.assert_allclose(
+                    iclf.pwc_K_.toarray(),
+                    pairwise_kernels(self.X, metric=metric),
+                )
+                cache_paths.append(iclf.pwc_K_.cache_path_)
+            self.assertEqual(len(set(cache_paths)), 4)
+            for metric in [
+                lambda a, b: a @ b,
+                lambda a, b: (a @ b) ** 2,
+                partial(lambda a, b, c: a @ b + c, c=1),
+            ]:
+                clf = ParzenWindowClassifier(classes=[0, 1], metric=metric)
+                self.assertRaises(
+                    ValueError,
+                    IndexClassifierWrapper,
+                    clf,
+                    self.X,
+                    self.y,
+                    use_speed_up=True,
+                    kernel_cache_dir=cache_dir,
+                )
+
     def test_init_param_missing_label(self):
         self.assertTrue(hasattr(self.iclf(), "missing_label"))
         self.assertTrue(
@@ -233,7 +434,7 @@ class TestIndexClassifierWrapper(unittest.TestCase):
                     self.X[fit_idx], self.X[pred_idx], metric="rbf"
                 )
 
-                np.testing.assert_array_equal(K, iclf.pwc_K_)
+                np.testing.assert_array_equal(K, iclf.pwc_K_.toarray())
 
     def test_fit_param_idx(self):
         iclf = self.iclf()
@@ -674,6 +875,95 @@ class TestIndexClassifierWrapper(unittest.TestCase):
                         getattr(clf, pred)(self.X),
                     )
 
+    def test_predict_proba_simulated(self):
+        iclf = self.iclf(use_speed_up=True).fit([0], set_base_clf=True)
+        self.assertRaises(
+            ValueError, iclf.predict_proba_simulated, [1], [0], [2]
+        )
+        self.assertRaises(
+            (ValueError, TypeError, IndexError),
+            iclf.predict_proba_simulated,
+            [10],
+            [0],
+            [2],
+        )
+
+        base_clfs = [
+            lambda: ParzenWindowClassifier(classes=[0, 1], class_prior=0.1),
+            lambda: ParzenWindowClassifier(classes=[0, 1], n_neighbors=2),
+            lambda: SklearnClassifier(GaussianNB(), classes=[0, 1]),
+        ]
+        speed_ups = [True, False]
+        sample_weights = [None, np.linspace(0.2, 1, 4)]
+        enforce_uniques = [True, False]
+        params = product(base_clfs, speed_ups, sample_weights, enforce_uniques)
+        for BaseClf, speed_up, sample_weight, enforce_unique in params:
+            with self.subTest(
+                BaseClf=str(BaseClf()),
+                speed_up=speed_up,
+                sample_weight=sample_weight,
+                enforce_unique=enforce_unique,
+            ):
+                iclf = IndexClassifierWrapper(
+                    BaseClf(),
+                    self.X,
+                    self.y,
+                    sample_weight=sample_weight,
+                    use_speed_up=speed_up,
+                    enforce_unique_samples=enforce_unique,
+                )
+                if speed_up:
+                    iclf.precompute(np.arange(4), np.arange(4))
+                iclf.fit(np.arange(4), set_base_clf=True)
+                idx_sim = [3, 1, 2]
+                y_sim = [0, 1]
+                P = iclf.predict_proba_simulated(idx_sim, y_sim, np.arange(4))
+                self.assertEqual(P.shape, (3, 2, 4, 2))
+                for (i, idx), (j, y) in product(
+                    enumerate(idx_sim), enumerate(y_sim)
+                ):
+                    iclf.partial_fit([idx], [y], use_base_clf=True)
+                    np.testing.assert_allclose(
+                        P[i, j], iclf.predict_proba(np.arange(4))
+                    )
+
+        # The simulated labels are rolled back instead of copying the
+        # training samples of the base classifier for each label.
+        for enforce_unique in enforce_uniques:
+            with self.subTest(msg="Rollback", enforce_unique=enforce_unique):
+                iclf = IndexClassifierWrapper(
+                    ParzenWindowClassifier(classes=[0, 1]),
+                    self.X,
+                    self.y,
+                    enforce_unique_samples=enforce_unique,
+                )
+                iclf.precompute(np.arange(4), np.arange(4))
+                iclf.fit([0, 1, 2], set_base_clf=True)
+                P_ref = iclf.predict_proba(np.arange(4))
+                with patch.object(
+                    ParzenWindowClassifier,
+                    "_copy_state",
+                    autospec=True,
+                    side_effect=ParzenWindowClassifier._copy_state,
+                ) as copy_state:
+                    for idx, y in product([1, 2, 3], [0, 1]):
+                        iclf.partial_fit([idx], [y], use_base_clf=True)
+                        clf = ParzenWindowClassifier(classes=[0, 1])
+                        idx_all = [0, 1, 2, idx]
+                        y_all = np.append(self.y[[0, 1, 2]], y)
+                        if enforce_unique and idx < 3:
+                            idx_all, y_all = idx_all[:3], y_all[:3]
+                            y_all[idx] = y
+                        clf.fit(self.X[idx_all], y_all)
+                        np.testing.assert_allclose(
+                            iclf.predict_proba(np.arange(4)),
+                            clf.predict_proba(self.X),
+                        )
+                    self.assertLessEqual(copy_state.call_count, 1)
+                np.testing.assert_allclose(
+                    iclf.base_clf_.predict_proba(self.X), P_ref
+                )
+
 
 class TestApproximation(unittest.TestCase):
     def setUp(self):
@@ -699,6 +989,7 @@ class TestApproximation(unittest.TestCase):
             "include_x": ["illegal", dict, 7],
             "include_idx": ["illegal", dict, 7],
             "vector_func": ["illegal", dict, 7],
+            "n_jobs": ["illegal", 0, 1.5],
         }
 
         for parameter in illegal_argument_dict:
@@ -729,6 +1020,7 @@ class TestApproximation(unittest.TestCase):
             {"method": "quantile", "quantile_method": "quadrature"},
             {"method": "dynamic_quad"},
             {"method": "gauss_hermite"},
+            {"method": "two_point"},
         ]
 
         parameters_2 = [
@@ -777,6 +1069,36 @@ class TestApproximation(unittest.TestCase):
 
             np.testing.assert_array_equal(res, np.zeros(2))
 
+    def test_conditional_expectation_n_jobs(self):
+        X = np.arange(5 * 2).reshape(5, 2)
+        y = np.arange(5, dtype=float)
+        reg = NICKernelRegressor().fit(X, y)
+
+        def func(idx, x, y):
+            self.assertTrue(isinstance(idx, int))
+            np.testing.assert_array_equal(x, X[idx])
+            return idx * y + np.sum(x)
+
+        for parameter in [
+            {"method": "monte_carlo", "n_integration_samples": 3},
+            {"method": "gauss_hermite"},
+            {"method": "dynamic_quad"},
+        ]:
+            res_ref = _conditional_expect(
+                X, func, reg, random_state=self.random_state, **parameter
+            )
+            for n_jobs in [2, 7]:
+                with parallel_backend("threading"):
+                    res = _conditional_expect(
+                        X,
+                        func,
+                        reg,
+                        random_state=self.random_state,
+                        n_jobs=n_jobs,
+                        **parameter,
+                    )
+                np.testing.assert_array_equal(res, res_ref)
+
     def test_reshape_distribution(self):
         dist = norm(loc=np.array([0, 0]))
         _reshape_scipy_dist(dist, shape=(2, 1))
@@ -795,6 +1117,23 @@ class TestFunctions(unittest.TestCase):
         self.x_pot = np.array([3, 4])
         self.y_pot = 5
 
+    def test_copy_clf(self):
+        X, y = make_blobs(n_samples=20, random_state=0)
+        clf = SklearnClassifier(GaussianNB()).fit(X, y)
+        with patch(
+            "skactiveml.classifier._wrapper.deepcopy", wraps=deepcopy
+        ) as deepcopy_mock:
+            clf_copy = _copy_clf(clf)
+            deepcopy_mock.assert_called_once()
+        self.assertIsNot(clf_copy.estimator_, clf.estimator_)
+        np.testing.assert_array_equal(
+            clf_copy.predict_proba(X), clf.predict_proba(X)
+        )
+        clf_copy.partial_fit(X[:5], y[:5])
+        self.assertFalse(
+            np.array_equal(clf_copy.estimator_.theta_, clf.estimator_.theta_)
+        )
+
     def test_update_X_y(self):
         X_new, y_new = _update_X_y(
             self.X, self.y, self.y_pot, X_update=self.x_pot
@@ -882,6 +1221,64 @@ class TestFunctions(unittest.TestCase):
             X_update=np.array([8, 4]),
         )
 
+        # Incremental update of `NICKernelRegressor` equals refitting.
+        X, y = self.X / 10, self.y.astype(float)
+        y[3:] = MISSING_LABEL
+        X_eval = np.vstack([X, X + 0.05])
+        for sample_weight in [None, np.arange(7) + 1.0]:
+            reg = NICKernelRegressor().fit(X, y, sample_weight)
+            for idx_update, X_update, mapping in [
+                (1, None, self.mapping),
+                (np.array([0, 2]), None, self.mapping),
+                (0, None, np.array([1, 3])),
+                (None, np.array([0.8, 0.4]), None),
+            ]:
+                if sample_weight is not None and mapping is None:
+                    continue
+                y_pot = np.full(np.size(idx_update), 0.5)
+                kwargs = dict(
+                    sample_weight=sample_weight,
+                    idx_update=idx_update,
+                    X_update=X_update,
+                    mapping=mapping,
+                )
+                if mapping is None:
+                    X_new, y_new = _update_X_y(X, y, y_pot, X_update=X_update)
+                else:
+                    X_new, y_new = _update_X_y(
+                        X, y, y_pot, idx_update=mapping[idx_update]
+                    )
+                reg_ref = NICKernelRegressor().fit(X_new, y_new, sample_weight)
+                for reg_, use_partial_fit in product(
+                    [reg, _cache_reg(reg, X_eval)], [False, True]
+                ):
+                    reg_new = _update_reg(
+                        reg_,
+                        X,
+                        y,
+                        y_pot,
+                        use_partial_fit=use_partial_fit,
+                        **kwargs,
+                    )
+                    np.testing.assert_allclose(
+                        reg_new.predict(X_eval, return_std=True),
+                        reg_ref.predict(X_eval, return_std=True),
+                    )
+                    self.assertEqual(len(reg_.X_), 3)
+                self.assertIsNone(reg._ml_params_cache)
+
+        # Without `use_partial_fit`, the regressor is refitted on `X` and `y`
+        # regardless of the data it has been fitted on.
+        reg = NICKernelRegressor().fit(X[:1], y[:1])
+        reg_new = _update_reg(
+            reg, X, y, 0.5, mapping=self.mapping, idx_update=0
+        )
+        X_new, y_new = _update_X_y(X, y, 0.5, idx_update=self.mapping[0])
+        np.testing.assert_allclose(
+            reg_new.predict(X_eval),
+            NICKernelRegressor().fit(X_new, y_new).predict(X_eval),
+        )
+
     def test_boostrap_aggregation(self):
         reg_s = _bootstrap_estimators(
             self.reg, self.X, self.y, bootstrap_size=5
@@ -897,6 +1294,23 @@ class TestFunctions(unittest.TestCase):
         )
         self.assertEqual(len(reg_s), 5)
 
+        for n_train, n_subset in [
+            (0.5, int(np.ceil(len(self.X) / 2))),
+            (2, 2),
+        ]:
+            reg_s, subsets = _bootstrap_estimators(
+                self.reg,
+                self.X,
+                self.y,
+                bootstrap_size=3,
+                n_train=n_train,
+                n_jobs=2,
+                return_subsets=True,
+            )
+            self.assertEqual(len(reg_s), 3)
+            for subset in subsets:
+                self.assertEqual(len(subset), n_subset)
+
         self.assertRaises(
             ValueError,
             _bootstrap_estimators,
@@ -951,3 +1365,106 @@ class TestFunctions(unittest.TestCase):
             self.assertRaises(
                 (TypeError, ValueError), _cross_entropy, **cross_entropy_dict
             )
+
+    def test_expected_target_val_analytic(self):
+        X = np.arange(5 * 2).reshape(5, 2) / 4
+        y = 2 * np.arange(5, dtype=float) - 5
+        gpr = GaussianProcessRegressor(alpha=0.5)
+        reg_norm_1 = SklearnNormalRegressor(gpr).fit(X[:3], y[:3])
+        reg_norm_2 = SklearnNormalRegressor(gpr).fit(X, y)
+        reg_t_1 = NICKernelRegressor(nu_0=5).fit(X, y)
+        reg_t_2 = NICKernelRegressor(nu_0=5).fit(X[:3], y[:3])
+        quad_dict = {"method": "dynamic_quad"}
+        analytic_dict = {"method": "analytic"}
+
+        # Closed forms compared to integrating each sample separately.
+        for reg, target_reg, target in [
+            (reg_norm_1, reg_norm_2, "logpdf"),
+            (reg_t_1, reg_norm_1, "logpdf"),
+            (reg_norm_1, reg_norm_2, "pdf"),
+        ]:
+            dist = reg.predict_target_distribution(X)
+            target_dist = target_reg.predict_target_distribution(X)
+            expectation = [
+                dist.dist(*args).expect(
+                    getattr(norm(*target_args), target),
+                    epsabs=1e-12,
+                    epsrel=1e-12,
+                )
+                for args, target_args in zip(
+                    zip(*dist.args, *dist.kwds.values()),
+                    zip(*target_dist.kwds.values()),
+                )
+            ]
+            np.testing.assert_allclose(
+                expected_target_val(
+                    X, getattr(target_dist, target), reg, **analytic_dict
+                ),
+                expectation,
+                rtol=1e-6,
+            )
+        np.testing.assert_allclose(
+            _cross_entropy(X, reg_t_1, reg_norm_1, analytic_dict),
+            -expected_target_val(
+                X,
+                reg_norm_1.predict_target_distribution(X).logpdf,
+                reg_t_1,
+                **analytic_dict,
+            ),
+        )
+
+        # Two-point rule, which is exact for quadratic functions.
+        def func(idx, x, y):
+            return (y - idx) ** 2 + 3 * y
+
+        two_point_dict = {"method": "two_point"}
+        for reg in [reg_norm_1, reg_t_1]:
+            np.testing.assert_allclose(
+                _conditional_expect(X, func, reg, **two_point_dict),
+                _conditional_expect(X, func, reg, **quad_dict),
+                rtol=1e-6,
+            )
+        dist = _reshape_scipy_dist(
+            reg_t_1.predict_target_distribution(X), shape=(-1, 1)
+        )
+        mu, std = reg_t_2.predict(X, return_std=True)
+        np.testing.assert_allclose(
+            expected_target_val(
+                X, dist.logpdf, reg_t_2, vector_func=True, **two_point_dict
+            ),
+            (dist.logpdf(mu - std) + dist.logpdf(mu + std)).diagonal() / 2,
+        )
+
+        # No closed form is registered.
+        self.assertRaises(
+            ValueError,
+            _conditional_expect,
+            X,
+            func,
+            reg_norm_1,
+            **analytic_dict,
+        )
+        self.assertRaises(
+            ValueError,
+            expected_target_val,
+            X,
+            dist.logpdf,
+            reg_t_2,
+            **analytic_dict,
+        )
+        self.assertRaises(
+            ValueError,
+            expected_target_val,
+            X,
+            lambda y: y**2,
+            reg_norm_1,
+            **analytic_dict,
+        )
+        self.assertRaises(
+            ValueError,
+            _cross_entropy,
+            X,
+            reg_t_2,
+            reg_t_1,
+            analytic_dict,
+        )
@@ -1,8 +1,15 @@
+import hashlib
+import os
 import warnings
-from copy import deepcopy
+from collections import OrderedDict
+from copy import copy, deepcopy
+from functools import partial
+from types import CodeType
 
 import numpy as np
 import scipy
+from joblib import Parallel, delayed, effective_n_jobs
+from joblib import hash as joblib_hash
 from scipy import integrate
 from scipy.special import roots_hermitenorm
 from sklearn import clone
@@ -17,6 +24,7 @@ from ..base import (
     SkactivemlRegressor,
 )
 from ..classifier import ParzenWindowClassifier
+from ..regressor import NICKernelRegressor
 from ..utils import (
     MISSING_LABEL,
     is_labeled,
@@ -60,7 +68,9 @@ class IndexClassifierWrapper:
         classifier
     ignore_partial_fit : bool, optional (default: True)
         Specifies if the `partial_fit` function of `self.clf` should be used
-        (if implemented).
+        (if implemented). For the Parzen Window Classifier, the positions of
+        the training samples are tracked such that samples are replaced via
+        `partial_fit` if `enforce_unique_samples` is True.
     enforce_unique_samples : bool, optional (default: False)
         If True, `partial_fit` will not simply append additional samples but
         replace the current labels by the new one. If False, instances might
@@ -68,6 +78,26 @@ class IndexClassifierWrapper:
     use_speed_up : bool, optional (default: True)
         Specifies if potentially available speed ups should be used. Currently
         implemented for Parzen Window Classifier.
+    kernel_tile_size : int, optional (default=1024)
+        Only relevant for the speed up of the Parzen Window Classifier. The
+        kernel matrix is stored in square tiles of `kernel_tile_size` rows and
+        columns, which are only computed if they are needed after being
+        requested by `precompute`.
+    kernel_max_memory : int or float or None, optional (default=1024)
+        Only relevant for the speed up of the Parzen Window Classifier.
+        Maximum memory in MiB used for storing kernel tiles. If exceeded, the
+        least recently used tiles are evicted and recomputed when needed
+        again, while the most recently used tile is always kept. If None, the
+        memory is not limited, which may exhaust the memory for large pools,
+        as each tile of the default size takes 8 MiB.
+    kernel_cache_dir : str or None, optional (default=None)
+        Only relevant for the speed up of the Parzen Window Classifier.
+        Directory in which computed kernel tiles are stored as memory-mapped
+        files. Wrappers with equal `X`, kernel, and `kernel_tile_size` share
+        these tiles, e.g., across active learning cycles or processes. If
+        None, the tiles are only kept in memory. A callable kernel must be
+        importable, e.g., a module-level function or a `functools.partial`
+        of one, since it is identified by its pickled representation.
     missing_label : scalar or string or np.nan or None, default=np.nan
         Value to represent a missing label.
     """
@@ -82,6 +112,9 @@ class IndexClassifierWrapper:
         ignore_partial_fit=False,
         enforce_unique_samples=False,
         use_speed_up=False,
+        kernel_tile_size=1024,
+        kernel_max_memory=1024,
+        kernel_cache_dir=None,
         missing_label=MISSING_LABEL,
     ):
         self.clf = clf
@@ -91,6 +124,9 @@ class IndexClassifierWrapper:
         self.ignore_partial_fit = ignore_partial_fit
         self.enforce_unique_samples = enforce_unique_samples
         self.use_speed_up = use_speed_up
+        self.kernel_tile_size = kernel_tile_size
+        self.kernel_max_memory = kernel_max_memory
+        self.kernel_cache_dir = kernel_cache_dir
         self.missing_label = missing_label
 
         # Validate classifier type.
@@ -116,7 +152,7 @@ class IndexClassifierWrapper:
             self.clf_ = deepcopy(self.clf)
 
             if set_base_clf:
-                self.base_clf_ = deepcopy(self.clf_)
+                self.base_clf_ = _copy_clf(self.clf_)
         else:
             if set_base_clf:
                 raise NotFittedError(
@@ -136,7 +172,11 @@ class IndexClassifierWrapper:
         )
         # TODO better change check_indices function
 
-        if self.use_partial_fit and self.enforce_unique_samples:
+        if (
+            self.use_partial_fit
+            and self.enforce_unique_samples
+            and not isinstance(self.clf, ParzenWindowClassifier)
+        ):
             warnings.warn(
                 "The `partial_fit` function by sklearn might not "
                 "ensure that every sample is used only once in the "
@@ -163,11 +203,16 @@ class IndexClassifierWrapper:
             self.pwc_metric_dict_ = (
                 {} if self.clf.metric_dict is None else self.clf.metric_dict
             )
-            self.pwc_K_ = np.full([len(self.X), len(self.X)], np.nan)
+            self.pwc_K_ = _KernelTileCache(
+                self.X,
+                metric=self.pwc_metric_,
+                metric_dict=self.pwc_metric_dict_,
+                tile_size=self.kernel_tile_size,
+                max_memory=self.kernel_max_memory,
+                cache_dir=self.kernel_cache_dir,
+            )
 
             self.clf_ = clone(self.clf)
-            self.clf_.metric = "precomputed"
-            self.clf_.metric_dict = {}
 
     def precompute(
         self, idx_fit, idx_pred, fit_params="all", pred_params="all"
@@ -239,13 +284,7 @@ class IndexClassifierWrapper:
             else:
                 raise ValueError(f"`pred_params`== {pred_params} not defined")
 
-            if len(idx_fit_) > 0 and len(idx_pred_) > 0:
-                self.pwc_K_[np.ix_(idx_fit_, idx_pred_)] = pairwise_kernels(
-                    self.X[idx_fit_],
-                    self.X[idx_pred_],
-                    self.pwc_metric_,
-                    **self.pwc_metric_dict_,
-                )
+            self.pwc_K_.request(idx_fit_, idx_pred_)
 
     def fit(self, idx, y=None, sample_weight=None, set_base_clf=False):
         """Fit the model using `self.X[idx]` as training data and `self.y[idx]`
@@ -315,20 +354,22 @@ class IndexClassifierWrapper:
 
         # fit classifier
         self.clf_.fit(self.X[idx], y, sample_weight)
+        self._pwc_replaced = None
 
         # store data for further processing
-        if not self.use_partial_fit:
+        if self._track_samples():
             self.idx_ = idx
             self.y_ = y
             self.sample_weight_ = sample_weight
 
         # set base clf if necessary
         if set_base_clf:
-            self.base_clf_ = deepcopy(self.clf_)
-            if not self.use_partial_fit:
+            self.base_clf_ = _copy_clf(self.clf_)
+            if self._track_samples():
                 self.base_idx_ = self.idx_.copy()
                 self.base_y_ = self.y_.copy()
                 self.base_sample_weight_ = self._copy_sw(self.sample_weight_)
+                self._pwc_replaced = []
 
         return self
 
@@ -425,17 +466,18 @@ class IndexClassifierWrapper:
             check_consistent_length(add_idx, add_sample_weight)
 
         # handle case when partial fit of clf is used
-        if self.use_partial_fit:
+        if self.use_partial_fit and not self._track_samples():
             if use_base_clf:
-                self.clf_ = deepcopy(self.base_clf_)
+                self.clf_ = _copy_clf(self.base_clf_)
 
             # partial fit clf
             self.clf_.partial_fit(self.X[add_idx], add_y, add_sample_weight)
 
             if set_base_clf:
-                self.base_clf_ = deepcopy(self.clf_)
+                self.base_clf_ = _copy_clf(self.clf_)
 
-        # handle case using regular fit from clf
+        # handle case using regular fit from clf or partial fit of the
+        # ParzenWindowClassifier with tracked training samples
         else:
             if not hasattr(self, "idx_"):
                 raise NotFittedError(
@@ -444,10 +486,25 @@ class IndexClassifierWrapper:
                     "where it has been fitted on."
                 )
             if use_base_clf:
-                self.clf_ = clone(self.base_clf_)
-                self.idx_ = self.base_idx_.copy()
-                self.y_ = self.base_y_.copy()
-                self.sample_weight_ = self._copy_sw(self.base_sample_weight_)
+                if self.use_partial_fit:
+                    self._reset_pwc()
+                else:
+                    self.clf_ = clone(self.base_clf_)
+                # The tracked arrays are shared with the base classifier as
+                # they are never modified in-place.
+                self.idx_ = self.base_idx_
+                self.y_ = self.base_y_
+                self.sample_weight_ = self.base_sample_weight_
+
+            if self.use_partial_fit:
+                self._partial_fit_pwc(add_idx, add_y, add_sample_weight)
+                if set_base_clf:
+                    self.base_clf_ = _copy_clf(self.clf_)
+                    self.base_idx_ = self.idx_
+                    self.base_y_ = self.y_
+                    self.base_sample_weight_ = self.sample_weight_
+                    self._pwc_replaced = []
+                return self
 
             if self.enforce_unique_samples:
                 cur_idx = np.array([i not in add_idx for i in self.idx_])
@@ -468,6 +525,74 @@ class IndexClassifierWrapper:
 
         return self
 
+    def _track_samples(self):
+        # Whether the training samples of `clf_` are tracked by their
+        # indices, which is required if `clf_` is refitted and for the
+        # speed-up of the ParzenWindowClassifier.
+        return not self.use_partial_fit or isinstance(
+            self.clf, ParzenWindowClassifier
+        )
+
+    def _reset_pwc(self):
+        # Reset the ParzenWindowClassifier `clf_` to `base_clf_`. If `clf_`
+        # has been derived from `base_clf_` via `_partial_fit_pwc`, the
+        # appended samples are removed and the replaced ones are restored,
+        # which costs O(n_changed * n_features) instead of copying the
+        # training samples of `base_clf_`.
+        n_base = len(self.base_idx_)
+        replaced = getattr(self, "_pwc_replaced", None)
+        if replaced is None or n_base == 0:
+            self.clf_ = _copy_clf(self.base_clf_)
+        else:
+            self.clf_.remove_samples(np.arange(n_base, len(self.clf_.X_)))
+            if len(replaced) > 0:
+                replaced = np.unique(replaced)
+                self.clf_.partial_fit(
+                    self.X[self.base_idx_[replaced]],
+                    self.base_y_[replaced],
+                    self._get_sw(self.base_sample_weight_, replaced),
+                    replace_idx=replaced,
+                )
+        self._pwc_replaced = []
+
+    def _partial_fit_pwc(self, add_idx, add_y, add_sample_weight):
+        # Update the ParzenWindowClassifier via `partial_fit`, where the
+        # samples already used for training are replaced at their positions
+        # if samples are to be unique. The replaced positions of the samples
+        # of `base_clf_` are recorded for `_reset_pwc`.
+        is_new = np.ones(len(add_idx), dtype=bool)
+        if self.enforce_unique_samples:
+            positions = np.full(len(self.X), -1)
+            positions[self.idx_] = np.arange(len(self.idx_))
+            replace_idx = positions[add_idx]
+            is_new = replace_idx < 0
+            is_old = ~is_new
+            if is_old.any():
+                sw_old = self._get_sw(add_sample_weight, is_old)
+                if (self.sample_weight_ is None) != (sw_old is None):
+                    raise ValueError(
+                        "All `sample_weight` must be either None or given."
+                    )
+                self.clf_.partial_fit(
+                    self.X[add_idx[is_old]],
+                    add_y[is_old],
+                    sw_old,
+                    replace_idx=replace_idx[is_old],
+                )
+                if getattr(self, "_pwc_replaced", None) is not None:
+                    is_base = replace_idx[is_old] < len(self.base_idx_)
+                    self._pwc_replaced.extend(replace_idx[is_old][is_base])
+                self.y_ = self.y_.copy()
+                self.y_[replace_idx[is_old]] = add_y[is_old]
+                if sw_old is not None:
+                    self.sample_weight_ = self.sample_weight_.copy()
+                    self.sample_weight_[replace_idx[is_old]] = sw_old
+        sw_new = self._get_sw(add_sample_weight, is_new)
+        self.sample_weight_ = self._concat_sw(self.sample_weight_, sw_new)
+        self.clf_.partial_fit(self.X[add_idx[is_new]], add_y[is_new], sw_new)
+        self.idx_ = np.concatenate([self.idx_, add_idx[is_new]], axis=0)
+        self.y_ = np.concatenate([self.y_, add_y[is_new]], axis=0)
+
     def predict(self, idx):
         """Return class label predictions for the input data `X[idx]`.
 
@@ -483,7 +608,7 @@ class IndexClassifierWrapper:
         """
         if isinstance(self.clf, ParzenWindowClassifier) and self.use_speed_up:
             if hasattr(self, "idx_"):
-                P = self.pwc_K_[self.idx_, :][:, idx].T
+                P = self.pwc_K_.get(self.idx_, idx).T
             else:
                 warnings.warn("Speed-up not possible when prefitted")
                 return self.clf.predict_proba(self.X[idx])
@@ -497,7 +622,7 @@ class IndexClassifierWrapper:
                     "information is available which results in "
                     "NaNs in `predict_proba`."
                 )
-            return self.clf_.predict(P)
+            return self._precomputed(self.clf_).predict(P)
         else:
             return self.clf_.predict(self.X[idx])
 
@@ -517,7 +642,7 @@ class IndexClassifierWrapper:
         """
         if isinstance(self.clf, ParzenWindowClassifier) and self.use_speed_up:
             if hasattr(self, "idx_"):
-                P = self.pwc_K_[self.idx_, :][:, idx].T
+                P = self.pwc_K_.get(self.idx_, idx).T
             else:
                 warnings.warn("Speed-up not possible when prefitted")
                 return self.clf.predict_proba(self.X[idx])
@@ -531,7 +656,7 @@ class IndexClassifierWrapper:
                     "information is available which results in "
                     "NaNs in `predict_proba`."
                 )
-            return self.clf_.predict_proba(P)
+            return self._precomputed(self.clf_).predict_proba(P)
         else:
             return self.clf_.predict_proba(self.X[idx])
 
@@ -551,7 +676,7 @@ class IndexClassifierWrapper:
         """
         if isinstance(self.clf, ParzenWindowClassifier) and self.use_speed_up:
             if hasattr(self, "idx_"):
-                P = self.pwc_K_[self.idx_, :][:, idx].T
+                P = self.pwc_K_.get(self.idx_, idx).T
             else:
                 warnings.warn("Speed-up not possible when prefitted")
                 return self.clf.predict_proba(self.X[idx])
@@ -565,10 +690,116 @@ class IndexClassifierWrapper:
                     "information is available which results in "
                     "NaNs in `predict_proba`."
                 )
-            return self.clf_.predict_freq(P)
+            return self._precomputed(self.clf_).predict_freq(P)
         else:
             return self.clf_.predict_freq(self.X[idx])
 
+    def predict_proba_simulated(self, idx_sim, y_sim, idx_pred):
+        """Return probability estimates for the input data `X[idx_pred]`
+        after simulating the acquisition of each label in `y_sim` for each
+        sample in `X[idx_sim]`. The result for the pair `idx_sim[i]` and
+        `y_sim[j]` equals the probabilities after calling
+        `partial_fit([idx_sim[i]], [y_sim[j]], use_base_clf=True)`. For the
+        Parzen Window Classifier without `n_neighbors`, all pairs are
+        simulated at once by updating the class frequency estimates of the
+        base classifier with the precomputed kernel. Otherwise, the pairs are
+        simulated one after another.
+
+        Parameters
+        ----------
+        idx_sim : array-like of shape (n_sim_samples)
+            Indices of samples in `X` whose labels are simulated.
+        y_sim : array-like of shape (n_sim_labels)
+            Class labels to be simulated for each sample in `X[idx_sim]`.
+        idx_pred : array-like of shape (n_pred_samples)
+            Indices of samples in `X` that are to be predicted.
+
+        Returns
+        -------
+        P : np.ndarray of shape (n_sim_samples, n_sim_labels, n_pred_samples,
+        n_classes)
+            The class probabilities of the samples in `X[idx_pred]` for each
+            simulated pair of sample and label. Classes are ordered according
+            to `classes_`.
+        """
+        idx_sim = check_array(
+            idx_sim, ensure_2d=False, dtype=int, input_name="`idx_sim`"
+        )
+        idx_sim = check_indices(idx_sim, self.X, dim=0, unique=False)
+        y_sim = check_array(
+            y_sim,
+            ensure_2d=False,
+            force_all_finite=False,
+            dtype=self.y.dtype,
+            input_name="`y_sim`",
+        )
+        idx_pred = check_array(
+            idx_pred, ensure_2d=False, dtype=int, input_name="`idx_pred`"
+        )
+        idx_pred = check_indices(idx_pred, self.X, dim=0, unique=False)
+
+        if (
+            isinstance(self.clf, ParzenWindowClassifier)
+            and self.use_speed_up
+            and self.clf.n_neighbors is None
+            and self.is_fitted(base_clf=True)
+            and hasattr(self, "base_idx_")
+        ):
+            K_base = self.pwc_K_.get(self.base_idx_, idx_pred)
+            K_sim = self.pwc_K_.get(idx_sim, idx_pred)
+            if np.isnan(K_base).any() or np.isnan(K_sim).any():
+                raise ValueError(
+                    "Error in defining what should be "
+                    "pre-computed in ParzenWindowClassifier. "
+                    "Not all necessary "
+                    "information is available which results in "
+                    "NaNs in `predict_proba_simulated`."
+                )
+            F_base = self._precomputed(self.base_clf_).predict_freq(K_base.T)
+            n_classes = F_base.shape[1]
+
+            # Votes of the simulated samples within the base classifier,
+            # which are replaced if samples are to be unique.
+            V_old = np.zeros((len(idx_sim), n_classes))
+            if self.enforce_unique_samples:
+                V_full = np.zeros((len(self.X), n_classes))
+                V_full[self.base_idx_] = self.base_clf_.V_
+                V_old = V_full[idx_sim]
+            w_sim = self._get_sw(self.sample_weight, idx=idx_sim)
+            w_sim = np.ones(len(idx_sim)) if w_sim is None else w_sim
+            V_new = np.zeros((len(y_sim), n_classes))
+            V_new[np.arange(len(y_sim)), self._le.transform(y_sim)] = 1
+            V_diff = (
+                w_sim[:, np.newaxis, np.newaxis] * V_new[np.newaxis, :, :]
+                - V_old[:, np.newaxis, :]
+            )
+
+            # Update the frequency estimates for all pairs at once.
+            P = (
+                F_base[np.newaxis, np.newaxis, :, :]
+                + K_sim[:, np.newaxis, :, np.newaxis]
+                * V_diff[:, :, np.newaxis, :]
+                + self.base_clf_.class_prior_
+            )
+            normalizer = np.sum(P, axis=-1)
+            is_pos = normalizer > 0
+            P[is_pos] /= normalizer[is_pos, np.newaxis]
+            P[~is_pos] = 1 / n_classes
+            return P
+        else:
+            P = []
+            for idx in idx_sim:
+                P_idx = []
+                for y in y_sim:
+                    self.partial_fit(
+                        [idx], [y], use_base_clf=True, set_base_clf=False
+                    )
+                    P_idx.append(self.predict_proba(idx_pred))
+                P.append(P_idx)
+            return np.array(P).reshape(
+                len(idx_sim), len(y_sim), len(idx_pred), -1
+            )
+
     def is_fitted(self, base_clf=False):
         """Returns if the classifier (resp. the base classifier) is fitted.
 
@@ -595,6 +826,15 @@ class IndexClassifierWrapper:
         else:
             return getattr(self.clf, item)
 
+    def _precomputed(self, pwc):
+        # Shallow copy of the ParzenWindowClassifier `pwc` predicting with
+        # the kernel matrices of `pwc_K_`, which shares the training samples
+        # and votes of `pwc`.
+        pwc_precomputed = copy(pwc)
+        pwc_precomputed.metric = "precomputed"
+        pwc_precomputed.algorithm = "brute"
+        return pwc_precomputed
+
     def _get_sw(self, sample_weight, idx=None):
         if sample_weight is None:
             return None
@@ -618,6 +858,312 @@ class IndexClassifierWrapper:
             )
 
 
+def _copy_clf(clf):
+    """Copy a fitted classifier via a snapshot of its fitted state such that
+    only attributes modified in-place are copied (cf. `get_state`)."""
+    clf_copy = copy(clf)
+    # The snapshot already holds copies of the attributes modified in-place
+    # such that they are not copied a second time via `set_state`.
+    clf_copy.__dict__.update(clf.get_state())
+    return clf_copy
+
+
+class _KernelTileCache:
+    """
+    Lazily computed kernel matrix between all samples in `X`, which is stored
+    in square tiles. Entries must be requested via `request` before they can
+    be accessed via `get`. A tile is only computed when one of its requested
+    entries is accessed. Entries that have not been requested are NaN. If
+    `max_memory` is exceeded, the least recently used tiles are evicted and
+    recomputed on their next access. If `cache_dir` is given, tiles are
+    stored as memory-mapped `.npy` files such that computed entries are
+    reused after eviction and by other instances with equal `X`, `metric`,
+    `metric_dict`, and `tile_size`, e.g., in subsequent active learning
+    cycles or processes.
+
+    Parameters
+    ----------
+    X : np.ndarray of shape (n_samples, n_features)
+        Samples for which the kernel is computed.
+    metric : str or callable
+        The metric must a be a valid kernel defined by the function
+        `sklearn.metrics.pairwise.pairwise_kernels`.
+    metric_dict : dict
+        Any further parameters passed directly to the kernel function.
+    tile_size : int, optional (default=1024)
+        Number of rows and columns of each tile.
+    max_memory : int or float or None, optional (default=1024)
+        Maximum memory in MiB used for storing tiles. If None, the memory is
+        not limited.
+    cache_dir : str or None, optional (default=None)
+        Directory in which the tiles are stored. If None, tiles are only kept
+        in memory. A callable `metric` must be importable, e.g., a module-level
+        function or a `functools.partial` of one.
+    """
+
+    def __init__(
+        self,
+        X,
+        metric,
+        metric_dict,
+        tile_size=1024,
+        max_memory=1024,
+        cache_dir=None,
+    ):
+        self.X = X
+        self.metric = metric
+        self.metric_dict = metric_dict
+        self.tile_size = tile_size
+        self.max_memory = max_memory
+        self.cache_dir = cache_dir
+
+        check_scalar(self.tile_size, "tile_size", target_type=int, min_val=1)
+        if self.max_memory is not None:
+            check_scalar(
+                self.max_memory,
+                "max_memory",
+                target_type=(int, float),
+                min_val=0,
+                min_inclusive=False,
+            )
+
+        self.n_samples_ = len(self.X)
+        if self.cache_dir is not None:
+            check_type(self.cache_dir, "cache_dir", str, os.PathLike)
+            self.cache_path_ = os.path.join(self.cache_dir, self._cache_key())
+            os.makedirs(self.cache_path_, exist_ok=True)
+        # Requested entries per tile as pairs of local row and column indices,
+        # where `None` denotes all rows or columns of the tile.
+        self._requests = {}
+        # Requests added after the tile had been stored in memory, whose
+        # entries are computed on the next access of the tile.
+        self._pending = {}
+        self._tiles = OrderedDict()
+        self.memory_ = 0
+        self.hits_ = 0
+        self.misses_ = 0
+        self.loads_ = 0
+        self.evictions_ = 0
+
+    def request(self, idx_fit, idx_pred):
+        """Marks the entries `K[idx_fit, idx_pred]` to be available.
+
+        Parameters
+        ----------
+        idx_fit : array-like of shape (n_fit_samples)
+            Indices of samples in `X` describing the rows. Duplicates are
+            ignored.
+        idx_pred : array-like of shape (n_pred_samples)
+            Indices of samples in `X` describing the columns. Duplicates are
+            ignored.
+        """
+        idx_fit = np.unique(np.asarray(idx_fit, dtype=int))
+        idx_pred = np.unique(np.asarray(idx_pred, dtype=int))
+        if len(idx_fit) == 0 or len(idx_pred) == 0:
+            return
+        for t_row, rows in self._split(idx_fit):
+            for t_col, cols in self._split(idx_pred):
+                key = (t_row, t_col)
+                n_rows, n_cols = self._tile_shape(key)
+                rows_ = None if len(rows) == n_rows else rows
+                cols_ = None if len(cols) == n_cols else cols
+                requests = self._requests.setdefault(key, [])
+                if any(r is None and c is None for r, c in requests):
+                    continue
+                if rows_ is None and cols_ is None:
+                    requests.clear()
+                requests.append((rows_, cols_))
+                if key in self._tiles:
+                    self._pending.setdefault(key, []).append((rows_, cols_))
+
+    def get(self, idx_fit, idx_pred):
+        """Returns the kernel matrix `K[idx_fit, idx_pred]`.
+
+        Parameters
+        ----------
+        idx_fit : array-like of shape (n_fit_samples)
+            Indices of samples in `X` describing the rows.
+        idx_pred : array-like of shape (n_pred_samples)
+            Indices of samples in `X` describing the columns.
+
+        Returns
+        -------
+        K : np.ndarray of shape (n_fit_samples, n_pred_samples)
+            Kernel matrix, whose not requested entries are NaN.
+        """
+        idx_fit = np.asarray(idx_fit, dtype=int)
+        idx_pred = np.asarray(idx_pred, dtype=int)
+        K = np.full((len(idx_fit), len(idx_pred)), np.nan)
+        col_splits = list(self._split(idx_pred, return_positions=True))
+        for t_row, rows, pos_rows in self._split(
+            idx_fit, return_positions=True
+        ):
+            for t_col, cols, pos_cols in col_splits:
+                tile = self._get_tile((t_row, t_col))
+                if tile is not None:
+                    K[np.ix_(pos_rows, pos_cols)] = tile[np.ix_(rows, cols)]
+        return K
+
+    def toarray(self):
+        """Returns the dense kernel matrix of all samples.
+
+        Returns
+        -------
+        K : np.ndarray of shape (n_samples, n_samples)
+            Kernel matrix, whose not requested entries are NaN.
+        """
+        idx = np.arange(self.n_samples_)
+        return self.get(idx, idx)
+
+    def cache_info(self):
+        """Returns statistics of the tile cache.
+
+        Returns
+        -------
+        info : dict
+            Dictionary with the number of tile accesses that were served from
+            the cache (`hits`), the number of tile computations (`misses`),
+            the number of tiles loaded from `cache_dir` without computation
+            (`loads`), the number of evicted tiles (`evictions`), the number
+            of currently stored tiles (`n_tiles`), and their memory in MiB
+            (`memory`).
+        """
+        return {
+            "hits": self.hits_,
+            "misses": self.misses_,
+            "loads": self.loads_,
+            "evictions": self.evictions_,
+            "n_tiles": len(self._tiles),
+            "memory": self.memory_ / 2**20,
+        }
+
+    def _split(self, idx, return_positions=False):
+        t_idx = idx // self.tile_size
+        order = np.argsort(t_idx, kind="stable")
+        t_unique, t_start = np.unique(t_idx[order], return_index=True)
+        t_end = np.append(t_start[1:], len(idx))
+        for t, start, end in zip(t_unique, t_start, t_end):
+            pos = order[start:end]
+            local = idx[pos] - t * self.tile_size
+            if return_positions:
+                yield t, local, pos
+            else:
+                yield t, local
+
+    def _tile_shape(self, key):
+        return tuple(
+            min(self.tile_size, self.n_samples_ - t * self.tile_size)
+            for t in key
+        )
+
+    def _get_tile(self, key):
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            tile = self._tiles[key]
+            pending = self._pending.pop(key, [])
+            if self._compute_entries(key, tile, pending):
+                self.misses_ += 1
+            else:
+                self.hits_ += 1
+            return tile
+        if key not in self._requests:
+            return None
+
+        # Load or create the tile.
+        shape = self._tile_shape(key)
+        if self.cache_dir is None:
+            tile = np.full(shape, np.nan)
+        else:
+            path = os.path.join(
+                self.cache_path_, "tile_{}_{}.npy".format(*key)
+            )
+            if os.path.exists(path):
+                tile = np.lib.format.open_memmap(path, mode="r+")
+            else:
+                tile = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=float, shape=shape
+                )
+                tile[:] = np.nan
+
+        if self._compute_entries(key, tile, self._requests[key]):
+            self.misses_ += 1
+        else:
+            self.loads_ += 1
+
+        # Store the tile and evict the least recently used ones.
+        self._tiles[key] = tile
+        self.memory_ += tile.nbytes
+        if self.max_memory is not None:
+            while (
+                self.memory_ > self.max_memory * 2**20 and len(self._tiles) > 1
+            ):
+                self._evict(next(iter(self._tiles)))
+                self.evictions_ += 1
+        return tile
+
+    def _compute_entries(self, key, tile, requests):
+        # Compute the entries of `requests` that are missing in `tile` and
+        # return whether any entry was computed.
+        shape = tile.shape
+        offsets = [t * self.tile_size for t in key]
+        is_computed = False
+        for rows, cols in requests:
+            rows = np.arange(shape[0]) if rows is None else rows
+            cols = np.arange(shape[1]) if cols is None else cols
+            is_missing = np.isnan(tile[np.ix_(rows, cols)])
+            if not is_missing.any():
+                continue
+            rows = rows[is_missing.any(axis=1)]
+            cols = cols[is_missing.any(axis=0)]
+            tile[np.ix_(rows, cols)] = pairwise_kernels(
+                self.X[offsets[0] + rows],
+                self.X[offsets[1] + cols],
+                self.metric,
+                **self.metric_dict,
+            )
+            is_computed = True
+        if is_computed and self.cache_dir is not None:
+            tile.flush()
+        return is_computed
+
+    def _evict(self, key):
+        # Pending requests are covered when the tile is loaded again.
+        self._pending.pop(key, None)
+        self.memory_ -= self._tiles.pop(key).nbytes
+
+    def _cache_key(self):
+        # Identify the kernel by its samples and parameters.
+        if callable(self.metric):
+            # Callables are hashed by their pickled representation, which only
+            # exists for importable ones, e.g., not for lambdas. The byte code
+            # of functions additionally detects changed definitions.
+            try:
+                metric = joblib_hash(self.metric)
+            except Exception as e:
+                raise ValueError(
+                    f"The callable `metric={self.metric}` cannot be "
+                    f"identified for the storage in `cache_dir`. Use an "
+                    f"importable function, e.g., defined at module level, "
+                    f"or a `functools.partial` of one."
+                ) from e
+            code = getattr(self.metric, "__code__", None)
+            if code is not None:
+                consts = [
+                    c for c in code.co_consts if not isinstance(c, CodeType)
+                ]
+                metric += repr((code.co_code, consts))
+        else:
+            metric = str(self.metric)
+        metric_dict = sorted(
+            (str(key), repr(val)) for key, val in self.metric_dict.items()
+        )
+        X = np.ascontiguousarray(self.X)
+        key = hashlib.sha1(X.tobytes())
+        key.update(repr((X.shape, X.dtype.str, metric, metric_dict)).encode())
+        key.update(repr(self.tile_size).encode())
+        return key.hexdigest()
+
+
 def _cross_entropy(
     X_eval, true_reg, other_reg, integration_dict=None, random_state=None
 ):
@@ -676,6 +1222,7 @@ def _update_reg(
     idx_update=None,
     X_update=None,
     mapping=None,
+    use_partial_fit=False,
 ):
     """Update the regressor by the updating samples, depending on
     the mapping. Chooses `X_update` if `mapping is None` and updates
@@ -699,6 +1246,11 @@ def _update_reg(
         Samples to be updated or sample to be updated.
     mapping : array-like of shape (n_candidates), optional (default = None)
         The deciding mapping.
+    use_partial_fit : bool, optional (default = False)
+        If True, `reg` must have been fitted on `X` and `y`. Then, a
+        `NICKernelRegressor` is updated via `partial_fit` instead of being
+        refitted if the updating samples are not yet labeled. Otherwise, a
+        clone of `reg` is fitted on the updated training data.
 
     Returns
     -------
@@ -718,16 +1270,63 @@ def _update_reg(
             check_indices([idx_update], A=mapping, unique="check_unique")
         else:
             check_indices(idx_update, A=mapping, unique="check_unique")
+        if use_partial_fit and isinstance(reg, NICKernelRegressor):
+            idx_add = np.atleast_1d(mapping[idx_update])
+            if is_unlabeled(y, missing_label=reg.missing_label)[idx_add].all():
+                sample_weight_add = (
+                    None if sample_weight is None else sample_weight[idx_add]
+                )
+                return _partial_fit_reg(
+                    reg, X[idx_add], y_update, sample_weight_add
+                )
         X_new, y_new = _update_X_y(
             X, y, y_update, idx_update=mapping[idx_update]
         )
     else:
+        if use_partial_fit and isinstance(reg, NICKernelRegressor):
+            X_add = check_array(
+                X_update, ensure_2d=False, input_name="`X_update`"
+            )
+            return _partial_fit_reg(
+                reg, X_add.reshape(-1, X.shape[1]), y_update
+            )
         X_new, y_new = _update_X_y(X, y, y_update, X_update=X_update)
 
     reg_new = clone(reg).fit(X_new, y_new, sample_weight)
     return reg_new
 
 
+def _partial_fit_reg(reg, X_add, y_add, sample_weight_add=None):
+    """Update a copy of the fitted `NICKernelRegressor` `reg` by the
+    additional samples `X_add` with labels `y_add`."""
+    y_add = np.atleast_1d(np.asarray(y_add, dtype=float))
+    return copy(reg).partial_fit(X_add, y_add, sample_weight_add)
+
+
+def _cache_reg(reg, X_eval):
+    """Return a shallow copy of the `NICKernelRegressor` `reg` caching the
+    kernel statistics of `X_eval`, which are shared by the copies updated via
+    `_update_reg`. Other regressors are returned unchanged.
+
+    Parameters
+    ----------
+    reg : SkactivemlRegressor
+        The fitted regressor, which is not modified.
+    X_eval : array-like of shape (n_eval_samples, n_features)
+        Samples for which `reg` and its updates are going to predict.
+
+    Returns
+    -------
+    reg_cached : SkactivemlRegressor
+        The regressor with the cached kernel statistics.
+    """
+    if not isinstance(reg, NICKernelRegressor):
+        return reg
+    reg_cached = copy(reg)
+    reg_cached._cache_ml_params(X_eval)
+    return reg_cached
+
+
 def _update_X_y(X, y, y_update, idx_update=None, X_update=None):
     """Update the training data by the updating samples/labels.
 
@@ -861,6 +1460,14 @@ def expected_target_val(X, target_func, reg, **kwargs):
           random variable of `reg`, which in turn uses a dynamic gaussian
           quadrature routine for calculating the integral. Performance is worse
           using a vector function.
+        -'two_point' evaluates the function at E[Y|X=x_eval] +-
+          Std[Y|X=x_eval] and takes the average, which equals the expectation
+          for all functions that are polynomials of at most degree two in the
+          target value, e.g., squared errors or the predicted variance of a
+          `NICKernelRegressor` updated by the target value. Otherwise, it is
+          an approximation.
+        -'analytic' uses a closed form registered in `_ANALYTIC_EXPECTATIONS`
+          (see Notes). A `ValueError` is raised if there is none.
     quantile_method: string, optional (default='quadrature')
         Specifies the integration methods used after the quantile
         transformation.
@@ -894,16 +1501,79 @@ def expected_target_val(X, target_func, reg, **kwargs):
     -------
     expectation : numpy.ndarray of shape (n_samples)
         The conditional expectation for each value applied.
+
+    Notes
+    -----
+    If `method='analytic'`, `target_func` must be a method of a frozen
+    `scipy.stats` distribution, e.g., `norm(loc, scale).logpdf`, for which a
+    closed form is registered in `_ANALYTIC_EXPECTATIONS` with respect to the
+    distribution family of `reg`. Otherwise, a `ValueError` is raised.
     """
 
     _check_callable(target_func, "target_func", n_positional_parameters=1)
 
+    if kwargs.get("method", None) == "analytic":
+        check_type(reg, "reg", ProbabilisticRegressor)
+        dist = reg.predict_target_distribution(check_array(X, allow_nd=True))
+        target_dist = getattr(target_func, "__self__", None)
+        closed_form = None
+        if isinstance(
+            target_dist, scipy.stats._distn_infrastructure.rv_frozen
+        ):
+            target = f"{target_dist.dist.name}.{target_func.__name__}"
+            closed_form = _ANALYTIC_EXPECTATIONS.get((dist.dist.name, target))
+        if closed_form is None:
+            raise ValueError(
+                f"There is no closed form registered for `target_func` under "
+                f"the '{dist.dist.name}' distribution of `reg`. Use another "
+                f"`method`, e.g., 'two_point' or 'gauss_hermite'."
+            )
+        return closed_form(dist, target_dist)
+
     def arg_filtered_func(idx_y, x_y, y):
         return target_func(y)
 
     return _conditional_expect(X, arg_filtered_func, reg, **kwargs)
 
 
+# Closed forms of E[target(Y)], where the keys are the distribution family of
+# Y and the target, which is a method of a frozen `scipy.stats` distribution
+# given as "<family>.<method>". Each closed form receives the frozen
+# distributions of Y and of the target.
+_ANALYTIC_EXPECTATIONS = {}
+
+
+def _register_analytic_expectation(families, target):
+    def decorator(closed_form):
+        for family in families:
+            _ANALYTIC_EXPECTATIONS[(family, target)] = closed_form
+        return closed_form
+
+    return decorator
+
+
+@_register_analytic_expectation(["norm", "t"], "norm.logpdf")
+def _expect_norm_logpdf(dist, target_dist):
+    # Only depends on the mean and variance of Y.
+    mu, var = dist.mean(), dist.var()
+    target_mu = target_dist.mean().reshape(mu.shape)
+    target_var = target_dist.var().reshape(mu.shape)
+    return -0.5 * np.log(2 * np.pi * target_var) - (
+        var + (mu - target_mu) ** 2
+    ) / (2 * target_var)
+
+
+@_register_analytic_expectation(["norm"], "norm.pdf")
+def _expect_norm_pdf(dist, target_dist):
+    # The convolution of two normal densities is a normal density.
+    mu, var = dist.mean(), dist.var()
+    target_mu = target_dist.mean().reshape(mu.shape)
+    target_var = target_dist.var().reshape(mu.shape)
+    return scipy.stats.norm.pdf(
+        target_mu, loc=mu, scale=np.sqrt(var + target_var)
+    )
+
+
 def _conditional_expect(
     X,
     func,
@@ -914,6 +1584,7 @@ def _conditional_expect(
     quad_dict=None,
     random_state=None,
     vector_func=False,
+    n_jobs=None,
 ):
     """Calculates the conditional expectation of a function depending on the
     target value the corresponding feature value and an index for each sample
@@ -949,6 +1620,15 @@ def _conditional_expect(
           random variable of `reg`, which in turn uses a dynamic gaussian
           quadrature routine for calculating the integral. Performance is worse
           using a vector function.
+        -'two_point' evaluates the function at E[Y|X=x_eval] +-
+          Std[Y|X=x_eval] and takes the average, which equals the expectation
+          for all functions that are polynomials of at most degree two in the
+          target value, e.g., squared errors or the predicted variance of a
+          `NICKernelRegressor` updated by the target value. Otherwise, it is
+          an approximation.
+        -'analytic' is only supported by `expected_target_val` for targets
+          with a registered closed form. Here, a `ValueError` is raised as
+          there is no closed form for an arbitrary `func`.
     quantile_method: string, optional (default='quadrature')
         Specifies the integration methods used after the quantile
         transformation.
@@ -977,8 +1657,15 @@ def _conditional_expect(
         are passed in vectorized form, means that in a call like
         `func(y, x, idx)` `y` is of the form (n_samples, n_integration_samples),
          `x` equals `X` and `idx` is an index map of `X.
-
-
+    n_jobs : int or None, optional (default=None)
+        The number of jobs to evaluate `func` in parallel, if it is called
+        per sample, i.e., `vector_func=False` or `method='dynamic_quad'`. The
+        samples are split into `n_jobs` contiguous chunks such that `X` and
+        `func` (including, e.g., a fitted regressor referenced by it) are
+        only passed once per job. The integration points are determined
+        before, so that the results do not depend on `n_jobs`. None means 1
+        and -1 means using all processors. The backend can be chosen via
+        `joblib.parallel_backend`.
 
     Returns
     -------
@@ -998,6 +1685,8 @@ def _conditional_expect(
             "dynamic_quad",
             "gauss_hermite",
             "quantile",
+            "two_point",
+            "analytic",
             None,
         ],
     )
@@ -1017,9 +1706,18 @@ def _conditional_expect(
     check_type(quad_dict, "scipy_args", dict, target_vals=[None])
     check_type(vector_func, "vector_func", bool, target_vals=["both"])
     _check_callable(func, "func", n_positional_parameters=3)
+    check_type(n_jobs, "n_jobs", int, target_vals=[None])
+    if n_jobs == 0:
+        raise ValueError("`n_jobs` must not be 0.")
 
     if method is None:
         method = "gauss_hermite"
+    if method == "analytic":
+        raise ValueError(
+            "`method='analytic'` requires a closed form, which does not exist "
+            "for an arbitrary `func`. Use another `method`, e.g., 'two_point' "
+            "or 'gauss_hermite'."
+        )
     if quantile_method is None:
         quantile_method = "quadrature"
     if quad_dict is None:
@@ -1035,14 +1733,27 @@ def _conditional_expect(
 
     random_state = check_random_state(random_state)
 
+    def evaluate_per_sample(func_chunk, *args):
+        # Evaluate `func_chunk` on contiguous chunks of samples, where each
+        # argument in `args` is split along its first axis.
+        if n_jobs in [None, 1]:
+            return func_chunk(np.arange(len(X)), *args)
+        chunks = np.array_split(
+            np.arange(len(X)), min(effective_n_jobs(n_jobs), max(len(X), 1))
+        )
+        output = Parallel(n_jobs=n_jobs)(
+            delayed(func_chunk)(idx, *[arg[idx] for arg in args])
+            for idx in chunks
+        )
+        return np.concatenate(output)
+
     def evaluate_func(inner_potential_y):
         if vector_func:
             inner_output = func(np.arange(len(X)), X, inner_potential_y)
         else:
-            inner_output = np.zeros_like(inner_potential_y)
-            for idx_x, inner_x in enumerate(X):
-                for idx_y, y_val in enumerate(inner_potential_y[idx_x]):
-                    inner_output[idx_x, idx_y] = func(idx_x, inner_x, y_val)
+            inner_output = evaluate_per_sample(
+                partial(_evaluate_func_chunk, func, X), inner_potential_y
+            )
         return inner_output
 
     expectation = np.zeros(len(X))
@@ -1097,6 +1808,12 @@ def _conditional_expect(
             expectation, _ = integrate.fixed_quad(
                 fixed_quad_function_wrapper, 0, 1, n=n_integration_samples
             )
+    elif method == "two_point":
+        cond_mean, cond_std = reg.predict(X, return_std=True)
+        potential_y = cond_mean[:, np.newaxis] + cond_std[
+            :, np.newaxis
+        ] * np.array([[-1.0, 1.0]])
+        expectation = np.average(evaluate_func(potential_y), axis=1)
     elif method == "gauss_hermite":
         unscaled_potential_y, weights = roots_hermitenorm(
             n_integration_samples
@@ -1113,20 +1830,48 @@ def _conditional_expect(
             * np.sum(weights[np.newaxis, :] * output, axis=1)
         )
     else:  # method equals "dynamic_quad"
-        for idx, x in enumerate(X):
-            cond_dist = reg.predict_target_distribution([x])
+        expectation = evaluate_per_sample(
+            partial(
+                _dynamic_quad_chunk,
+                func,
+                X,
+                reg,
+                quad_dict,
+                is_optional or not vector_func,
+            )
+        )
 
-            def quad_function_wrapper(y):
-                if is_optional or not vector_func:
-                    return func(idx, x, y)
-                else:
-                    return func(np.arange(len(X)), X, np.full((len(X), 1), y))[
-                        idx
-                    ]
+    return expectation
 
-            expectation[idx] = cond_dist.expect(
-                quad_function_wrapper,
-                **quad_dict,
-            )
 
+def _evaluate_func_chunk(func, X, idx, potential_y):
+    """Evaluates `func` for the samples `X[idx]` and each of their potential
+    target values `potential_y`, which is of shape (len(idx), n_y)."""
+    output = np.zeros_like(potential_y)
+    for i, idx_x in enumerate(idx.tolist()):
+        for idx_y, y_val in enumerate(potential_y[i]):
+            output[i, idx_y] = func(idx_x, X[idx_x], y_val)
+    return output
+
+
+def _dynamic_quad_chunk(func, X, reg, quad_dict, per_sample, idx):
+    """Calculates the expectation of `func` via `scipy's` `expect` for the
+    samples `X[idx]`."""
+    expectation = np.zeros(len(idx))
+    for i, idx_x in enumerate(idx.tolist()):
+        x = X[idx_x]
+        cond_dist = reg.predict_target_distribution([x])
+
+        def quad_function_wrapper(y):
+            if per_sample:
+                return func(idx_x, x, y)
+            else:
+                return func(np.arange(len(X)), X, np.full((len(X), 1), y))[
+                    idx_x
+                ]
+
+        expectation[i] = cond_dist.expect(
+            quad_function_wrapper,
+            **quad_dict,
+        )
     return expectation
@@ -1,7 +1,8 @@
 import numpy as np
+from joblib import Parallel, delayed
 from scipy.stats import t
 from sklearn.metrics.pairwise import pairwise_kernels, KERNEL_PARAMS
-from sklearn.utils import check_array
+from sklearn.utils import check_array, gen_batches, get_chunk_n_rows
 from sklearn.utils.validation import check_is_fitted
 
 from skactiveml.base import ProbabilisticRegressor
@@ -35,6 +36,15 @@ class NICKernelRegressor(ProbabilisticRegressor):
         The prior variance.
     nu_0 : int or float, optional (default=2.5)
         The weight of the prior variance.
+    working_memory : int or float, optional (default=None)
+        The test samples are processed in tiles such that the kernel matrix
+        between a tile and the training samples, including the temporary
+        arrays of the reductions, requires at most `working_memory` MiB. If
+        None, sklearn's `working_memory` configuration is used. The results
+        depend on the tiling only up to floating-point rounding.
+    n_jobs : int, optional (default=None)
+        The number of threads processing the tiles in parallel. None means 1
+        and -1 means using all processors.
     missing_label : scalar, string, np.nan, or None, default=np.nan
         Value to represent a missing label.
     random_state : int, RandomState instance or None, optional (default=None)
@@ -52,6 +62,8 @@ class NICKernelRegressor(ProbabilisticRegressor):
         kappa_0=0.1,
         sigma_sq_0=1.0,
         nu_0=2.5,
+        working_memory=None,
+        n_jobs=None,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -64,6 +76,8 @@ class NICKernelRegressor(ProbabilisticRegressor):
         self.sigma_sq_0 = sigma_sq_0
         self.metric = metric
         self.metric_dict = metric_dict
+        self.working_memory = working_memory
+        self.n_jobs = n_jobs
 
     def fit(self, X, y, sample_weight=None):
         """Fit the model using X as training data and y as class labels.
@@ -94,6 +108,17 @@ class NICKernelRegressor(ProbabilisticRegressor):
         ]:
             check_scalar(value, name, (int, float), min_val=0)
         check_scalar(self.mu_0, "self.mu_0", (int, float))
+        if self.working_memory is not None:
+            check_scalar(
+                self.working_memory,
+                "self.working_memory",
+                (int, float),
+                min_val=0,
+                min_inclusive=False,
+            )
+        check_type(self.n_jobs, "self.n_jobs", int, target_vals=[None])
+        if self.n_jobs == 0:
+            raise ValueError("`self.n_jobs` must not be 0.")
 
         self.X_ = X[is_lbld]
         self.y_ = y[is_lbld]
@@ -121,20 +146,137 @@ class NICKernelRegressor(ProbabilisticRegressor):
             self.metric_dict, "self.metric_dict", dict, target_vals=[None]
         )
 
+        self._ml_params_cache = None
+
+        return self
+
+    def partial_fit(self, X, y, sample_weight=None):
+        """Update the fitted model using additional training samples `X` and
+        labels `y`. The result equals fitting the model on the union of the
+        previous and the additional training samples, while only the kernel
+        between the additional and the cached samples (cf.
+        `_cache_ml_params`) needs to be computed.
+
+        Parameters
+        ----------
+        X : matrix-like, shape (n_samples, n_features)
+            Additional training samples.
+        y : array-like, shape (n_samples)
+            Labels of the additional training samples (possibly including
+            unlabeled ones indicated by `self.missing_label`).
+        sample_weight : array-like, shape (n_samples), optional
+        (default=None)
+            It contains the weights of the additional training samples'
+            values.
+
+        Returns
+        -------
+        self: NICKernelRegressor,
+            The NICKernelRegressor is updated by the additional samples.
+        """
+        check_is_fitted(self)
+        X, y, sample_weight = self._validate_data(X, y, sample_weight)
+        is_lbld = is_labeled(y, missing_label=self.missing_label_)
+        X_add, y_add = X[is_lbld], y[is_lbld]
+
+        if sample_weight is None and self.weights_ is None:
+            w_add = None
+        else:
+            w_add = (
+                np.ones(len(X_add))
+                if sample_weight is None
+                else sample_weight[is_lbld]
+            )
+            weights = (
+                np.ones(len(self.y_))
+                if self.weights_ is None
+                else self.weights_
+            )
+            weights = np.concatenate([weights, w_add])
+            if np.sum(weights) == 0:
+                raise ValueError(
+                    "The sample weights of the labeled samples "
+                    "must not be all zero."
+                )
+            self.weights_ = weights
+
+        # Update cached statistics without recomputing the kernel of the
+        # previous training samples.
+        cache = getattr(self, "_ml_params_cache", None)
+        if cache is not None and len(X_add) > 0:
+            X_cache, ml_params = cache
+            ml_params_add = self._estimate_ml_params(
+                X_cache, X_train=X_add, y_train=y_add, weights=w_add
+            )
+            ml_params = _combine_ml_params(ml_params, ml_params_add)
+            self._ml_params_cache = (X_cache, ml_params)
+
+        if len(self.X_) == 0:
+            self.X_ = X_add
+        else:
+            self.X_ = np.concatenate([self.X_, X_add])
+        self.y_ = np.concatenate([self.y_, y_add])
+
         return self
 
-    def _estimate_ml_params(self, X):
+    def _cache_ml_params(self, X):
+        # Store the statistics of the training samples for the samples `X`
+        # such that `partial_fit` and predictions for `X` do not require to
+        # recompute the kernel between `X` and the training samples.
+        X = check_array(X)
+        cache = getattr(self, "_ml_params_cache", None)
+        if cache is None or not np.array_equal(cache[0], X):
+            if len(self.X_) == 0:
+                ml_params = (
+                    np.zeros(len(X)),
+                    np.full(len(X), np.nan),
+                    np.zeros(len(X)),
+                )
+            else:
+                ml_params = self._estimate_ml_params(X)
+            self._ml_params_cache = (X.copy(), ml_params)
+
+    def _estimate_ml_params(self, X, X_train=None, y_train=None, weights=None):
+        if X_train is None:
+            cache = getattr(self, "_ml_params_cache", None)
+            if cache is not None and np.array_equal(cache[0], X):
+                return cache[1]
+            X_train, y_train, weights = self.X_, self.y_, self.weights_
+
+        # Process the samples `X` in tiles to bound the memory of the kernel
+        # matrix and of the scatter term.
+        n_rows = get_chunk_n_rows(
+            row_bytes=3 * 8 * len(X_train),
+            max_n_rows=len(X),
+            working_memory=self.working_memory,
+        )
+        batches = gen_batches(len(X), n_rows)
+        if self.n_jobs in [None, 1]:
+            ml_params = [
+                self._estimate_ml_params_tile(X[b], X_train, y_train, weights)
+                for b in batches
+            ]
+        else:
+            ml_params = Parallel(n_jobs=self.n_jobs, prefer="threads")(
+                delayed(self._estimate_ml_params_tile)(
+                    X[b], X_train, y_train, weights
+                )
+                for b in batches
+            )
+        return tuple(np.concatenate(params) for params in zip(*ml_params))
+
+    def _estimate_ml_params_tile(self, X, X_train, y_train, weights):
         K = pairwise_kernels(
-            X, self.X_, metric=self.metric, **self.metric_dict
+            X, X_train, metric=self.metric, **self.metric_dict
         )
 
-        if self.weights_ is not None:
-            K = self.weights_.reshape(1, -1) * K
+        if weights is not None:
+            K = weights.reshape(1, -1) * K
 
         N = np.sum(K, axis=1)
-        mu_ml = K @ self.y_ / N
+        mu_ml = K @ y_train / N
         scatter = np.sum(
-            K * (self.y_[np.newaxis, :] - mu_ml[:, np.newaxis]) ** 2, axis=1
+            K * (y_train[np.newaxis, :] - mu_ml[:, np.newaxis]) ** 2, axis=1
         )
         var_ml = 1 / N * scatter
 
@@ -179,6 +321,24 @@ class NICKernelRegressor(ProbabilisticRegressor):
         return t(df=df, loc=loc, scale=scale)
 
 
+def _combine_ml_params(ml_params_1, ml_params_2):
+    # Combine the kernel-weighted sample size, mean, and variance of two
+    # disjoint sets of training samples.
+    N_1, mu_1, var_1 = ml_params_1
+    N_2, mu_2, var_2 = ml_params_2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        N_com = N_1 + N_2
+        delta = mu_2 - mu_1
+        mu_com = mu_1 + N_2 / N_com * delta
+        var_com = (
+            N_1 * var_1 + N_2 * var_2 + N_1 * N_2 / N_com * delta**2
+        ) / N_com
+    is_empty_1, is_empty_2 = N_1 == 0, N_2 == 0
+    mu_com = np.where(is_empty_1, mu_2, np.where(is_empty_2, mu_1, mu_com))
+    var_com = np.where(is_empty_1, var_2, np.where(is_empty_2, var_1, var_com))
+    return N_com, mu_com, var_com
+
+
 def _combine_params(prior_params, update_params):
     kappa_1, nu_1, mu_1, sigma_sq_1 = prior_params
     kappa_2, nu_2, mu_2, sigma_sq_2 = update_params
@@ -209,6 +369,14 @@ class NadarayaWatsonRegressor(NICKernelRegressor):
         `sklearn.metrics.pairwise.pairwise_kernels`.
     metric_dict : dict, optional (default=None)
         Any further parameters are passed directly to the kernel function.
+    working_memory : int or float, optional (default=None)
+        The test samples are processed in tiles such that the kernel matrix
+        between a tile and the training samples, including the temporary
+        arrays of the reductions, requires at most `working_memory` MiB. If
+        None, sklearn's `working_memory` configuration is used.
+    n_jobs : int, optional (default=None)
+        The number of threads processing the tiles in parallel. None means 1
+        and -1 means using all processors.
     missing_label : scalar, string, np.nan, or None, default=np.nan
         Value to represent a missing label.
     random_state : int, RandomState instance or None, optional (default=None)
@@ -220,6 +388,8 @@ class NadarayaWatsonRegressor(NICKernelRegressor):
         self,
         metric="rbf",
         metric_dict=None,
+        working_memory=None,
+        n_jobs=None,
         missing_label=MISSING_LABEL,
         random_state=None,
     ):
@@ -228,6 +398,8 @@ class NadarayaWatsonRegressor(NICKernelRegressor):
             missing_label=missing_label,
             metric=metric,
             metric_dict=metric_dict,
+            working_memory=working_memory,
+            n_jobs=n_jobs,
             kappa_0=0,
             nu_0=3,
             sigma_sq_0=1,
@@ -99,6 +99,12 @@ class SklearnRegressor(SkactivemlRegressor, MetaEstimatorMixin):
         -------
         self : SklearnRegressor,
             The SklearnRegressor is fitted on the training data.
+
+        Notes
+        -----
+        The label mean and standard deviation, which are used for predictions
+        if the 'estimator' could not be fitted, are computed over all labeled
+        samples passed since the last call of `fit`.
         """
         return self._fit(
             fit_function="partial_fit",
@@ -115,10 +121,11 @@ class SklearnRegressor(SkactivemlRegressor, MetaEstimatorMixin):
                 "regressor.".format(self.estimator)
             )
 
-        self.estimator_ = deepcopy(self.estimator)
-
-        self._label_mean = 0
-        self._label_std = 1
+        if fit_function != "partial_fit" or not hasattr(self, "estimator_"):
+            self.estimator_ = deepcopy(self.estimator)
+            self._label_count = 0
+            self._label_mean = 0
+            self._label_std = 1
 
         self.check_X_dict_ = {
             "ensure_min_samples": 0,
@@ -144,8 +151,20 @@ class SklearnRegressor(SkactivemlRegressor, MetaEstimatorMixin):
             estimator_params["sample_weight"] = sample_weight_labeled
 
         if np.sum(is_lbld) != 0:
-            self._label_mean = np.mean(y[is_lbld])
-            self._label_std = np.std(y[is_lbld]) if np.sum(is_lbld) > 1 else 1
+            # Merge the label statistics of all (partial) fits, cf. Chan et
+            # al., such that `partial_fit` continues them.
+            n_old, n_new = self._label_count, len(y_labeled)
+            n_labeled = n_old + n_new
+            var_old = self._label_std**2 if n_old > 1 else 0
+            delta = np.mean(y_labeled) - self._label_mean
+            self._label_count = n_labeled
+            self._label_mean = self._label_mean + delta * n_new / n_labeled
+            label_var = (
+                n_old * var_old
+                + n_new * np.var(y_labeled)
+                + delta**2 * n_old * n_new / n_labeled
+            ) / n_labeled
+            self._label_std = np.sqrt(label_var) if n_labeled > 1 else 1
             try:
                 attrgetter(fit_function)(self.estimator_)(
                     X_labeled, y_labeled, **estimator_params
@@ -43,6 +43,34 @@ class TestNICKernelEstimator(unittest.TestCase):
             reg = NICKernelRegressor(**start_params)
             self.assertRaises(TypeError, reg.fit, self.X, self.y)
 
+    def test_working_memory_n_jobs(self):
+        for param, value, err in [
+            ("working_memory", 0, ValueError),
+            ("working_memory", "1", TypeError),
+            ("n_jobs", 0, ValueError),
+            ("n_jobs", 1.0, TypeError),
+        ]:
+            start_params = self.start_parameter.copy()
+            start_params[param] = value
+            reg = NICKernelRegressor(**start_params)
+            self.assertRaises(err, reg.fit, self.X, self.y)
+
+        X = norm.rvs(size=(40, 2), random_state=self.random_state)
+        y = norm.rvs(size=40, random_state=self.random_state)
+        X_test = norm.rvs(size=(30, 2), random_state=self.random_state + 1)
+        for w in [None, np.arange(40) + 1.0]:
+            reg_ref = NICKernelRegressor(**self.start_parameter)
+            params_ref = reg_ref.fit(X, y, w)._estimate_ml_params(X_test)
+            for working_memory, n_jobs in [(1e-3, None), (2e-3, 2)]:
+                reg = NICKernelRegressor(
+                    **self.start_parameter,
+                    working_memory=working_memory,
+                    n_jobs=n_jobs,
+                )
+                params = reg.fit(X, y, w)._estimate_ml_params(X_test)
+                for p, p_ref in zip(params, params_ref):
+                    np.testing.assert_allclose(p, p_ref, rtol=1e-12)
+
     def test_missing_label(self):
         self.missing_label = -1
         start_params = self.start_parameter.copy()
@@ -84,6 +112,34 @@ class TestNICKernelEstimator(unittest.TestCase):
         w = np.zeros_like(self.y)
         self.assertRaises(ValueError, reg.fit, self.X, self.y, w)
 
+    def test_partial_fit(self):
+        reg = NICKernelRegressor(**self.start_parameter)
+        self.assertRaises(NotFittedError, reg.partial_fit, self.X, self.y)
+
+        X = norm.rvs(size=(10, 2), random_state=self.random_state)
+        y = norm.rvs(size=10, random_state=self.random_state)
+        y[[1, 7]] = MISSING_LABEL
+        X_test = norm.rvs(size=(5, 2), random_state=self.random_state + 1)
+        for w in [None, np.arange(10) + 1.0]:
+            reg_ref = NICKernelRegressor(**self.start_parameter)
+            reg_ref.fit(X, y, sample_weight=w)
+            dist_ref = reg_ref.predict_target_distribution(X_test)
+            for n_init, use_cache in [(0, False), (4, False), (4, True)]:
+                w_init = None if w is None or n_init == 0 else w[:n_init]
+                reg.fit(X[:n_init], y[:n_init], sample_weight=w_init)
+                if use_cache:
+                    reg._cache_ml_params(X_test)
+                for i in range(n_init, 10, 3):
+                    w_add = None if w is None else w[i : i + 3]
+                    reg.partial_fit(X[i : i + 3], y[i : i + 3], w_add)
+                dist = reg.predict_target_distribution(X_test)
+                np.testing.assert_allclose(dist.mean(), dist_ref.mean())
+                np.testing.assert_allclose(dist.std(), dist_ref.std())
+
+        reg.fit(self.X, np.full(len(self.y), MISSING_LABEL))
+        w = np.zeros_like(self.y)
+        self.assertRaises(ValueError, reg.partial_fit, self.X, self.y, w)
+
     def test_predict(self):
         reg = NICKernelRegressor(**self.start_parameter)
         X = np.array([[0, 0], [1, 1], [2, 2]])
@@ -151,6 +151,26 @@ class TestWrapper(unittest.TestCase):
             np.any(np.not_equal(reg_1.predict(X), reg_2.predict(X)))
         )
 
+        # Successive calls of `partial_fit` continue the training.
+        sgd = SGDRegressor(random_state=self.random_state)
+        sgd.partial_fit(X, y)
+        sgd.partial_fit(X[:2], y[:2])
+        reg_1.partial_fit(X[:2], y[:2])
+        np.testing.assert_array_equal(reg_1.predict(X), sgd.predict(X))
+
+        # The label statistics are continued over all batches.
+        y_all = np.append(y, y[:2])
+        self.assertAlmostEqual(reg_1._label_mean, np.mean(y_all))
+        self.assertAlmostEqual(reg_1._label_std, np.std(y_all))
+        reg_1.partial_fit(X[:1], np.full(1, MISSING_LABEL))
+        self.assertAlmostEqual(reg_1._label_mean, np.mean(y_all))
+        reg_1.fit(X[:1], y[:1])
+        self.assertEqual(reg_1._label_mean, y[0])
+        self.assertEqual(reg_1._label_std, 1)
+        reg_1.partial_fit(X[1:2], y[1:2])
+        self.assertAlmostEqual(reg_1._label_mean, np.mean(y[:2]))
+        self.assertAlmostEqual(reg_1._label_std, np.std(y[:2]))
+
     def test_pipeline(self):
         X = np.linspace(-3, 3, 100)
         y_true = X**2
@@ -14,6 +14,7 @@ from ._label import (
 )
 from ._label_encoder import ExtLabelEncoder
 from ._multi_annot import ext_confusion_matrix
+from ._neighbors import NeighborIndex
 from ._selection import rand_argmax, rand_argmin, simple_batch
 from ._validation import (
     check_classes,
@@ -57,5 +58,6 @@ __all__ = [
     "check_budget_manager",
     "check_indices",
     "simple_batch",
+    "NeighborIndex",
     "_check_callable",
 ]
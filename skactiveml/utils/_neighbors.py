@@ -0,0 +1,236 @@
+"""Utilities for nearest neighbor search."""
+import numpy as np
+from sklearn.base import BaseEstimator
+from sklearn.metrics import pairwise_distances_argmin_min
+from sklearn.neighbors import BallTree, KDTree
+from sklearn.utils import check_array
+
+from ._validation import check_random_state, check_scalar, check_type
+
+
+class NeighborIndex(BaseEstimator):
+    """NeighborIndex
+
+    Index for nearest neighbor queries that supports the incremental
+    insertion of samples, e.g., of newly labeled samples in successive
+    active learning cycles. Inserted samples are kept in a buffer that is
+    searched exhaustively until it exceeds `rebuild_ratio` times the number
+    of indexed samples, which triggers a rebuild of the index.
+
+    Parameters
+    ----------
+    algorithm : {'brute', 'kd_tree', 'ball_tree', 'random_projection'},
+    default='brute'
+        Algorithm used to find the nearest neighbors:
+        - 'brute' computes the distances to all samples,
+        - 'kd_tree' uses `sklearn.neighbors.KDTree`,
+        - 'ball_tree' uses `sklearn.neighbors.BallTree`,
+        - 'random_projection' searches `n_candidates` neighbors in a
+          `KDTree` of randomly projected samples and returns the nearest of
+          them with respect to the original samples. This search is
+          approximate and only supports the euclidean metric.
+    metric : str, default='euclidean'
+        Metric used for calculating the distances. It must be supported by
+        `sklearn.metrics.pairwise_distances` for 'brute' and by the
+        respective tree otherwise.
+    metric_dict : dict, default=None
+        Any further parameters are passed directly to the metric.
+    leaf_size : int, default=40
+        Leaf size of the trees.
+    n_components : int, default=8
+        Number of random projections for 'random_projection'.
+    n_candidates : int, default=10
+        Number of neighbors in the projected space whose distances are
+        computed in the original space for 'random_projection'.
+    rebuild_ratio : float, default=0.25
+        Maximum size of the buffer of inserted samples relative to the number
+        of indexed samples.
+    random_state : int or np.random.RandomState or None, default=None
+        Random state for drawing the random projections.
+    """
+
+    def __init__(
+        self,
+        algorithm="brute",
+        metric="euclidean",
+        metric_dict=None,
+        leaf_size=40,
+        n_components=8,
+        n_candidates=10,
+        rebuild_ratio=0.25,
+        random_state=None,
+    ):
+        self.algorithm = algorithm
+        self.metric = metric
+        self.metric_dict = metric_dict
+        self.leaf_size = leaf_size
+        self.n_components = n_components
+        self.n_candidates = n_candidates
+        self.rebuild_ratio = rebuild_ratio
+        self.random_state = random_state
+
+    def fit(self, X):
+        """Builds the index for the given samples.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            Samples to be indexed.
+
+        Returns
+        -------
+        self: NeighborIndex,
+            The fitted index.
+        """
+        check_type(
+            self.algorithm,
+            "algorithm",
+            target_vals=["brute", "kd_tree", "ball_tree", "random_projection"],
+        )
+        check_type(self.metric, "metric", str)
+        self.metric_dict_ = (
+            {} if self.metric_dict is None else self.metric_dict
+        )
+        check_type(self.metric_dict_, "metric_dict", dict)
+        check_scalar(self.leaf_size, "leaf_size", int, min_val=1)
+        check_scalar(self.n_components, "n_components", int, min_val=1)
+        check_scalar(self.n_candidates, "n_candidates", int, min_val=1)
+        check_scalar(
+            self.rebuild_ratio, "rebuild_ratio", (int, float), min_val=0
+        )
+        if self.algorithm == "random_projection" and (
+            self.metric != "euclidean" or self.metric_dict_
+        ):
+            raise ValueError(
+                "The algorithm 'random_projection' only supports the "
+                "euclidean metric without further parameters."
+            )
+
+        X = check_array(X, ensure_min_samples=0, dtype=float)
+        self.n_features_in_ = X.shape[1]
+        self.X_ = X
+        self._keys = {x.tobytes() for x in X}
+        if self.algorithm == "random_projection":
+            random_state = check_random_state(self.random_state)
+            self.components_ = random_state.normal(
+                size=(self.n_features_in_, self.n_components)
+            ) / np.sqrt(self.n_components)
+        self._build()
+        return self
+
+    def partial_fit(self, X):
+        """Inserts the given samples into the index.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            Samples to be inserted.
+
+        Returns
+        -------
+        self: NeighborIndex,
+            The updated index.
+        """
+        if not hasattr(self, "X_"):
+            return self.fit(X)
+        X = check_array(X, ensure_min_samples=0, dtype=float)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"`X` has {X.shape[1]} features, but the index was fitted "
+                f"with {self.n_features_in_} features."
+            )
+        self.X_ = np.append(self.X_, X, axis=0)
+        self._keys.update(x.tobytes() for x in X)
+        n_buffer = len(self.X_) - self.n_indexed_
+        if n_buffer > self.rebuild_ratio * self.n_indexed_:
+            self._build()
+        return self
+
+    def update(self, X):
+        """Ensures that exactly the given samples are indexed. Samples that
+        are not indexed yet are inserted if all indexed samples are contained
+        in `X`, and the index is rebuilt otherwise.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            Samples to be indexed.
+
+        Returns
+        -------
+        self: NeighborIndex,
+            The updated index.
+        """
+        X = check_array(X, ensure_min_samples=0, dtype=float)
+        if not hasattr(self, "X_") or X.shape[1] != self.n_features_in_:
+            return self.fit(X)
+        keys = [x.tobytes() for x in X]
+        if not self._keys.issubset(keys):
+            return self.fit(X)
+        is_new = np.array([key not in self._keys for key in keys], bool)
+        return self.partial_fit(X[is_new])
+
+    def query(self, X):
+        """Finds the nearest indexed sample of each given sample.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            Query samples.
+
+        Returns
+        -------
+        dist : np.ndarray of shape (n_samples,)
+            Distances to the nearest indexed samples.
+        ind : np.ndarray of shape (n_samples,)
+            Indices of the nearest indexed samples in the order of insertion.
+        """
+        X = check_array(X, ensure_min_samples=0, dtype=float)
+        if len(self.X_) == 0:
+            raise ValueError("The index does not contain any samples.")
+        dist = np.full(len(X), np.inf)
+        ind = np.zeros(len(X), dtype=int)
+        if self.n_indexed_ > 0 and len(X) > 0:
+            if self.algorithm == "random_projection":
+                k = min(self.n_candidates, self.n_indexed_)
+                _, cand = self._tree.query(X.dot(self.components_), k=k)
+                cand_dist = np.linalg.norm(
+                    self.X_[cand] - X[:, np.newaxis], axis=-1
+                )
+                idx = np.argmin(cand_dist, axis=1)
+                dist = cand_dist[np.arange(len(X)), idx]
+                ind = cand[np.arange(len(X)), idx]
+            else:
+                dist, ind = self._tree.query(X, k=1)
+                dist, ind = dist[:, 0], ind[:, 0]
+        if len(self.X_) > self.n_indexed_ and len(X) > 0:
+            buffer_ind, buffer_dist = pairwise_distances_argmin_min(
+                X,
+                self.X_[self.n_indexed_ :],
+                metric=self.metric,
+                metric_kwargs=self.metric_dict_,
+            )
+            is_closer = buffer_dist < dist
+            dist[is_closer] = buffer_dist[is_closer]
+            ind[is_closer] = self.n_indexed_ + buffer_ind[is_closer]
+        return dist, ind
+
+    def _build(self):
+        if self.algorithm == "brute":
+            self.n_indexed_ = 0
+            return
+        self.n_indexed_ = len(self.X_)
+        if self.n_indexed_ == 0:
+            return
+        if self.algorithm == "random_projection":
+            self._tree = KDTree(
+                self.X_.dot(self.components_), leaf_size=self.leaf_size
+            )
+        else:
+            tree_class = KDTree if self.algorithm == "kd_tree" else BallTree
+            self._tree = tree_class(
+                self.X_,
+                leaf_size=self.leaf_size,
+                metric=self.metric,
+                **self.metric_dict_,
+            )
@@ -395,7 +395,9 @@ def check_X_y(
         Only returned if candidates is not None.
     """
     if allow_nan is None:
-        allow_nan = True if missing_label is np.nan else False
+        allow_nan = isinstance(missing_label, float) and np.isnan(
+            missing_label
+        )
     if X is not None:
         X = check_array(
             X,
@@ -69,6 +69,10 @@ class TestLabel(unittest.TestCase):
         np.testing.assert_array_equal(
             np.array([1, 0, 0, 0, 1], dtype=bool), is_unlabeled(self.y1)
         )
+        np.testing.assert_array_equal(
+            np.array([1, 0, 0, 0, 1], dtype=bool),
+            is_unlabeled(self.y1, missing_label=float("nan")),
+        )
         np.testing.assert_array_equal(
             np.array([1, 0, 0, 0, 1], dtype=bool),
             is_unlabeled(self.y3, missing_label=None),
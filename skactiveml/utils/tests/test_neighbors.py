@@ -0,0 +1,128 @@
+import unittest
+
+import numpy as np
+from sklearn.metrics import pairwise_distances
+
+from skactiveml.utils import NeighborIndex
+
+
+class TestNeighborIndex(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.X = random_state.rand(60, 3)
+        self.X_query = random_state.rand(20, 3)
+
+    def test_init_param_algorithm(self):
+        for algorithm in [None, "illegal", 1]:
+            index = NeighborIndex(algorithm=algorithm)
+            self.assertRaises(TypeError, index.fit, self.X)
+
+    def test_init_param_metric(self):
+        index = NeighborIndex(metric=None)
+        self.assertRaises(TypeError, index.fit, self.X)
+        index = NeighborIndex(
+            algorithm="random_projection", metric="manhattan"
+        )
+        self.assertRaises(ValueError, index.fit, self.X)
+
+    def test_init_param_metric_dict(self):
+        index = NeighborIndex(metric_dict="illegal")
+        self.assertRaises(TypeError, index.fit, self.X)
+        index = NeighborIndex(
+            algorithm="random_projection", metric_dict={"p": 2}
+        )
+        self.assertRaises(ValueError, index.fit, self.X)
+
+    def test_init_param_leaf_size(self):
+        for leaf_size, err in [(0, ValueError), (1.5, TypeError)]:
+            index = NeighborIndex(leaf_size=leaf_size)
+            self.assertRaises(err, index.fit, self.X)
+
+    def test_init_param_n_components(self):
+        for n_components, err in [(0, ValueError), ("2", TypeError)]:
+            index = NeighborIndex(n_components=n_components)
+            self.assertRaises(err, index.fit, self.X)
+
+    def test_init_param_n_candidates(self):
+        for n_candidates, err in [(0, ValueError), (None, TypeError)]:
+            index = NeighborIndex(n_candidates=n_candidates)
+            self.assertRaises(err, index.fit, self.X)
+
+    def test_init_param_rebuild_ratio(self):
+        for rebuild_ratio, err in [(-1, ValueError), ("1", TypeError)]:
+            index = NeighborIndex(rebuild_ratio=rebuild_ratio)
+            self.assertRaises(err, index.fit, self.X)
+
+    def test_query(self):
+        for metric, metric_dict in [
+            ("euclidean", None),
+            ("manhattan", None),
+            ("minkowski", {"p": 3}),
+        ]:
+            dist = pairwise_distances(
+                self.X_query, self.X, metric, **(metric_dict or {})
+            )
+            for algorithm in ["brute", "kd_tree", "ball_tree"]:
+                index = NeighborIndex(
+                    algorithm=algorithm, metric=metric, metric_dict=metric_dict
+                )
+                dist_nn, ind_nn = index.fit(self.X).query(self.X_query)
+                np.testing.assert_allclose(dist_nn, dist.min(axis=1))
+                np.testing.assert_array_equal(ind_nn, dist.argmin(axis=1))
+
+        # The approximate index is exact if all samples are candidates.
+        index = NeighborIndex(
+            algorithm="random_projection", n_candidates=60, random_state=0
+        )
+        dist_nn, ind_nn = index.fit(self.X).query(self.X_query)
+        dist = pairwise_distances(self.X_query, self.X)
+        np.testing.assert_allclose(dist_nn, dist.min(axis=1))
+        np.testing.assert_array_equal(ind_nn, dist.argmin(axis=1))
+        dist_nn, _ = index.set_params(n_candidates=1).query(self.X_query)
+        self.assertTrue((dist_nn >= dist.min(axis=1) - 1e-12).all())
+
+        index = NeighborIndex().fit(np.empty((0, 3)))
+        self.assertRaises(ValueError, index.query, self.X_query)
+
+    def test_partial_fit(self):
+        dist = pairwise_distances(self.X_query, self.X)
+        for algorithm in [
+            "brute",
+            "kd_tree",
+            "ball_tree",
+            "random_projection",
+        ]:
+            index = NeighborIndex(
+                algorithm=algorithm, rebuild_ratio=0.5, n_candidates=60
+            )
+            index.partial_fit(self.X[:10])
+            for start in range(10, 60, 5):
+                index.partial_fit(self.X[start : start + 5])
+                if algorithm != "brute":
+                    self.assertLessEqual(
+                        len(index.X_) - index.n_indexed_,
+                        0.5 * index.n_indexed_,
+                    )
+            dist_nn, ind_nn = index.query(self.X_query)
+            np.testing.assert_allclose(dist_nn, dist.min(axis=1))
+            np.testing.assert_array_equal(ind_nn, dist.argmin(axis=1))
+            self.assertRaises(ValueError, index.partial_fit, self.X[:, :2])
+
+    def test_update(self):
+        index = NeighborIndex(algorithm="kd_tree", rebuild_ratio=1)
+        index.update(self.X[:40])
+        tree = index._tree
+
+        # New samples are inserted into the buffer.
+        index.update(self.X[::-1])
+        self.assertIs(tree, index._tree)
+        self.assertEqual(len(index.X_), 60)
+        np.testing.assert_array_equal(index.X_[40:], self.X[59:39:-1])
+
+        # Removed samples lead to a rebuild.
+        index.update(self.X[10:])
+        self.assertIsNot(tree, index._tree)
+        self.assertEqual(index.n_indexed_, 50)
+
+        index.update(self.X[:, :2])
+        self.assertEqual(index.n_features_in_, 2)